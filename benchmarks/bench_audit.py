@@ -0,0 +1,84 @@
+"""
+Compare audit logging throughput: one sqlite3 connection, INSERT and
+commit per action (the old behaviour) against the shared WAL connection
+with buffered, batched inserts.
+
+Run from the project root:
+    python -m benchmarks.bench_audit [actions]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from core import audit
+
+_CREATE_SQL = """
+    CREATE TABLE IF NOT EXISTS audit_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        time TEXT NOT NULL,
+        action_type TEXT NOT NULL,
+        conditions TEXT,
+        columns TEXT,
+        rows_affected INTEGER,
+        details TEXT
+    );
+"""
+
+
+def _per_call(db_path: str, actions: int) -> float:
+    """Open, insert, commit and close for every action."""
+    conn = sqlite3.connect(db_path)
+    conn.execute(_CREATE_SQL)
+    conn.commit()
+    conn.close()
+
+    start = time.perf_counter()
+    for i in range(actions):
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.execute(
+                audit._INSERT_SQL,
+                (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "FILTER", f"col equals {i}", "col", i, "bench"),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+    return time.perf_counter() - start
+
+
+def _batched(db_path: str, actions: int) -> float:
+    """Log through core.audit and flush once at the end, as an export would."""
+    audit.close_audit_log()
+    audit.DB_PATH = db_path
+    audit._db_ready = False
+    audit._get_connection()
+
+    start = time.perf_counter()
+    for i in range(actions):
+        audit.log_action("FILTER", details="bench", conditions=f"col equals {i}", columns=["col"], rows_affected=i)
+    audit.flush_audit_log()
+    elapsed = time.perf_counter() - start
+
+    audit.close_audit_log()
+    return elapsed
+
+
+def main(actions: int = 2000) -> None:
+    original_path = audit.DB_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        old = _per_call(os.path.join(tmp, "per_call.db"), actions)
+        new = _batched(os.path.join(tmp, "batched.db"), actions)
+    audit.DB_PATH = original_path
+    audit._db_ready = False
+
+    print(f"Actions logged:          {actions}")
+    print(f"Per-call connection:     {old:.3f}s ({actions / old:,.0f} actions/sec)")
+    print(f"Shared WAL + batching:   {new:.3f}s ({actions / new:,.0f} actions/sec)")
+    print(f"Speedup:                 {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
\ No newline at end of file
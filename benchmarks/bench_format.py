@@ -0,0 +1,75 @@
+"""
+Compare the date and number formats (options 5-8) before and after
+formatting each distinct value once, in rows per second.
+
+Run from the project root:
+    python -m benchmarks.bench_format [rows]
+"""
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from core.formatting import FORMAT_OPTIONS, _format_series
+
+
+def _format_series_per_row(series: pd.Series, fmt_choice: str) -> pd.Series:
+    """The previous implementation of options 5-8, kept for comparison."""
+    if fmt_choice in ("5", "6"):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            parsed = pd.to_datetime(series, errors="coerce", infer_datetime_format=True)
+        formatted = series.astype(str)
+        mask = parsed.notna()
+        formatted[mask] = parsed[mask].dt.strftime("%m/%d/%Y" if fmt_choice == "5" else "%B %d, %Y")
+        return formatted
+
+    numeric = pd.to_numeric(series, errors="coerce")
+    formatted = series.astype(str)
+    mask = numeric.notna()
+    if fmt_choice == "7":
+        formatted[mask] = numeric[mask].round(2).map(lambda x: f"{x:.2f}")
+        return formatted
+
+    def to_percent(v: float) -> str:
+        if v <= 1:
+            v *= 100.0
+        return f"{v:.0f}%"
+
+    formatted[mask] = numeric[mask].map(to_percent)
+    return formatted
+
+
+def _make_columns(rows: int) -> dict:
+    rng = np.random.default_rng(7)
+    days = pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 1500, rows), unit="D")
+    amounts = rng.integers(0, 50_000, rows) / 100
+    return {
+        "5": pd.Series(days.strftime("%Y-%m-%d"), dtype=object),
+        "6": pd.Series(days.strftime("%d/%m/%Y"), dtype=object),
+        "7": pd.Series(amounts),
+        "8": pd.Series(rng.integers(0, 101, rows) / 100),
+    }
+
+
+def main(rows: int = 1_000_000) -> None:
+    columns = _make_columns(rows)
+    print(f"Rows: {rows:,}")
+    print(f"{'format':<12} {'per row':>14} {'distinct values':>16} {'speedup':>8}")
+    for choice, series in columns.items():
+        start = time.perf_counter()
+        before = _format_series_per_row(series, choice)
+        old = time.perf_counter() - start
+
+        start = time.perf_counter()
+        after = _format_series(series, choice)
+        new = time.perf_counter() - start
+
+        same = "" if before.equals(after) else "  (output differs)"
+        print(f"{FORMAT_OPTIONS[choice]:<12} {rows / old:>10,.0f} r/s {rows / new:>12,.0f} r/s {old / new:>7.1f}x{same}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
\ No newline at end of file
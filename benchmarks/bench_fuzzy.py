@@ -0,0 +1,57 @@
+"""
+Measure near-duplicate detection throughput on synthetic company names:
+a set of base names, each repeated with case, punctuation, suffix and
+typo variations.
+
+Run from the project root:
+    python -m benchmarks.bench_fuzzy [rows]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.fuzzy import DEFAULT_THRESHOLD, find_near_duplicates
+
+_SYLLABLES = ["ac", "me", "glo", "bex", "ini", "tech", "um", "brel", "la", "hoo", "li", "vand", "lay", "sto", "nex"]
+_SUFFIXES = ["Inc.", "Inc", "LLC", "Ltd", "Corp", "Corporation", "Co.", ""]
+
+
+def _make_names(rows: int, seed: int = 3) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    bases = rows // 20
+    parts = rng.choice(_SYLLABLES, size=(bases, 3))
+    base_names = np.array(["".join(p).title() + " " + rng.choice(_SYLLABLES).title() for p in parts], dtype=object)
+
+    names = base_names[rng.integers(0, bases, rows)]
+    suffixes = np.array(_SUFFIXES, dtype=object)[rng.integers(0, len(_SUFFIXES), rows)]
+    names = names + " " + suffixes
+
+    variant = rng.integers(0, 10, rows)
+    out = pd.Series(names)
+    out[variant == 1] = out[variant == 1].str.upper()
+    out[variant == 2] = out[variant == 2].str.replace(" ", ", ", n=1, regex=False)
+    # A dropped letter somewhere in the name
+    typo = variant == 3
+    out[typo] = [s[:i] + s[i + 1:] for s, i in zip(out[typo], rng.integers(1, 6, typo.sum()))]
+    return out
+
+
+def main(rows: int = 1_000_000) -> None:
+    df = pd.DataFrame({"company": _make_names(rows)})
+
+    start = time.perf_counter()
+    cluster_ids, scores, compared = find_near_duplicates(df, ["company"], DEFAULT_THRESHOLD)
+    elapsed = time.perf_counter() - start
+
+    all_pairs = rows * (rows - 1) // 2
+    print(f"Rows:                     {rows:,}")
+    print(f"Distinct values:          {df['company'].nunique():,}")
+    print(f"Candidate pairs scored:   {compared:,} (all pairs: {all_pairs:,})")
+    print(f"Rows in clusters:         {(cluster_ids >= 0).sum():,} in {cluster_ids.max() + 1:,} clusters")
+    print(f"Time:                     {elapsed:.2f}s ({rows / elapsed:,.0f} rows/sec)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""
+Compare SQLite export and import against the CSV path, in rows per
+second, on a synthetic mixed-type frame.
+
+Run from the project root:
+    python -m benchmarks.bench_sqlite [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.csv_writer import frame_blocks, write_csv
+from core.sqlite_io import read_sqlite, write_sqlite
+
+
+def _make_frame(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+    return pd.DataFrame({
+        "order_id": np.arange(rows),
+        "customer": rng.integers(0, rows // 10 + 1, rows),
+        "region": rng.choice(["North", "South", "East", "West"], rows),
+        "amount": rng.integers(0, 100_000, rows) / 100,
+        "ordered": pd.Timestamp("2022-01-01") + pd.to_timedelta(rng.integers(0, 700, rows), unit="D"),
+    })
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main(rows: int = 1_000_000) -> None:
+    df = _make_frame(rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "data.csv")
+        db_path = os.path.join(tmp, "data.db")
+
+        results = [
+            ("CSV export", _timed(lambda: write_csv(frame_blocks(df), csv_path, df.columns))),
+            ("SQLite export", _timed(lambda: write_sqlite(frame_blocks(df), db_path, "data", df.columns, df.dtypes))),
+            ("SQLite export + index", _timed(lambda: write_sqlite(
+                frame_blocks(df), db_path, "data", df.columns, df.dtypes, index_columns=["customer"]
+            ))),
+            ("CSV import", _timed(lambda: pd.read_csv(csv_path))),
+            ("SQLite import", _timed(lambda: read_sqlite(db_path, table="data"))),
+        ]
+
+    print(f"Rows: {rows:,}")
+    for name, seconds in results:
+        print(f"{name:<24} {seconds:>7.2f}s {rows / seconds:>14,.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
\ No newline at end of file
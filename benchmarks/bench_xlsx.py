@@ -0,0 +1,71 @@
+"""
+Compare XLSX export with duplicate highlighting: writing with to_excel,
+then reopening the workbook to style each duplicate cell and saving it
+again (the old behaviour), against one streaming write-only pass that
+applies the fill while writing.
+
+Run from the project root:
+    python -m benchmarks.bench_xlsx [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.xlsx_writer import write_xlsx
+
+
+def _export_two_pass(df: pd.DataFrame, path: str, columns: list, dup_indices) -> None:
+    """The previous export-then-highlight implementation, kept for comparison."""
+    from openpyxl import load_workbook
+    from openpyxl.styles import PatternFill
+
+    df.to_excel(path, index=False, engine="openpyxl")
+
+    wb = load_workbook(path)
+    ws = wb.active
+    fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
+    col_to_excel_index = {name: i + 1 for i, name in enumerate(df.columns)}
+    for idx in dup_indices:
+        excel_row = df.index.get_loc(idx) + 2
+        for name in columns:
+            ws.cell(row=excel_row, column=col_to_excel_index[name]).fill = fill
+    wb.save(path)
+
+
+def _make_frame(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    return pd.DataFrame({
+        "customer": rng.integers(0, rows // 4, rows),
+        "region": rng.choice(["North", "South", "East", "West"], rows),
+        "amount": rng.integers(0, 100_000, rows) / 100,
+        "ordered": pd.Timestamp("2022-01-01") + pd.to_timedelta(rng.integers(0, 700, rows), unit="D"),
+        "note": rng.choice(["", "rush", "gift wrap", None], rows),
+    })
+
+
+def main(rows: int = 100_000) -> None:
+    df = _make_frame(rows)
+    columns = ["customer", "region"]
+    dup_indices = df.index[df.duplicated(subset=columns, keep=False)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        _export_two_pass(df, os.path.join(tmp, "old.xlsx"), columns, dup_indices)
+        old = time.perf_counter() - start
+
+        start = time.perf_counter()
+        write_xlsx(df, os.path.join(tmp, "new.xlsx"), highlight=(df.index.isin(dup_indices), columns))
+        new = time.perf_counter() - start
+
+    print(f"Rows:              {rows:,} ({len(dup_indices):,} highlighted)")
+    print(f"Write + restyle:   {old:.2f}s ({rows / old:,.0f} rows/sec)")
+    print(f"Single pass:       {new:.2f}s ({rows / new:,.0f} rows/sec)")
+    print(f"Speedup:           {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
\ No newline at end of file
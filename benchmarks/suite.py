@@ -0,0 +1,366 @@
+"""
+Reproducible benchmark suite for the core operations: loading, every
+filter condition, sorting, every format option, both duplicate
+functions and CSV/XLSX export. Each operation runs on the same seeded
+synthetic data (see benchmarks/synthetic.py) and records wall time and
+peak resident memory. Results are saved as JSON and can be compared
+against a stored baseline to flag regressions.
+
+Run from the project root:
+    python -m benchmarks.suite --sizes 10k,1m --output results.json
+    python -m benchmarks.suite --sizes 10k --baseline results.json
+
+Exits with status 1 when --baseline is given and a regression is found.
+
+Timings from a single run vary by 10-30% on most machines, so a baseline
+recorded with --repeat 1 is not reliable enough to compare against. By
+default the suite makes one unrecorded warm-up round and then 5 rounds
+over all operations, interleaved so background load does not land on
+every run of one operation, and keeps the fastest run of each. Fastest
+runs are compared with each other. Operations that take under 2s get a
+wider tolerance, and changes under 2ms are ignored.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import DEFAULT_SEED, SIZES, make_frame
+
+# A result slower (or larger) than the baseline by more than this share is a regression
+DEFAULT_TOLERANCE = 0.10
+
+# Short operations are noisier; their tolerance is at least this share
+SHORT_OPERATION_SECONDS = 2.0
+SHORT_OPERATION_TOLERANCE = 0.25
+
+# Runs per operation after the warm-up round; the fastest is kept
+DEFAULT_REPEAT = 5
+
+# Differences below these are treated as noise whatever the ratio
+MIN_SECONDS_CHANGE = 0.002
+MIN_RSS_CHANGE_MB = 5.0
+
+# How often the memory sampler reads the resident set size
+RSS_SAMPLE_SECONDS = 0.005
+
+# Filter condition -> (column, value) on the synthetic frame
+FILTER_CASES = {
+    "equals": ("region", "West"),
+    "not_equals": ("region", "West"),
+    "contains": ("description", "refund"),
+    "not_contains": ("description", "refund"),
+    "greater_than": ("amount", "500"),
+    "less_than": ("amount", "100"),
+    "in_list": ("customer_id", ",".join(str(i) for i in range(1, 51))),
+    "not_in_list": ("region", "North,South"),
+}
+
+# Format option -> column it is applied to
+FORMAT_CASES = {
+    "trim_whitespace": "description",
+    "uppercase": "company",
+    "lowercase": "company",
+    "capitalize": "description",
+    "short_date": "ordered",
+    "long_date": "ordered",
+    "decimal": "amount",
+    "percentage": "discount",
+}
+
+DUPLICATE_COLUMNS = ["customer_id", "company", "amount"]
+
+
+def run_size(label: str, rows: int, seed: int, repeat: int, workdir: str) -> dict:
+    """
+    Run every operation on one dataset size. Returns {operation: result}.
+    A warm-up round fills caches and imports and is not recorded. The
+    operations then run in repeat rounds, each going through the whole
+    list, so a burst of background load slows one run of several
+    operations rather than every run of one. The fastest time and the
+    lowest peak memory of each are kept.
+    """
+    from core import audit, cache
+    from core.xlsx_writer import MAX_SHEET_ROWS, write_xlsx
+
+    # Keep the audit database and import cache of the run out of the project
+    audit.DB_PATH = os.path.join(workdir, "audit.db")
+    cache.CACHE_DIR = os.path.join(workdir, "cache")
+
+    print(f"\n=== {label}: {rows:,} rows (seed {seed}) ===")
+    frame = make_frame(rows, seed)
+    csv_path = os.path.join(workdir, f"{label}.csv")
+    frame.to_csv(csv_path, index=False)
+    xlsx_path = None
+    if rows < MAX_SHEET_ROWS:
+        xlsx_path = os.path.join(workdir, f"{label}.xlsx")
+        write_xlsx(frame, xlsx_path)
+    del frame
+
+    operations = []
+    loaded = {}
+
+    def record(name: str, fn, copy_frame=True):
+        operations.append((name, fn, copy_frame))
+
+    # Load paths: a cold parse, the import cache, and XLSX
+    from core.importer import read_file
+
+    def load_csv(_):
+        cache.purge()
+        loaded["df"] = read_file(csv_path)
+
+    record("load.csv", load_csv, copy_frame=False)
+    record("load.csv_cached", lambda _: read_file(csv_path), copy_frame=False)
+    if xlsx_path:
+        def load_xlsx(_):
+            cache.purge()
+            read_file(xlsx_path)
+        record("load.xlsx", load_xlsx, copy_frame=False)
+
+    from core.filtering import CONDITION_OPTIONS, _apply_filter
+    for condition in CONDITION_OPTIONS.values():
+        column, value = FILTER_CASES[condition]
+        record(f"filter.{condition}", lambda df, c=column, k=condition, v=value: _apply_filter(df, c, k, v))
+
+    from core.sorting import _apply_sort
+    record("sort.single", lambda df: _apply_sort(df, "amount", True))
+    record("sort.multi", lambda df: _apply_sort(df, ["region", "amount"], [True, False]))
+
+    from core.formatting import FORMAT_OPTIONS, _apply_format
+    for choice, name in FORMAT_OPTIONS.items():
+        record(f"format.{name}", lambda df, c=FORMAT_CASES[name], f=choice: _apply_format(df, c, f))
+
+    from core.duplicates import _identify_duplicates, _remove_duplicates
+    record("duplicates.identify", lambda df: _identify_duplicates(df, DUPLICATE_COLUMNS, highlight=False))
+    record("duplicates.remove", lambda df: _remove_duplicates(df, DUPLICATE_COLUMNS))
+
+    from core.exporter import _export_csv, _export_xlsx
+    out = os.path.join(workdir, "out")
+    record("export.csv", lambda df: _export_csv(df, out + ".csv", save_audit=False), copy_frame=False)
+    record("export.csv_gz", lambda df: _export_csv(df, out + ".csv.gz", save_audit=False), copy_frame=False)
+    if rows < MAX_SHEET_ROWS:
+        record("export.xlsx", lambda df: _export_xlsx(df, out + ".xlsx", save_audit=False), copy_frame=False)
+
+    for name, fn, copy_frame in operations:
+        _measure(fn, loaded.get("df"), copy_frame)
+
+    runs = {name: [] for name, _, _ in operations}
+    for _ in range(repeat):
+        for name, fn, copy_frame in operations:
+            runs[name].append(_measure(fn, loaded.get("df"), copy_frame))
+
+    results = {}
+    for name, measured in runs.items():
+        best = dict(min(measured, key=lambda r: r["seconds"]), runs=[r["seconds"] for r in measured])
+        # Peak memory depends on what ran just before, so keep the lowest too
+        for key in ("peak_rss_mb", "rss_growth_mb"):
+            if best[key] is not None:
+                best[key] = min(r[key] for r in measured)
+        results[name] = best
+        _print_result(name, results[name])
+    return results
+
+
+def _measure(fn, df, copy_frame: bool) -> dict:
+    """
+    Run fn(df) once on fresh app state.
+    Operations that change their input get a copy, made outside the timing.
+    """
+    from core.audit import clear_audit_log
+    from core.state import reset_state, set_dataframe
+
+    reset_state()
+    clear_audit_log()
+    work = df.copy() if copy_frame and df is not None else df
+    if work is not None:
+        set_dataframe(work)
+
+    output = io.StringIO()
+    with _RssSampler() as rss, contextlib.redirect_stdout(output):
+        start = time.perf_counter()
+        fn(work)
+        seconds = time.perf_counter() - start
+    reset_state()
+
+    result = {"seconds": round(seconds, 6), "peak_rss_mb": rss.peak_mb, "rss_growth_mb": rss.growth_mb}
+    # The app prints its errors instead of raising them
+    errors = [line for line in output.getvalue().splitlines() if "error" in line.lower()]
+    if errors:
+        result["error"] = errors[0].strip()
+    return result
+
+
+class _RssSampler:
+    """Sample the resident set size on a background thread while a block runs."""
+
+    def __enter__(self):
+        self.start_mb = _rss_mb()
+        self.peak_mb = self.start_mb
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._update()
+        self.peak_mb = round(self.peak_mb, 1) if self.peak_mb is not None else None
+        self.growth_mb = round(self.peak_mb - self.start_mb, 1) if self.peak_mb is not None else None
+        return False
+
+    def _sample(self):
+        while not self._stop.wait(RSS_SAMPLE_SECONDS):
+            self._update()
+
+    def _update(self):
+        current = _rss_mb()
+        if current is not None and (self.peak_mb is None or current > self.peak_mb):
+            self.peak_mb = current
+
+
+def _rss_mb():
+    """Current resident set size in MB, or None when it cannot be read."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 ** 2
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _print_result(name: str, result: dict) -> None:
+    rss = f"{result['peak_rss_mb']:>9,.1f} MB" if result["peak_rss_mb"] is not None else "        n/a"
+    note = f"  ({result['error']})" if "error" in result else ""
+    print(f"  {name:<26} {result['seconds']:>9.3f}s {rss}{note}")
+
+
+def compare(results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list:
+    """
+    Compare two result files. Prints every operation found in both and
+    returns a list of regression descriptions: a fastest run slower than
+    the baseline's fastest run, or a higher peak memory, by more than
+    tolerance and more than the noise floor. Operations that took under
+    SHORT_OPERATION_SECONDS in the baseline may be up to
+    SHORT_OPERATION_TOLERANCE slower.
+    """
+    regressions = []
+    print(
+        f"\n=== COMPARISON WITH BASELINE (tolerance {tolerance:.0%}, "
+        f"{max(tolerance, SHORT_OPERATION_TOLERANCE):.0%} under {SHORT_OPERATION_SECONDS:g}s) ==="
+    )
+    for size, ops in results["results"].items():
+        base_ops = baseline.get("results", {}).get(size)
+        if not base_ops:
+            continue
+        print(f"\n{size}:")
+        print(f"  {'operation':<26} {'baseline':>10} {'current':>10} {'change':>8}")
+        for name, current in ops.items():
+            base = base_ops.get(name)
+            if base is None:
+                continue
+
+            change = current["seconds"] / base["seconds"] - 1 if base["seconds"] > 0 else 0.0
+            allowed = tolerance
+            if base["seconds"] < SHORT_OPERATION_SECONDS:
+                allowed = max(tolerance, SHORT_OPERATION_TOLERANCE)
+            flags = []
+            if change > allowed and current["seconds"] - base["seconds"] > MIN_SECONDS_CHANGE:
+                flags.append("SLOWER")
+            if (
+                current.get("peak_rss_mb") is not None and base.get("peak_rss_mb")
+                and current["peak_rss_mb"] > base["peak_rss_mb"] * (1 + tolerance)
+                and current["peak_rss_mb"] - base["peak_rss_mb"] > MIN_RSS_CHANGE_MB
+            ):
+                flags.append("MORE MEMORY")
+
+            print(
+                f"  {name:<26} {base['seconds']:>9.3f}s {current['seconds']:>9.3f}s {change:>+7.0%}"
+                + (f"  {' / '.join(flags)}" if flags else "")
+            )
+            if flags:
+                regressions.append(f"{size} {name}: {' / '.join(flags).lower()}")
+    return regressions
+
+
+def _environment(seed: int) -> dict:
+    import openpyxl
+
+    return {
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "seed": seed,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "openpyxl": openpyxl.__version__,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the core operations on synthetic data.")
+    parser.add_argument("--sizes", default=",".join(SIZES),
+                        help=f"comma-separated dataset sizes from {', '.join(SIZES)} (default: all)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="random seed of the synthetic data")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"runs per operation; the fastest is kept (default {DEFAULT_REPEAT})")
+    parser.add_argument("--output", metavar="FILE", help="save the results as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="compare against a saved results file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown before a regression is flagged (default 0.10)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    sizes = [s.strip().lower() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        print(f"Unknown size(s): {', '.join(unknown)}. Choose from {', '.join(SIZES)}.")
+        return 2
+
+    results = {"environment": _environment(args.seed), "results": {}}
+    with tempfile.TemporaryDirectory(prefix="datalytics_bench_") as workdir:
+        for label in sizes:
+            results["results"][label] = run_size(label, SIZES[label], args.seed, max(args.repeat, 1), workdir)
+
+        from core.audit import close_audit_log
+        close_audit_log()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s):")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nNo regressions.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""
+Seeded synthetic datasets for the benchmark suite. The same rows and
+seed always give the same frame, so timings from different runs and
+machines describe the same work.
+
+The frame mixes the kinds of data the app is used on:
+  order_id      int, unique
+  customer_id   int, a few thousand repeat customers
+  region        short text with a handful of values
+  company       company names with case, punctuation and suffix noise
+  description   wide free text (about 80-120 characters)
+  amount        float with some missing values
+  discount      float between 0 and 1
+  ordered       dirty dates: ISO, US and long formats, blanks and junk
+  active        bool
+About 10% of the rows repeat an earlier row exactly.
+"""
+import numpy as np
+import pandas as pd
+
+DEFAULT_SEED = 20240501
+
+# Named sizes used by the suite
+SIZES = {
+    "10k": 10_000,
+    "1m": 1_000_000,
+    "10m": 10_000_000,
+}
+
+DUPLICATE_SHARE = 0.10
+
+_REGIONS = np.array(["North", "South", "East", "West", "Central", "Overseas"], dtype=object)
+_WORDS = np.array(
+    "order shipped delayed customer requested refund invoice pending approved warehouse express standard "
+    "fragile priority returned damaged replacement discount bulk wholesale retail online store pickup".split(),
+    dtype=object,
+)
+_SYLLABLES = np.array(["ac", "me", "glo", "bex", "ini", "tech", "um", "brel", "la", "hoo", "vand", "sto"], dtype=object)
+_SUFFIXES = np.array([" Inc.", " Inc", " LLC", " Ltd", " Corp", ""], dtype=object)
+
+
+def make_frame(rows: int, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """Build the synthetic frame with the given number of rows."""
+    rng = np.random.default_rng(seed)
+    unique_rows = rows - int(rows * DUPLICATE_SHARE)
+
+    df = pd.DataFrame({
+        "order_id": np.arange(unique_rows, dtype=np.int64),
+        "customer_id": rng.integers(1, max(unique_rows // 50, 2), unique_rows),
+        "region": _REGIONS[rng.integers(0, len(_REGIONS), unique_rows)],
+        "company": _companies(rng, unique_rows),
+        "description": _descriptions(rng, unique_rows),
+        "amount": np.round(rng.gamma(2.0, 150.0, unique_rows), 2),
+        "discount": np.round(rng.random(unique_rows), 2),
+        "ordered": _dirty_dates(rng, unique_rows),
+        "active": rng.random(unique_rows) < 0.8,
+    })
+    df.loc[rng.random(unique_rows) < 0.02, "amount"] = np.nan
+
+    # Exact repeats of earlier rows, scattered through the frame
+    repeats = df.iloc[rng.integers(0, unique_rows, rows - unique_rows)]
+    df = pd.concat([df, repeats], ignore_index=True)
+    return df.iloc[rng.permutation(rows)].reset_index(drop=True)
+
+
+def _companies(rng, n: int) -> np.ndarray:
+    bases = max(n // 20, 1)
+    parts = _SYLLABLES[rng.integers(0, len(_SYLLABLES), (bases, 3))]
+    names = np.array(["".join(p).title() for p in parts], dtype=object)
+    out = names[rng.integers(0, bases, n)] + _SUFFIXES[rng.integers(0, len(_SUFFIXES), n)]
+    upper = rng.random(n) < 0.1
+    out[upper] = [s.upper() for s in out[upper]]
+    return out
+
+
+def _descriptions(rng, n: int) -> np.ndarray:
+    # Built from a pool of distinct sentences to keep generation fast
+    pool_size = min(n, 50_000)
+    lengths = rng.integers(12, 18, pool_size)
+    pool = np.array(
+        [" ".join(_WORDS[rng.integers(0, len(_WORDS), k)]).capitalize() + "." for k in lengths], dtype=object
+    )
+    out = pool[rng.integers(0, pool_size, n)]
+    padded = rng.random(n) < 0.05
+    out[padded] = "  " + out[padded] + "  "  # untrimmed whitespace
+    return out
+
+
+def _dirty_dates(rng, n: int) -> np.ndarray:
+    days = pd.Timestamp("2019-01-01") + pd.to_timedelta(rng.integers(0, 1800, n), unit="D")
+    styles = rng.choice(4, size=n, p=[0.6, 0.25, 0.1, 0.05])
+    out = np.asarray(days.strftime("%Y-%m-%d"), dtype=object)
+    out[styles == 1] = np.asarray(days[styles == 1].strftime("%m/%d/%Y"), dtype=object)
+    out[styles == 2] = np.asarray(days[styles == 2].strftime("%B %d, %Y"), dtype=object)
+    junk = np.flatnonzero(styles == 3)
+    out[junk] = np.where(rng.random(len(junk)) < 0.5, "", "not a date")
+    return out
\ No newline at end of file
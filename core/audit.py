@@ -1,98 +1,136 @@
-import sqlite3
+import atexit
 import os
 from datetime import datetime
 
-from core.state import get_dataframe
+from core.state import has_data
 
 DB_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "datalytics_audit.db"))
 
 
-def _get_connection():
-    conn = sqlite3.connect(DB_PATH)
-    return conn
+# Number of buffered entries that triggers a flush on its own
+AUDIT_BATCH_SIZE = 500
+
+_INSERT_SQL = """
+    INSERT INTO audit_log (time, action_type, conditions, columns, rows_affected, details)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
 
+_conn = None     # one long-lived connection for the whole session
+_buffer = []     # entries waiting to be written
+_db_ready = False  # table created and cleared for this run
 
-def _init_db():
+
+def _get_connection():
+    """
+    Return the shared audit connection, opening it on first use.
+    The database is only created and cleared at that point, so importing
+    this module (and starting the app) never touches the disk.
+    WAL mode lets readers and the writer work without blocking each other,
+    and synchronous=FULL makes every flush durable once it returns.
+    """
+    global _conn, _db_ready
+    if _conn is None:
+        import sqlite3
+        _conn = sqlite3.connect(DB_PATH)
+        _conn.execute("PRAGMA journal_mode=WAL;")
+        _conn.execute("PRAGMA synchronous=FULL;")
+        if not _db_ready:
+            _init_db(_conn)
+            _db_ready = True
+    return _conn
+
+
+def _init_db(conn):
     """Create the audit_log table if it does not exist, and clear it for this run."""
-    conn = _get_connection()
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS audit_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                time TEXT NOT NULL,
-                action_type TEXT NOT NULL,
-                conditions TEXT,
-                columns TEXT,
-                rows_affected INTEGER,
-                details TEXT
-            );
-            """
-        )
-        conn.commit()
-    finally:
-        conn.close()
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS audit_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            time TEXT NOT NULL,
+            action_type TEXT NOT NULL,
+            conditions TEXT,
+            columns TEXT,
+            rows_affected INTEGER,
+            details TEXT
+        );
+        """
+    )
+    conn.commit()
 
     # After ensuring the table exists, clear any old rows from previous runs
-    clear_audit_log()
+    _clear_table(conn)
 
 
 def clear_audit_log():
-    """Delete all rows from the audit log table."""
-    conn = _get_connection()
-    try:
-        cur = conn.cursor()
-        cur.execute("DELETE FROM audit_log;")
-        cur.execute("DELETE FROM sqlite_sequence WHERE name='audit_log';")  # reset autoincrement   
-        conn.commit()
-    finally:
-        conn.close()
+    """Delete all rows from the audit log table, including unflushed entries."""
+    _buffer.clear()
 
+    # A database that has not been opened yet will be cleared when it is
+    if _conn is not None:
+        _clear_table(_conn)
 
-# Initialize DB and clear any previous data when module is first imported
-# This ensures the table exists and is ready for use
-_init_db()
+
+def _clear_table(conn):
+    conn.execute("DELETE FROM audit_log;")
+    conn.execute("DELETE FROM sqlite_sequence WHERE name='audit_log';")  # reset autoincrement
+    conn.commit()
 
 
 def log_action(action_type, details="", conditions=None, columns=None, rows_affected=None):
-    """Insert one action into the audit_log table."""
+    """
+    Buffer one action for the audit_log table.
+    Entries are written in batches by flush_audit_log, which runs on
+    export, undo, exit, when reading the log, or once AUDIT_BATCH_SIZE
+    entries are waiting.
+    """
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     colstr = ",".join(columns) if columns else None
 
+    _buffer.append((timestamp, action_type, conditions, colstr, rows_affected, details))
+
+    if len(_buffer) >= AUDIT_BATCH_SIZE:
+        flush_audit_log()
+
+
+def flush_audit_log():
+    """Write all buffered entries in one transaction and commit them durably."""
+    if not _buffer:
+        return
+
     conn = _get_connection()
+    with conn:
+        conn.executemany(_INSERT_SQL, _buffer)
+    _buffer.clear()
+
+
+def close_audit_log():
+    """Flush pending entries and close the shared connection."""
+    global _conn
+    if _conn is None:
+        return
+
     try:
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO audit_log (time, action_type, conditions, columns, rows_affected, details)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (timestamp, action_type, conditions, colstr, rows_affected, details),
-        )
-        conn.commit()
+        flush_audit_log()
     finally:
-        conn.close()
+        _conn.close()
+        _conn = None
+
+
+# Make sure buffered entries reach disk however the process exits
+atexit.register(close_audit_log)
 
 
 def get_audit_log():
     """Return list of log entries."""
-    conn = _get_connection()
-    try:
-        cur = conn.cursor()
-        cur.execute("SELECT * FROM audit_log ORDER BY id")
-        rows = cur.fetchall()
-    finally:
-        conn.close()
+    flush_audit_log()
 
-    return rows
+    cur = _get_connection().execute("SELECT * FROM audit_log ORDER BY id")
+    return cur.fetchall()
 
 
 def print_audit_log():
     """Print audit entries to the terminal."""
-    df = get_dataframe()
-
-    if df is None:
+    if not has_data():
         print("No file loaded. Please import a file first.")
         return
 
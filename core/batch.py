@@ -0,0 +1,337 @@
+import contextlib
+import glob
+import io
+import json
+import time
+from pathlib import Path
+
+from core.state import get_dataframe, reset_state, set_dataframe
+from core.audit import log_action, clear_audit_log, flush_audit_log
+
+# op -> keys that every step of that op must provide
+STEP_KEYS = {
+    "filter": ("column", "condition", "value"),
+    "sort": ("column",),
+    "format": ("column", "format"),
+    "dedupe": ("columns",),
+    "identify": ("columns",),
+    "export": ("path",),
+}
+
+# Keys of a compound filter step, used instead of column/condition/value
+COMPOUND_FILTER_KEYS = ("conditions", "expression")
+
+
+def load_recipe(path: str) -> dict:
+    """
+    Load a recipe from a .json file, or from .yaml/.yml when PyYAML is
+    installed. A recipe looks like:
+
+        {
+          "inputs": ["data/*.csv"],
+          "steps": [
+            {"op": "filter", "column": "region", "condition": "equals", "value": "West"},
+            {"op": "filter", "conditions": [["revenue", "greater_than", 100], ["region", "equals", "East"]],
+             "expression": "1 OR NOT 2"},
+            {"op": "sort", "column": ["region", "revenue"], "ascending": [true, false], "limit": 100},
+            {"op": "format", "column": "name", "format": "trim_whitespace"},
+            {"op": "dedupe", "columns": ["customer_id"]},
+            {"op": "identify", "columns": ["company"], "fuzzy": 0.9, "highlight": true},
+            {"op": "export", "path": "out/{stem}_clean.csv"},
+            {"op": "export", "path": "out/{stem}_by_region.xlsx", "split_by": "region"},
+            {"op": "export", "path": "out/all.db", "table": "{stem}", "index_columns": ["customer_id"]}
+          ]
+        }
+
+    Raises ValueError if the recipe is malformed.
+    """
+    ext = Path(path).suffix.lower()
+    with open(path, "r", encoding="utf-8") as f:
+        if ext in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("PyYAML is required for YAML recipes. Use a .json recipe instead.")
+            recipe = yaml.safe_load(f)
+        else:
+            recipe = json.load(f)
+
+    validate_recipe(recipe)
+    return recipe
+
+
+def validate_recipe(recipe) -> None:
+    """Check a recipe's structure before any file is touched."""
+    from core.filtering import CONDITION_OPTIONS, parse_expression
+
+    if not isinstance(recipe, dict) or not isinstance(recipe.get("steps"), list):
+        raise ValueError("Invalid recipe: expected an object with a 'steps' list.")
+
+    for n, step in enumerate(recipe["steps"], start=1):
+        op = step.get("op") if isinstance(step, dict) else None
+        if op not in STEP_KEYS:
+            raise ValueError(f"Invalid recipe step {n}: unknown op '{op}'.")
+
+        compound = op == "filter" and "expression" in step
+        missing = [k for k in (COMPOUND_FILTER_KEYS if compound else STEP_KEYS[op]) if k not in step]
+        if missing:
+            raise ValueError(f"Invalid recipe step {n} ({op}): missing {', '.join(missing)}.")
+
+        if compound:
+            conditions = step["conditions"]
+            if not isinstance(conditions, list) or not all(
+                isinstance(c, list) and len(c) == 3 for c in conditions
+            ):
+                raise ValueError(f"Invalid recipe step {n}: conditions must be [column, condition, value] lists.")
+            for _, condition, _ in conditions:
+                if condition not in CONDITION_OPTIONS.values():
+                    raise ValueError(f"Invalid recipe step {n}: unknown condition '{condition}'.")
+            try:
+                parse_expression(str(step["expression"]), conditions)
+            except ValueError as e:
+                raise ValueError(f"Invalid recipe step {n}: {e}")
+
+        elif op == "filter" and step["condition"] not in CONDITION_OPTIONS.values():
+            raise ValueError(f"Invalid recipe step {n}: unknown condition '{step['condition']}'.")
+
+        if op == "format" and _format_choice(step["format"]) is None:
+            raise ValueError(f"Invalid recipe step {n}: unknown format '{step['format']}'.")
+
+        if op == "export" and not isinstance(step.get("index_columns", []), list):
+            raise ValueError(f"Invalid recipe step {n}: index_columns must be a list of column names.")
+
+
+def expand_inputs(patterns) -> list:
+    """Expand a path, glob or list of them into a sorted list of files."""
+    if isinstance(patterns, str):
+        patterns = [patterns]
+
+    files = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True))
+        files.extend(matches if matches else [pattern])
+    return files
+
+
+def run_recipe(recipe_path: str, inputs=None, verbose: bool = False) -> int:
+    """
+    Run a recipe over every input file without any prompts.
+    Inputs given on the command line replace the recipe's 'inputs'.
+    Prints per-step timings and returns the number of files that failed.
+    """
+    try:
+        recipe = load_recipe(recipe_path)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: Could not load recipe: {e}")
+        return 1
+
+    files = expand_inputs(inputs or recipe.get("inputs", []))
+    if not files:
+        print("ERROR: No input files given.")
+        return 1
+
+    # Every input file must write to its own outputs; SQLite steps may
+    # share a file with one table per input, or append to one table
+    for step in (s for s in recipe["steps"] if s["op"] == "export"):
+        template, table = step["path"], step.get("table", "data")
+        try:
+            targets = {(_export_path(template, path), _export_path(table, path)) for path in files}
+        except (KeyError, IndexError, ValueError):
+            print(f"ERROR: Invalid export path '{template}'. Use {{stem}}, {{name}} or {{dir}} placeholders.")
+            return 1
+        if len(targets) < len(files) and step.get("replace", True):
+            print(f"ERROR: Export path '{template}' gives the same file for several inputs. "
+                  "Add a {stem} or {name} placeholder.")
+            return 1
+
+    failures = 0
+    total_rows = 0
+    batch_start = time.perf_counter()
+
+    for path in files:
+        print(f"\n=== {path} ===")
+        try:
+            rows, timings = run_steps(path, recipe["steps"], verbose)
+            total_rows += rows
+            for label, seconds, rows_after in timings:
+                print(f"   {label:<40} {seconds:8.3f}s   rows: {rows_after}")
+        except Exception as e:
+            failures += 1
+            print(f"   FAILED: {e}")
+
+    elapsed = time.perf_counter() - batch_start
+    print(f"\nProcessed {len(files) - failures}/{len(files)} file(s) in {elapsed:.2f}s "
+          f"({total_rows / max(elapsed, 1e-9):,.0f} input rows/sec).")
+    return failures
+
+
+def run_steps(path: str, steps: list, verbose: bool = False):
+    """
+    Import one file and apply the recipe steps to it through the same
+    _apply_* functions the menus use.
+    Returns (input rows, [(step label, seconds, rows after), ...]).
+    """
+    from core.importer import read_file
+
+    timings = []
+    out = None if verbose else io.StringIO()
+
+    with _quiet(out):
+        start = time.perf_counter()
+        df = read_file(path)
+        reset_state()
+        clear_audit_log()
+        set_dataframe(df, path)
+        log_action("IMPORT", details=f"Imported file '{path}' (batch)", rows_affected=len(df))
+    timings.append(("import", time.perf_counter() - start, len(df)))
+    input_rows = len(df)
+
+    for step in steps:
+        label = _describe(step)
+        start = time.perf_counter()
+        try:
+            with _quiet(out):
+                _run_step(path, step)
+        except Exception as e:
+            # Add the message the interactive code printed, if it was silenced
+            printed = _last_line(out)
+            raise RuntimeError(f"{label}: {e}" + (f" ({printed})" if printed else ""))
+        timings.append((label, time.perf_counter() - start, len(get_dataframe())))
+
+    flush_audit_log()
+    return input_rows, timings
+
+
+def _run_step(path: str, step: dict) -> None:
+    """Apply a single recipe step to the active DataFrame."""
+    df = get_dataframe()
+    op = step["op"]
+
+    compound = op == "filter" and "expression" in step
+    if compound:
+        from core.filtering import _expression_columns
+        conditions = [(column, condition, str(value)) for column, condition, value in step["conditions"]]
+        columns = _expression_columns(conditions)
+    else:
+        columns = step.get("columns") or step.get("column")
+    if not isinstance(columns, list):
+        columns = [columns]
+    if op != "export":
+        unknown = [c for c in columns if c not in df.columns]
+        if unknown:
+            raise ValueError(f"{op}: unknown column(s) {unknown}")
+
+    if compound:
+        from core.filtering import _apply_compound_filter
+        if not _apply_compound_filter(df, conditions, str(step["expression"])):
+            raise ValueError(f"filter '{step['expression']}' could not be applied")
+
+    elif op == "filter":
+        from core.filtering import _apply_filter
+        if not _apply_filter(df, step["column"], step["condition"], str(step["value"])):
+            raise ValueError(f"filter on '{step['column']}' could not be applied to value '{step['value']}'")
+
+    elif op == "sort":
+        from core.sorting import _apply_sort, _apply_top_n
+        if step.get("limit"):
+            done = _apply_top_n(df, step["column"], step.get("ascending", True), int(step["limit"]))
+        else:
+            done = _apply_sort(df, step["column"], step.get("ascending", True))
+        if not done:
+            raise ValueError(f"sort on {step['column']} failed")
+
+    elif op == "format":
+        from core.formatting import _apply_format
+        if not _apply_format(df, step["column"], _format_choice(step["format"])):
+            raise ValueError(f"format on '{step['column']}' failed")
+
+    elif op == "dedupe":
+        from core.duplicates import _remove_duplicates, _remove_near_duplicates
+        if step.get("fuzzy"):
+            _remove_near_duplicates(df, step["columns"], _fuzzy_threshold(step["fuzzy"]))
+        else:
+            _remove_duplicates(df, step["columns"])
+
+    elif op == "identify":
+        from core.duplicates import _identify_duplicates, _identify_near_duplicates
+        if step.get("fuzzy"):
+            _identify_near_duplicates(
+                df, step["columns"], _fuzzy_threshold(step["fuzzy"]), highlight=step.get("highlight", False)
+            )
+        else:
+            _identify_duplicates(df, step["columns"], highlight=step.get("highlight", False))
+
+    elif op == "export":
+        from core.csv_writer import CSV_EXTENSIONS
+        from core.sqlite_io import SQLITE_EXTENSIONS
+        from core.exporter import _export_csv, _export_sqlite, _export_xlsx
+        target = _export_path(step["path"], path)
+        if not target.lower().endswith(CSV_EXTENSIONS + SQLITE_EXTENSIONS + (".xlsx",)):
+            target += ".csv"
+
+        save_audit = step.get("save_audit_log", False)
+        if target.lower().endswith(".xlsx"):
+            done = _export_xlsx(df, target, save_audit=save_audit, split_by=step.get("split_by"))
+        elif target.lower().endswith(SQLITE_EXTENSIONS):
+            done = _export_sqlite(
+                df,
+                target,
+                _export_path(step.get("table", "data"), path),
+                index_columns=step.get("index_columns", ()),
+                replace=step.get("replace", True),
+                save_audit=save_audit,
+            )
+        else:
+            done = _export_csv(df, target, save_audit=save_audit)
+        if not done:
+            raise ValueError(f"export to '{target}' failed")
+
+
+def _format_choice(value):
+    """Accept a format by menu number ("1") or name ("trim_whitespace")."""
+    from core.formatting import FORMAT_OPTIONS
+
+    value = str(value)
+    if value in FORMAT_OPTIONS:
+        return value
+    for choice, name in FORMAT_OPTIONS.items():
+        if name == value:
+            return choice
+    return None
+
+
+def _fuzzy_threshold(value) -> float:
+    """A step's "fuzzy" key is true for the default threshold, or the threshold itself."""
+    from core.fuzzy import DEFAULT_THRESHOLD
+    return DEFAULT_THRESHOLD if value is True else float(value)
+
+
+def _export_path(template: str, input_path: str) -> str:
+    """Fill {stem}, {name} and {dir} in an export path from the input file."""
+    p = Path(input_path)
+    return template.format(stem=p.stem, name=p.name, dir=str(p.parent))
+
+
+def _describe(step: dict) -> str:
+    details = ", ".join(f"{k}={v}" for k, v in step.items() if k != "op")
+    label = f"{step['op']} ({details})"
+    return label if len(label) <= 40 else label[:37] + "..."
+
+
+def _last_line(buffer) -> str:
+    if buffer is None:
+        return ""
+    lines = [line for line in buffer.getvalue().splitlines() if line.strip()]
+    return lines[-1].strip() if lines else ""
+
+
+@contextlib.contextmanager
+def _quiet(buffer):
+    """Silence the interactive previews unless running verbose."""
+    if buffer is None:
+        yield
+        return
+    buffer.seek(0)
+    buffer.truncate()
+    with contextlib.redirect_stdout(buffer):
+        yield
\ No newline at end of file
@@ -0,0 +1,259 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".datalytics_cache"))
+
+CACHE_MAX_BYTES = 2 * 1024 ** 3  # evict least recently used entries above 2 GB
+
+_HASH_BLOCK = 1024 * 1024
+
+
+def file_fingerprint(path: str) -> str:
+    """
+    Return a cache key for a source file built from its absolute path,
+    size and modification time. The file is not read: a hash of its
+    contents is saved with each entry and checked by load_cached only
+    once an entry with this key exists.
+    """
+    stat = os.stat(path)
+    key = hashlib.blake2b(digest_size=16)
+    key.update(os.path.abspath(path).encode("utf-8"))
+    key.update(f"|{stat.st_size}|{stat.st_mtime_ns}|".encode("utf-8"))
+    return key.hexdigest()
+
+
+def content_digest(path: str) -> str:
+    """Return a hash of a file's contents."""
+    content = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            content.update(block)
+    return content.hexdigest()
+
+
+def variant_key(key: str, *options) -> str:
+    """Derive the cache key of one way of reading a file (e.g. a sheet selection)."""
+    variant = hashlib.blake2b(digest_size=16)
+    variant.update(key.encode("utf-8"))
+    variant.update(repr(options).encode("utf-8"))
+    return variant.hexdigest()
+
+
+def load_cached(path: str, key: str = None):
+    """
+    Return the cached DataFrame for an unchanged source file, or None.
+    Numeric columns are memory-mapped straight from their .npy files,
+    copy-on-write, and are not copied into memory until written to.
+    """
+    key = key or file_fingerprint(path)
+    entry_dir = os.path.join(CACHE_DIR, key)
+    meta = _read_meta(entry_dir)
+    if meta is None:
+        return None
+
+    # Same size and modification time; make sure the contents match too
+    if meta.get("digest") != content_digest(path):
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        return None
+
+    try:
+        data = {}
+        for i, kind in enumerate(meta["kinds"]):
+            base = os.path.join(entry_dir, f"c{i}")
+            if kind == "array":
+                data[i] = np.load(base + ".npy", mmap_mode="c").view(np.ndarray)
+            else:
+                codes = np.load(base + ".codes.npy", mmap_mode="c")
+                categories = np.load(base + ".cats.npy", allow_pickle=True)
+                if kind == "category":
+                    data[i] = pd.Categorical.from_codes(codes, categories)
+                elif len(categories) == 0:
+                    data[i] = np.full(len(codes), np.nan, dtype=object)
+                else:
+                    values = categories.take(codes, mode="clip").astype(object)
+                    values[codes < 0] = np.nan
+                    data[i] = values
+
+        df = pd.DataFrame(data, copy=False)
+        df.columns = meta["columns"]
+    except Exception:
+        # A damaged entry is treated as a miss and removed
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        return None
+
+    meta["last_used"] = time.time()
+    _write_meta(entry_dir, meta)
+    return df
+
+
+def store(path: str, df: pd.DataFrame, key: str = None) -> bool:
+    """
+    Save a columnar copy of df under the fingerprint of its source file.
+    An entry with the same key is replaced, and entries made from an
+    older version of the same file are dropped; other variants of the
+    current file are kept. Returns False if the frame cannot be cached
+    (for example non-JSON column names).
+    """
+    key = key or file_fingerprint(path)
+    source = os.path.abspath(path)
+    columns = list(df.columns)
+
+    try:
+        json.dumps(columns)
+    except TypeError:
+        return False
+
+    # Drop copies of earlier versions of the same file before writing the new one
+    stat = os.stat(path)
+    for entry in list_entries():
+        if entry["source"] == source and (entry["size"], entry["mtime"]) != (stat.st_size, stat.st_mtime):
+            shutil.rmtree(os.path.join(CACHE_DIR, entry["key"]), ignore_errors=True)
+
+    entry_dir = os.path.join(CACHE_DIR, key)
+    tmp_dir = entry_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    try:
+        kinds = []
+        for i in range(len(columns)):
+            series = df.iloc[:, i]
+            base = os.path.join(tmp_dir, f"c{i}")
+
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                np.save(base + ".codes.npy", series.cat.codes.to_numpy())
+                np.save(base + ".cats.npy", series.cat.categories.to_numpy(dtype=object), allow_pickle=True)
+                kinds.append("category")
+            elif isinstance(series.dtype, np.dtype) and series.dtype.kind in "biufmM":
+                np.save(base + ".npy", series.to_numpy())
+                kinds.append("array")
+            else:
+                # Text and mixed columns are stored dictionary-encoded
+                codes, uniques = pd.factorize(series, use_na_sentinel=True)
+                np.save(base + ".codes.npy", codes)
+                np.save(base + ".cats.npy", np.asarray(uniques, dtype=object), allow_pickle=True)
+                kinds.append("object")
+
+        nbytes = sum(
+            os.path.getsize(os.path.join(tmp_dir, name)) for name in os.listdir(tmp_dir)
+        )
+        meta = {
+            "source": source,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "digest": content_digest(path),
+            "rows": len(df),
+            "columns": columns,
+            "kinds": kinds,
+            "nbytes": nbytes,
+            "created": time.time(),
+            "last_used": time.time(),
+        }
+        _write_meta(tmp_dir, meta)
+
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        os.replace(tmp_dir, entry_dir)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return False
+
+    evict()
+    return True
+
+
+def list_entries() -> list:
+    """Return metadata for every cache entry, most recently used first."""
+    if not os.path.isdir(CACHE_DIR):
+        return []
+
+    entries = []
+    for key in os.listdir(CACHE_DIR):
+        meta = _read_meta(os.path.join(CACHE_DIR, key))
+        if meta is not None:
+            meta["key"] = key
+            entries.append(meta)
+
+    entries.sort(key=lambda m: m["last_used"], reverse=True)
+    return entries
+
+
+def evict(max_bytes: int = None) -> int:
+    """
+    Remove least recently used entries until the cache fits in max_bytes.
+    Returns the number of entries removed.
+    """
+    limit = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    entries = list_entries()
+    total = sum(e["nbytes"] for e in entries)
+
+    removed = 0
+    while entries and total > limit:
+        oldest = entries.pop()
+        shutil.rmtree(os.path.join(CACHE_DIR, oldest["key"]), ignore_errors=True)
+        total -= oldest["nbytes"]
+        removed += 1
+
+    return removed
+
+
+def purge() -> int:
+    """Delete every cache entry. Returns the number of entries removed."""
+    count = len(list_entries())
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+    return count
+
+
+def print_cache():
+    """Print cache entries and total size to the terminal."""
+    entries = list_entries()
+
+    print("\n=== IMPORT CACHE ===")
+    print(f"Location: {CACHE_DIR}")
+    if not entries:
+        print("Cache is empty.")
+        return
+
+    total = sum(e["nbytes"] for e in entries)
+    for e in entries:
+        used = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(e["last_used"]))
+        print(f"- {e['source']}")
+        print(f"   Rows: {e['rows']}  Columns: {len(e['columns'])}  Size: {e['nbytes'] / 1024 ** 2:.1f} MB  Last used: {used}")
+
+    print(f"\nTotal: {len(entries)} entries, {total / 1024 ** 2:.1f} MB of {CACHE_MAX_BYTES / 1024 ** 2:.0f} MB")
+
+
+def cache_flow():
+    """Inspect or purge the import cache."""
+    from utils.menus import show_cache_menu
+
+    while True:
+        choice = show_cache_menu()
+
+        if choice == "1":
+            print_cache()
+        elif choice == "2":
+            removed = purge()
+            print(f"Import cache purged ({removed} entries removed).")
+        elif choice == "0":
+            return
+        else:
+            print("Invalid choice.")
+
+
+def _read_meta(entry_dir: str):
+    try:
+        with open(os.path.join(entry_dir, "meta.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(entry_dir: str, meta: dict) -> None:
+    with open(os.path.join(entry_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
\ No newline at end of file
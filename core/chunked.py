@@ -0,0 +1,184 @@
+import pandas as pd
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+# Number of data lines sampled to turn a byte budget into a row count
+SAMPLE_LINES = 1000
+
+STREAM_SUGGEST_BYTES = 512 * 1024 * 1024  # offer streaming mode above 512 MB
+
+_UNITS = {"KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+
+
+def parse_chunk_budget(text: str):
+    """
+    Parse a chunk budget typed by the user.
+    "50000" means 50,000 rows; "64MB" (or KB/GB) means a byte budget.
+    Returns (chunk_rows, chunk_bytes) with exactly one of them set.
+    Raises ValueError for anything else.
+    """
+    value = text.strip().upper().replace(" ", "")
+
+    for unit, factor in _UNITS.items():
+        if value.endswith(unit):
+            number = float(value[: -len(unit)])
+            if number <= 0:
+                raise ValueError("Chunk size must be greater than zero.")
+            return None, int(number * factor)
+
+    if not value.isdigit() or int(value) <= 0:
+        raise ValueError(f"Invalid chunk size: '{text}'. Use a row count or a size like 64MB.")
+
+    return int(value), None
+
+
+def rows_for_byte_budget(path: str, chunk_bytes: int) -> int:
+    """
+    Estimate how many rows fit in chunk_bytes by sampling line lengths
+    from the start of the file.
+    """
+    total = 0
+    count = 0
+    with open(path, "rb") as f:
+        f.readline()  # skip header
+        for line in f:
+            total += len(line)
+            count += 1
+            if count >= SAMPLE_LINES:
+                break
+
+    if count == 0:
+        return DEFAULT_CHUNK_ROWS
+
+    avg_line = max(total / count, 1)
+    return max(int(chunk_bytes / avg_line), 1)
+
+
+class ChunkedSource:
+    """
+    A CSV file read in fixed-size chunks instead of all at once.
+    Filter and duplicate-removal steps are recorded here and replayed
+    on every chunk, so peak memory depends on the chunk size rather than
+    the size of the file.
+    """
+
+    def __init__(self, path: str, chunk_rows: int = None, chunk_bytes: int = None):
+        self.path = path
+        if chunk_rows:
+            self.chunk_rows = chunk_rows
+        elif chunk_bytes:
+            self.chunk_rows = rows_for_byte_budget(path, chunk_bytes)
+        else:
+            self.chunk_rows = DEFAULT_CHUNK_ROWS
+
+        self.columns = list(pd.read_csv(path, nrows=0).columns)
+        self.steps = []
+
+        # dtypes fixed for dedupe key columns, so every chunk reads them alike
+        self.dtypes = {}
+
+    def add_step(self, kind: str, **params) -> None:
+        """Record a 'filter' or 'dedupe' step to be applied to every chunk."""
+        self.steps.append({"kind": kind, **params})
+
+    def pop_step(self):
+        """
+        Remove and return the most recently recorded step, and forget the
+        dtypes fixed for key columns no remaining dedupe step uses.
+        """
+        step = self.steps.pop()
+        keys = {c for s in self.steps if s["kind"] == "dedupe" for c in s["columns"]}
+        self.dtypes = {c: d for c, d in self.dtypes.items() if c in keys}
+        return step
+
+    def iter_chunks(self, fix_dtypes: bool = True):
+        """
+        Yield DataFrame chunks with every recorded step applied.
+        Empty chunks (everything filtered out) are skipped.
+        fix_dtypes=False skips the dtype pass of dedupe steps (see
+        _fix_dtypes), for previews that read only the first chunks.
+        """
+        return self._iter_steps(len(self.steps), fix_dtypes)
+
+    def _iter_steps(self, count: int, fix_dtypes: bool = True):
+        """Yield non-empty chunks with the first count steps applied."""
+        if count == 0:
+            chunks = pd.read_csv(self.path, chunksize=self.chunk_rows, dtype=self.dtypes or None)
+        else:
+            step = self.steps[count - 1]
+            if step["kind"] == "dedupe":
+                # Exact keep-first removal that spills to disk for large files;
+                # it may replay the earlier steps a second time
+                from core.disk_dedupe import dedupe_chunks
+                if fix_dtypes:
+                    self._fix_dtypes(step["columns"])
+                chunks = dedupe_chunks(lambda: self._iter_steps(count - 1, fix_dtypes), step["columns"])
+            else:
+                chunks = (_apply_step(chunk, step) for chunk in self._iter_steps(count - 1, fix_dtypes))
+
+        for chunk in chunks:
+            if not chunk.empty:
+                yield chunk
+
+    def _fix_dtypes(self, columns: list) -> None:
+        """
+        Give each of columns the dtype a whole-file read would infer.
+        Chunks otherwise infer their own: "1" is an int in one chunk and a
+        string in a chunk that also holds "x", and the two never match as
+        dedupe keys. Costs one extra pass that reads only these columns.
+        """
+        columns = [c for c in columns if c not in self.dtypes]
+        if not columns:
+            return
+
+        seen = {c: set() for c in columns}
+        for chunk in pd.read_csv(self.path, usecols=columns, chunksize=self.chunk_rows):
+            for col in columns:
+                seen[col].add(chunk[col].dtype)
+
+        for col, dtypes in seen.items():
+            if not dtypes:
+                continue
+            if len(dtypes) == 1:
+                self.dtypes[col] = dtypes.pop()
+            elif all(d.kind in "iuf" for d in dtypes):
+                self.dtypes[col] = "float64"
+            else:
+                # Mixed columns are read as text, as pandas does for the whole file
+                self.dtypes[col] = str
+
+    def head(self, n: int = 10, fix_dtypes: bool = False) -> pd.DataFrame:
+        """
+        Return the first n rows after all steps, reading only as far as needed.
+        Key columns not fixed yet keep the dtypes their chunk infers unless
+        fix_dtypes is set, which costs a pass over the whole file.
+        """
+        parts = []
+        remaining = n
+        for chunk in self.iter_chunks(fix_dtypes):
+            parts.append(chunk.head(remaining))
+            remaining -= len(parts[-1])
+            if remaining <= 0:
+                break
+
+        if not parts:
+            return pd.DataFrame(columns=self.columns)
+        return pd.concat(parts)
+
+    def count_rows(self) -> int:
+        """Count rows after all steps with one streaming pass."""
+        return sum(len(chunk) for chunk in self.iter_chunks())
+
+
+def _apply_step(chunk: pd.DataFrame, step: dict) -> pd.DataFrame:
+    """Apply one recorded filter step to a single chunk."""
+    if step["kind"] == "filter":
+        from core.filtering import _build_mask
+        mask = _build_mask(chunk[step["column"]], step["condition"], step["value"])
+        return chunk[mask]
+
+    if step["kind"] == "compound_filter":
+        from core.filtering import build_compound_mask
+        return chunk[build_compound_mask(chunk, step["conditions"], step["expression"])]
+
+    raise ValueError(f"Unknown chunk step: {step['kind']}")
\ No newline at end of file
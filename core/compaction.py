@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+# A text column becomes categorical when it has at most this many
+# distinct values per non-null row, and no more than CATEGORY_MAX_VALUES
+# in all. Above that the codes and categories save little memory and
+# .str operations on the categories get slower.
+CATEGORY_MAX_RATIO = 0.05
+CATEGORY_MAX_VALUES = 10_000
+
+
+def memory_usage_bytes(df: pd.DataFrame) -> int:
+    """Return the deep memory usage of a DataFrame in bytes."""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return a copy of df with smaller dtypes:
+    - low-cardinality text columns are dictionary-encoded as categoricals
+    - integers are downcast to the smallest signed width that holds them
+    - floats are downcast to float32 only when no value changes
+    Other columns are left as they are.
+    """
+    out = {}
+    for i in range(df.shape[1]):
+        out[i] = _compact_series(df.iloc[:, i])
+
+    compacted = pd.DataFrame(out, index=df.index)
+    compacted.columns = df.columns
+    return compacted
+
+
+def _compact_series(series: pd.Series) -> pd.Series:
+    kind = series.dtype.kind if isinstance(series.dtype, np.dtype) else None
+
+    if kind == "i":
+        return pd.to_numeric(series, downcast="integer")
+
+    if kind == "f":
+        values = series.to_numpy()
+        with np.errstate(over="ignore"):
+            narrow = values.astype(np.float32)
+        # Only downcast when every value survives the round trip exactly
+        if np.array_equal(narrow.astype(np.float64), values, equal_nan=True):
+            return pd.Series(narrow, index=series.index, name=series.name)
+        return series
+
+    if kind == "O":
+        non_null = series.dropna()
+        if non_null.empty:
+            return series
+
+        # Mixed text/number columns stay as objects so sorting is unchanged
+        if pd.api.types.infer_dtype(non_null, skipna=False) != "string":
+            return series
+
+        distinct = non_null.nunique()
+        if distinct <= min(CATEGORY_MAX_RATIO * len(non_null), CATEGORY_MAX_VALUES):
+            return series.astype("category")
+
+    return series
\ No newline at end of file
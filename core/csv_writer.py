@@ -0,0 +1,79 @@
+import bz2
+import gzip
+import lzma
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+# Compressed output is chosen by the file extension. xz uses a low preset:
+# its default is several times slower for a few percent smaller files
+COMPRESSORS = {
+    ".gz": lambda data: gzip.compress(data, compresslevel=6),
+    ".bz2": bz2.compress,
+    ".xz": lambda data: lzma.compress(data, preset=1),
+}
+
+CSV_EXTENSIONS = (".csv",) + tuple(".csv" + ext for ext in COMPRESSORS)
+
+# Rows formatted per block; whole frames are split into blocks this size
+CSV_BLOCK_ROWS = 100_000
+
+# Threads formatting and compressing blocks at the same time
+CSV_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def write_csv(chunks, path: str, columns) -> dict:
+    """
+    Write an iterable of DataFrame chunks to one CSV file, in order.
+    Each chunk is formatted (and compressed, for .gz/.bz2/.xz paths) on a
+    worker thread while earlier ones are written out; only a few chunks
+    are in flight at any time, so chunks can come from a generator that
+    never holds the whole frame. Compressed blocks are written as
+    back-to-back streams, which gzip, bz2 and xz readers treat as one file.
+    Returns {"rows", "csv_bytes", "bytes", "seconds"}: the rows written,
+    the size of the CSV text, the size on disk and the time taken.
+    """
+    compress = _compressor(path)
+    started = time.perf_counter()
+    rows = 0
+    csv_bytes = 0
+    written = 0
+
+    with open(path, "wb") as f, ThreadPoolExecutor(max_workers=CSV_MAX_WORKERS) as pool:
+        pending = deque([pool.submit(_encode_block, pd.DataFrame(columns=columns), True, compress)])
+
+        for chunk in chunks:
+            rows += len(chunk)
+            pending.append(pool.submit(_encode_block, chunk, False, compress))
+            # Keep memory bounded: write finished blocks before queueing more
+            while len(pending) > CSV_MAX_WORKERS * 2:
+                size, data = pending.popleft().result()
+                csv_bytes += size
+                written += f.write(data)
+
+        while pending:
+            size, data = pending.popleft().result()
+            csv_bytes += size
+            written += f.write(data)
+
+    return {"rows": rows, "csv_bytes": csv_bytes, "bytes": written, "seconds": time.perf_counter() - started}
+
+
+def frame_blocks(df: pd.DataFrame, block_rows: int = CSV_BLOCK_ROWS):
+    """Yield df in consecutive row blocks of block_rows."""
+    for start in range(0, len(df), block_rows):
+        yield df.iloc[start:start + block_rows]
+
+
+def _encode_block(chunk: pd.DataFrame, header: bool, compress):
+    """Return (csv_size, bytes_to_write) for one chunk."""
+    data = chunk.to_csv(index=False, header=header).encode("utf-8")
+    return len(data), compress(data) if compress is not None else data
+
+
+def _compressor(path: str):
+    """Return the compression function for path's extension, or None."""
+    return COMPRESSORS.get(os.path.splitext(path.lower())[1])
\ No newline at end of file
@@ -0,0 +1,170 @@
+import os
+import pickle
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Distinct keys held in memory before the seen-set spills to disk
+DEDUPE_MAX_KEYS = 2_000_000
+
+# Number of hash partitions the seen-set is split into once it spills;
+# each partition is resolved on its own, so only one is in memory at a time
+DEDUPE_PARTITIONS = 64
+
+# Stands in for missing values so that they compare equal, as in duplicated()
+_MISSING = "\x00<NA>"
+
+
+def dedupe_chunks(make_chunks, columns: list, max_keys: int = DEDUPE_MAX_KEYS, partitions: int = DEDUPE_PARTITIONS):
+    """
+    Yield the chunks from make_chunks() with every row whose key columns
+    were already seen removed, keeping the first occurrence exactly like
+    DataFrame.drop_duplicates(subset=columns, keep="first").
+
+    Keys are compared on their values (see _key_frame). While the
+    distinct keys fit in max_keys they are kept in an in-memory set and
+    rows stream straight through. Past that point the set spills: it and
+    the keys of every remaining row are written to hash-partitioned
+    files, each partition is resolved on its own, and make_chunks() is
+    called a second time to emit the remaining rows. make_chunks must
+    return the same rows in the same order every time it is called.
+    Like drop_duplicates, "1" and 1 are different keys, so the key
+    columns need the same dtype in every chunk (ChunkedSource fixes it).
+    """
+    seen = set()
+    spill = None
+    spill_row = 0
+    row = 0
+
+    try:
+        for chunk in make_chunks():
+            keys = _key_frame(chunk, columns)
+
+            if spill is None:
+                keep = np.fromiter(_first_seen(seen, keys), dtype=bool, count=len(chunk))
+                row += len(chunk)
+                yield chunk[keep]
+
+                if len(seen) > max_keys:
+                    print(f"More than {max_keys:,} distinct keys; continuing duplicate removal on disk.")
+                    spill = _Spill(columns, partitions)
+                    spill.add(pd.DataFrame(list(seen), columns=columns, dtype=object), np.full(len(seen), -1))
+                    seen = None
+                    spill_row = row
+            else:
+                spill.add(keys, np.arange(row, row + len(chunk)))
+                row += len(chunk)
+
+        if spill is None:
+            return
+
+        # Second pass over the rows after the spill point
+        spill.resolve()
+        row = 0
+        for chunk in make_chunks():
+            start, row = row, row + len(chunk)
+            if row <= spill_row:
+                continue
+
+            keep = np.ones(len(chunk), dtype=bool)
+            keep[: max(spill_row - start, 0)] = False  # already emitted
+            for rows in spill.dropped:
+                lo, hi = np.searchsorted(rows, [start, row])
+                keep[np.asarray(rows[lo:hi]) - start] = False
+            yield chunk[keep]
+
+    finally:
+        if spill is not None:
+            spill.close()
+
+
+def _key_frame(chunk: pd.DataFrame, columns: list) -> pd.DataFrame:
+    """
+    The key columns of a chunk as Python objects, with missing values made
+    comparable. Whole floats become ints, so 1 in an int chunk and 1.0 in
+    a chunk with missing values give the same key, as they do when the
+    whole file is read at once. Ints are never converted to float, so
+    large ints stay distinct. Only the keys are converted; the chunk
+    keeps its dtypes.
+    """
+    keys = {}
+    for col in columns:
+        values = chunk[col]
+        key = values.to_numpy(dtype=object, copy=True)
+        if values.dtype.kind == "f":
+            floats = values.to_numpy()
+            whole = np.isfinite(floats) & (floats == np.trunc(floats))
+            key[whole] = [int(v) for v in floats[whole]]
+        key[values.isna().to_numpy()] = _MISSING
+        keys[col] = key
+    return pd.DataFrame(keys, columns=columns)
+
+
+def _first_seen(seen: set, keys: pd.DataFrame):
+    """Yield True for each key not seen before, adding it to seen."""
+    for key in zip(*(keys[c].to_numpy() for c in keys.columns)):
+        if key in seen:
+            yield False
+        else:
+            seen.add(key)
+            yield True
+
+
+class _Spill:
+    """
+    Keys written to hash-partitioned files on disk. Every key is stored
+    with its row number (-1 for keys seen before the spill), so within a
+    partition the first occurrence of each key is the one with the lowest
+    row number.
+    """
+
+    def __init__(self, columns: list, partitions: int):
+        self.columns = columns
+        self.partitions = partitions
+        self.dir = tempfile.mkdtemp(prefix="datalytics_dedupe_")
+        self.files = {}
+        self.dropped = []
+
+    def add(self, keys: pd.DataFrame, rows: np.ndarray) -> None:
+        keys = keys.assign(_row=rows)
+        # Hashed as text so that equal keys land together whatever the column dtype
+        part = pd.util.hash_pandas_object(keys[self.columns].astype(str), index=False).to_numpy() % self.partitions
+        for p, group in keys.groupby(part, sort=False):
+            if p not in self.files:
+                self.files[p] = open(os.path.join(self.dir, f"part_{p}.pkl"), "ab")
+            pickle.dump(group, self.files[p], protocol=pickle.HIGHEST_PROTOCOL)
+
+    def resolve(self) -> None:
+        """
+        Find the duplicate rows of each partition, one partition at a time.
+        Fills self.dropped with one sorted array of dropped row numbers per
+        partition, memory-mapped from disk.
+        """
+        for p, f in self.files.items():
+            f.close()
+            path = f.name
+            frames = []
+            with open(path, "rb") as reader:
+                while True:
+                    try:
+                        frames.append(pickle.load(reader))
+                    except EOFError:
+                        break
+            os.remove(path)
+
+            part = pd.concat(frames, ignore_index=True)
+            rows = np.sort(part.loc[part.duplicated(subset=self.columns, keep="first"), "_row"].to_numpy())
+            out = os.path.join(self.dir, f"dropped_{p}.npy")
+            np.save(out, rows.astype(np.int64))
+            self.dropped.append(np.load(out, mmap_mode="r"))
+
+        self.files = {}
+
+    def close(self) -> None:
+        for f in self.files.values():
+            f.close()
+        # Release the memory maps so the files can be deleted on Windows too
+        self.dropped = []
+        shutil.rmtree(self.dir, ignore_errors=True)
\ No newline at end of file
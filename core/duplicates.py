@@ -1,4 +1,6 @@
-from core.state import get_dataframe, set_dataframe, push_state
+from core.state import get_dataframe, set_dataframe, push_rows_delta, get_chunked_source, set_chunked_source
+from core.state import get_plan, touch_plan, collect_plan, get_data_version
+from core import row_hash, fuzzy
 from utils.menus import show_duplicate_menu
 import pandas as pd
 from core.audit import log_action
@@ -14,14 +16,17 @@ def apply_duplicate_flow():
     Any invalid step -> return to main menu.
     """
     df = get_dataframe()
+    source = get_chunked_source()
 
-    if df is None:
+    if df is None and source is None:
         print("No file loaded. Please import a file first.")
         return
 
+    all_columns = source.columns if source is not None else list(df.columns)
+
     # Step 1 – Pick column(s)
     print("\nAvailable Columns:")
-    for idx, col in enumerate(df.columns, start=1):
+    for idx, col in enumerate(all_columns, start=1):
         print(f"{idx}. {col}")
 
     print("\nYou may select MULTIPLE columns using comma-separated values.")
@@ -41,12 +46,12 @@ def apply_duplicate_flow():
         return
 
     # Range validation
-    if any(idx < 1 or idx > len(df.columns) for idx in indices):
+    if any(idx < 1 or idx > len(all_columns) for idx in indices):
         print("One or more column selections are out of range.")
         return
 
     # Map indices → column names
-    columns = [df.columns[i - 1] for i in indices]
+    columns = [all_columns[i - 1] for i in indices]
     print(f"Columns selected for duplicate checking: ", ", ".join(columns))
 
     # Step 2 – Choose operation
@@ -56,27 +61,69 @@ def apply_duplicate_flow():
         print("Duplicate operation cancelled.")
         return
 
-    if dup_choice not in ("1", "2"):
+    if dup_choice not in ("1", "2", "3", "4"):
         print("Invalid duplicate option. Returning.")
         return
 
     # Step 3 – Apply operation
+    if source is not None:
+        if dup_choice == "2":
+            _remove_duplicates_streaming(source, columns)
+        else:
+            print("Only exact duplicate removal is available in streaming mode.")
+        return
+
+    threshold = None
+    if dup_choice in ("3", "4"):
+        threshold = _ask_threshold()
+        if threshold is None:
+            return
+
+    plan = get_plan()
+    if plan is not None and dup_choice == "2":
+        _remove_duplicates_lazy(plan, columns)
+        return
+
+    if plan is not None:
+        # The other options need the real rows, so run any pending steps first
+        collect_plan()
+        df = get_dataframe()
+
     if dup_choice == "1":
         _identify_duplicates(df, columns)
     elif dup_choice == "2":
-        push_state()  # allow Undo for destructive change
         _remove_duplicates(df, columns)
+    elif dup_choice == "3":
+        _identify_near_duplicates(df, columns, threshold)
+    elif dup_choice == "4":
+        _remove_near_duplicates(df, columns, threshold)
+
+
+def _ask_threshold():
+    """Ask for a fuzzy match threshold between 0 and 1; None if invalid."""
+    raw = input(f"Similarity threshold from 0 to 1 (Enter for {fuzzy.DEFAULT_THRESHOLD}): ").strip()
+    if not raw:
+        return fuzzy.DEFAULT_THRESHOLD
+
+    try:
+        threshold = float(raw)
+    except ValueError:
+        threshold = -1.0
 
+    if not 0 < threshold <= 1:
+        print("Invalid threshold. Returning.")
+        return None
+    return threshold
 
-def _identify_duplicates(df: pd.DataFrame, columns: list):
+
+def _identify_duplicates(df: pd.DataFrame, columns: list, highlight=None):
     """
     Identify duplicates across selected columns.
     Shows duplicate rows but does NOT modify the DataFrame.
-    Now offers optional export highlighting.
+    Now offers optional export highlighting; pass highlight=True/False
+    to decide without prompting.
     """
-    from core.state import set_duplicate_highlight
-
-    duplicates = df[df.duplicated(subset=columns, keep=False)]
+    duplicates = df[row_hash.duplicated(df, columns, keep=False)]
 
     if duplicates.empty:
         print("No duplicates found.")
@@ -104,17 +151,27 @@ def _identify_duplicates(df: pd.DataFrame, columns: list):
         rows_affected=len(duplicates),
     )
 
-    # Ask user if they'd like to highlight during export
-    print("\nWould you like these duplicates highlighted in your next XLSX export?")
-    print("1. Yes")
-    print("2. No")
+    _offer_highlight(columns, duplicates.index, highlight)
 
-    choice = input("Enter choice: ").strip()
+
+def _offer_highlight(columns: list, index, highlight=None):
+    """Ask whether the rows at these index labels should be highlighted on XLSX export."""
+    from core.state import set_duplicate_highlight
+
+    if highlight is not None:
+        choice = "1" if highlight else "2"
+    else:
+        # Ask user if they'd like to highlight during export
+        print("\nWould you like these duplicates highlighted in your next XLSX export?")
+        print("1. Yes")
+        print("2. No")
+
+        choice = input("Enter choice: ").strip()
 
     if choice == "1":
         info = {
             "columns": columns,
-            "duplicate_index": duplicates.index.tolist()
+            "duplicate_index": list(index)
         }
         set_duplicate_highlight(info)
         print("Highlighting enabled for export.")
@@ -132,7 +189,8 @@ def _remove_duplicates(df: pd.DataFrame, columns: list):
     Updates the global DataFrame.
     """
 
-    duplicates = df[df.duplicated(subset=columns, keep="first")]
+    is_duplicate = row_hash.duplicated(df, columns, keep="first")
+    duplicates = df[is_duplicate]
 
     if duplicates.empty:
         print("No duplicates found.")
@@ -151,7 +209,7 @@ def _remove_duplicates(df: pd.DataFrame, columns: list):
     
 
     before = len(df)
-    cleaned = df.drop_duplicates(subset=columns, keep="first")
+    cleaned = df[~is_duplicate]
     after = len(cleaned)
 
     # Final output
@@ -160,7 +218,10 @@ def _remove_duplicates(df: pd.DataFrame, columns: list):
     print(f"Rows after:  {after}")
     print(f"Duplicates removed: {before - after}")
 
+    version = get_data_version()
+    push_rows_delta(~is_duplicate)  # allow Undo for destructive change
     set_dataframe(cleaned)
+    row_hash.carry_rows(df, version, ~is_duplicate)
 
     # Log the duplicate removal action
     log_action(
@@ -169,4 +230,130 @@ def _remove_duplicates(df: pd.DataFrame, columns: list):
         conditions=f"subset={columns}",
         columns=columns,
         rows_affected=before - after,
+    )
+
+
+def _identify_near_duplicates(df: pd.DataFrame, columns: list, threshold: float, highlight=None):
+    """
+    Identify near-duplicate rows (e.g. "Acme Inc." and "ACME, Inc") across
+    the selected columns. Shows each cluster with its similarity score but
+    does NOT modify the DataFrame. Offers the same export highlighting as
+    exact duplicates; pass highlight=True/False to decide without prompting.
+    """
+    cluster_ids, scores, compared = fuzzy.find_near_duplicates(df, columns, threshold)
+    in_cluster = cluster_ids >= 0
+
+    if not in_cluster.any():
+        print("No near-duplicates found.")
+        log_action(
+            "DUP_IDENTIFY",
+            details=f"No near-duplicates found (threshold {threshold}).",
+            conditions=f"subset={columns} fuzzy>={threshold}",
+            columns=columns,
+            rows_affected=0,
+        )
+        return
+
+    duplicates = df[in_cluster].assign(
+        cluster=cluster_ids[in_cluster], score=scores[in_cluster].round(3)
+    ).sort_values("cluster", kind="stable")
+
+    print("\n=== NEAR-DUPLICATES FOUND ===")
+    print(duplicates.head(20).to_string(index=False))
+    print(f"\nTotal near-duplicate rows: {len(duplicates)} in {cluster_ids.max() + 1} cluster(s)")
+    print(f"Candidate pairs compared: {compared:,}")
+
+    log_action(
+        "DUP_IDENTIFY",
+        details=f"Identified {len(duplicates)} near-duplicate rows in {cluster_ids.max() + 1} clusters.",
+        conditions=f"subset={columns} fuzzy>={threshold}",
+        columns=columns,
+        rows_affected=len(duplicates),
+    )
+
+    _offer_highlight(columns, df.index[in_cluster], highlight)
+
+
+def _remove_near_duplicates(df: pd.DataFrame, columns: list, threshold: float):
+    """
+    Remove near-duplicate rows across the selected columns, keeping the
+    first row of each cluster. Updates the global DataFrame.
+    """
+    cluster_ids, scores, compared = fuzzy.find_near_duplicates(df, columns, threshold)
+    keep = fuzzy.keep_first_mask(cluster_ids)
+
+    if keep.all():
+        print("No near-duplicates found.")
+        log_action(
+            "DUP_REMOVE",
+            details=f"No near-duplicates found (threshold {threshold}).",
+            conditions=f"subset={columns} fuzzy>={threshold}",
+            columns=columns,
+            rows_affected=0,
+        )
+        return
+
+    removed = df[~keep].assign(cluster=cluster_ids[~keep], score=scores[~keep].round(3))
+    print("\n=== NEAR-DUPLICATES TO BE REMOVED ===")
+    print(removed.head(20).to_string(index=False))
+    print(f"\nTotal near-duplicate rows: {len(removed)}")
+
+    before = len(df)
+    cleaned = df[keep]
+    after = len(cleaned)
+
+    print("\n=== DUPLICATE REMOVAL COMPLETE ===")
+    print(f"Rows before: {before}")
+    print(f"Rows after:  {after}")
+    print(f"Duplicates removed: {before - after}")
+
+    version = get_data_version()
+    push_rows_delta(keep)  # allow Undo for destructive change
+    set_dataframe(cleaned)
+    row_hash.carry_rows(df, version, keep)
+
+    log_action(
+        "DUP_REMOVE",
+        details=f"Removed {before - after} near-duplicate rows.",
+        conditions=f"subset={columns} fuzzy>={threshold}",
+        columns=columns,
+        rows_affected=before - after,
+    )
+
+
+def _remove_duplicates_streaming(source, columns: list):
+    """
+    Record a keep-first duplicate removal on a chunked source.
+    The removal runs chunk by chunk on export and moves to disk once the
+    distinct keys no longer fit in memory.
+    """
+    source.add_step("dedupe", columns=columns)
+    set_chunked_source(source)
+
+    print("\n=== DUPLICATE REMOVAL RECORDED (STREAMING) ===")
+    print(source.head(10).to_string(index=False))
+    print("Rows removed will be reported on export.")
+
+    log_action(
+        "DUP_REMOVE",
+        details="Recorded duplicate removal (streaming).",
+        conditions=f"subset={columns}",
+        columns=columns,
+    )
+
+
+def _remove_duplicates_lazy(plan, columns: list):
+    """Record a keep-first duplicate removal in the lazy plan."""
+    plan.add_step("dedupe", columns=columns)
+    touch_plan()
+
+    print("\n=== DUPLICATE REMOVAL RECORDED (LAZY) ===")
+    print(plan.head(10).to_string(index=False))
+    print(f"Steps pending: {len(plan.steps)}")
+
+    log_action(
+        "DUP_REMOVE",
+        details="Recorded duplicate removal (lazy).",
+        conditions=f"subset={columns}",
+        columns=columns,
     )
\ No newline at end of file
@@ -1,8 +1,9 @@
 import os
 import pandas as pd
-from core.state import get_dataframe, get_duplicate_highlight, get_data_version
+from core.state import get_dataframe, get_duplicate_highlight, get_data_version, get_chunked_source
+from core.state import collect_plan
 from utils.menus import show_export_menu
-from core.audit import log_action, save_audit_log_to_txt
+from core.audit import log_action, save_audit_log_to_txt, flush_audit_log
 
 
 def export_flow():
@@ -13,9 +14,13 @@ def export_flow():
     3) Prompt for file path.
     4) Perform export.
     """
+    # Run any steps recorded in lazy mode before exporting
+    collect_plan()
+
     df = get_dataframe()
+    source = get_chunked_source()
 
-    if df is None:
+    if df is None and source is None:
         print("No data to export. Please import and transform a file first.")
         return
 
@@ -25,16 +30,25 @@ def export_flow():
         if choice == "0":
             return
 
+        if choice == "3":
+            _export_sqlite_flow(df, source)
+            return
+
         if choice in ("1", "2"):
             path = input("Enter full export file path (including filename and extension): ").strip()
             if not path:
                 print("No path provided. Export cancelled.")
                 return
 
-            if choice == "1":
+            if source is not None:
+                if choice == "1":
+                    _export_csv_chunked(source, path)
+                else:
+                    print("XLSX export is not available in streaming mode. Use CSV instead.")
+            elif choice == "1":
                 _export_csv(df, path)
             elif choice == "2":
-                _export_xlsx(df, path)
+                _export_xlsx(df, path, split_by=_ask_split_column(df))
 
             # After a successful export attempt, return to main menu
             return
@@ -42,9 +56,32 @@ def export_flow():
         print("Invalid export option. Please try again.")
 
 
-def _export_csv(df: pd.DataFrame, path: str) -> None:
-    """Export DataFrame as CSV."""
-    if not path.lower().endswith(".csv"):
+def _export_csv(df: pd.DataFrame, path: str, save_audit=None) -> bool:
+    """
+    Export DataFrame as CSV, formatted in row blocks on worker threads.
+    Paths ending in .csv.gz, .csv.bz2 or .csv.xz are compressed.
+    save_audit=None asks whether to save the audit log; True/False skips the prompt.
+    Returns True when the file was written.
+    """
+    from core.csv_writer import frame_blocks
+
+    return _write_csv_export(frame_blocks(df), df.columns, path, save_audit)
+
+
+def _export_csv_chunked(source, path: str, save_audit=None) -> bool:
+    """
+    Export a chunked source as CSV one chunk at a time.
+    Only a few chunks are held in memory at any point.
+    Returns True when the file was written.
+    """
+    return _write_csv_export(source.iter_chunks(), source.columns, path, save_audit, mode=" in streaming mode")
+
+
+def _write_csv_export(chunks, columns, path: str, save_audit, mode: str = "") -> bool:
+    """Shared body of the CSV exports: write the chunks, report throughput, log."""
+    from core.csv_writer import CSV_EXTENSIONS, write_csv
+
+    if not path.lower().endswith(CSV_EXTENSIONS):
         print("Warning: Path does not end with .csv; appending extension.")
         path += ".csv"
 
@@ -52,66 +89,164 @@ def _export_csv(df: pd.DataFrame, path: str) -> None:
         directory = os.path.dirname(path)
         if directory:
             os.makedirs(directory, exist_ok=True)
-        df.to_csv(path, index=False)
+
+        stats = write_csv(chunks, path, columns)
+        megabytes = stats["csv_bytes"] / 1_000_000
+        seconds = max(stats["seconds"], 1e-9)
         print(f"CSV export complete: {path}")
+        print(f"Rows written: {stats['rows']} ({megabytes:.1f} MB of CSV in {seconds:.2f}s, {megabytes / seconds:.1f} MB/s)")
+        if stats["bytes"] != stats["csv_bytes"]:
+            print(f"Compressed size: {stats['bytes'] / 1_000_000:.1f} MB")
 
-            # Log the export csv action
+        # Log the export csv action
         log_action(
             "EXPORT_CSV",
-            details=f"Exported CSV to '{path}'.",
-            rows_affected=len(df),
+            details=f"Exported CSV to '{path}'{mode}.",
+            rows_affected=stats["rows"],
         )
 
-        maybe_save_audit_log(path)
+        maybe_save_audit_log(path, save_audit)
+        return True
     except Exception as e:
         print(f"Error during CSV export: {e}")
+        return False
+
 
+def _export_sqlite_flow(df, source) -> None:
+    """Ask for the database file, table name and index columns, then export."""
+    columns = list(source.columns) if source is not None else list(df.columns)
 
-def _export_xlsx(df: pd.DataFrame, path: str) -> None:
+    path = input("Enter SQLite database path (e.g. output.db): ").strip()
+    if not path:
+        print("No path provided. Export cancelled.")
+        return
+
+    table = input("Enter table name [data]: ").strip() or "data"
+
+    print("Columns:", columns)
+    raw = input("Columns to index after loading (comma-separated, blank for none): ").strip()
+    index_columns = [c.strip() for c in raw.split(",") if c.strip()]
+    unknown = [c for c in index_columns if c not in columns]
+    if unknown:
+        print(f"Unknown column(s): {unknown}. Export cancelled.")
+        return
+
+    _export_sqlite(df if source is None else source, path, table, index_columns)
+
+
+def _export_sqlite(data, path: str, table: str, index_columns=(), replace: bool = True, save_audit=None) -> bool:
     """
-    Export DataFrame as XLSX.
-    If duplicate highlight configuration exists (from DUP-1), apply highlighting.
+    Export a DataFrame, or a chunked source chunk by chunk, to a table in a
+    SQLite database. An existing table of the same name is replaced unless
+    replace=False, which appends to it. Returns True when the table was written.
+    """
+    from core.sqlite_io import SQLITE_EXTENSIONS, write_sqlite
+    from core.csv_writer import frame_blocks
+
+    if not path.lower().endswith(SQLITE_EXTENSIONS):
+        print("Warning: Path does not end with .db; appending extension.")
+        path += ".db"
+
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if isinstance(data, pd.DataFrame):
+            chunks, dtypes, mode = frame_blocks(data), data.dtypes, ""
+        else:
+            # Column types of a streamed file come from its first rows
+            chunks, dtypes, mode = data.iter_chunks(), data.head(1000, fix_dtypes=True).dtypes, " in streaming mode"
+
+        stats = write_sqlite(
+            chunks, path, table, dtypes.index, dtypes=dtypes, index_columns=index_columns, replace=replace
+        )
+        seconds = max(stats["seconds"], 1e-9)
+        print(f"SQLite export complete: {path} (table '{table}')")
+        print(f"Rows written: {stats['rows']} in {seconds:.2f}s ({stats['rows'] / seconds:,.0f} rows/sec)")
+
+        log_action(
+            "EXPORT_SQLITE",
+            details=f"Exported table '{table}' to SQLite database '{path}'{mode}.",
+            columns=list(index_columns) or None,
+            rows_affected=stats["rows"],
+        )
+
+        maybe_save_audit_log(path, save_audit)
+        return True
+    except Exception as e:
+        print(f"Error during SQLite export: {e}")
+        return False
+
+
+def _ask_split_column(df: pd.DataFrame):
+    """Ask for an optional column to split the XLSX export into one sheet per value."""
+    print("Columns:", list(df.columns))
+    column = input("Split into one sheet per value of a column? Enter the column name (blank for one sheet): ").strip()
+    if column and column not in df.columns:
+        print(f"Unknown column '{column}'. Exporting a single sheet.")
+        return None
+    return column or None
+
+
+def _export_xlsx(df: pd.DataFrame, path: str, save_audit=None, split_by=None) -> bool:
+    """
+    Export DataFrame as XLSX in a single streaming pass.
+    If duplicate highlight configuration exists (from DUP-1), the highlight
+    fill is applied while the rows are written. split_by writes one sheet
+    per value of that column. Returns True when the file was written.
     """
     if not path.lower().endswith(".xlsx"):
         print("Warning: Path does not end with .xlsx; appending extension.")
         path += ".xlsx"
 
     try:
+        from core.xlsx_writer import write_xlsx
+
         directory = os.path.dirname(path)
         if directory:
             os.makedirs(directory, exist_ok=True)
 
-        # Base export
-        df.to_excel(path, index=False, engine="openpyxl")
-        print(f"Base XLSX export complete: {path}")
+        # Work out which rows to highlight before writing anything
+        highlight = _duplicate_highlight_mask(df)
 
-        # Try to apply highlighting if user has said yes to prompt in duplicate flow
-        _apply_duplicate_highlighting(path, df)
+        sheets = write_xlsx(df, path, highlight=highlight, split_by=split_by)
+        print(f"XLSX export complete: {path}")
+        if split_by is not None:
+            print(f"Sheets written: {sheets} (one per value of '{split_by}')")
+        if highlight is not None:
+            print("Duplicate highlighting applied to XLSX export.")
 
         # Log the export xlsx action
         log_action(
             "EXPORT_XLSX",
-            details=f"Exported XLSX to '{path}'.",
+            details=f"Exported XLSX to '{path}'" + (f", split by '{split_by}' into {sheets} sheets." if split_by else "."),
             rows_affected=len(df),
         )
 
         # Save the audit log if user says yes to prompt
-        maybe_save_audit_log(path)
+        maybe_save_audit_log(path, save_audit)
+        return True
 
     # Catch any errors
+    except ImportError:
+        print("openpyxl is required for XLSX export but not installed.")
+        return False
     except Exception as e:
         print(f"Error during XLSX export: {e}")
+        return False
 
 
-def _apply_duplicate_highlighting(path: str, df: pd.DataFrame) -> None:
+def _duplicate_highlight_mask(df: pd.DataFrame):
     """
     If duplicate highlight info is available from duplicate flow and still matches
-    the current data_version, apply cell highlighting. Otherwise skip.
+    the current data_version, return (row_mask, columns): a positional mask of the
+    rows to highlight and the columns to fill. Otherwise return None.
     """
     highlight_info = get_duplicate_highlight()
     if not highlight_info:
         print("No duplicate highlight configuration found. XLSX exported without highlighting.")
-        return
+        return None
 
     # Check if the data has changed since Identify
     current_version = get_data_version()
@@ -119,57 +254,32 @@ def _apply_duplicate_highlighting(path: str, df: pd.DataFrame) -> None:
 
     if saved_version is None or saved_version != current_version:
         print("Duplicate highlight configuration is stale. XLSX exported without highlighting.")
-        return
+        return None
 
-    columns = highlight_info.get("columns", [])
+    columns = [c for c in highlight_info.get("columns", []) if c in df.columns]
     dup_indices = highlight_info.get("duplicate_index", [])
 
     if not columns or not dup_indices:
         print("Duplicate highlight info incomplete. XLSX exported without highlighting.")
-        return
-
-    # Highlight duplicates in XLSX
-    try:
-        from openpyxl import load_workbook
-        from openpyxl.styles import PatternFill
-
-        wb = load_workbook(path)
-        ws = wb.active
-
-        fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
-
-        # Map column names to Excel column indices (1-based)
-        col_to_excel_index = {
-            col_name: idx + 1 for idx, col_name in enumerate(df.columns)
-        }
-
-        for idx in dup_indices:
-            try:
-                pos = df.index.get_loc(idx)  # 0-based row position in current DataFrame
-            except KeyError:
-                continue
+        return None
 
-            excel_row = pos + 2  # +1 header row, +1 for 1-based index
+    # One vectorized lookup instead of a get_loc per duplicate
+    return df.index.isin(dup_indices), columns
 
-            for col_name in columns:
-                excel_col = col_to_excel_index.get(col_name)
-                if excel_col is None:
-                    continue
-                cell = ws.cell(row=excel_row, column=excel_col)
-                cell.fill = fill
 
-        wb.save(path)
-        print("Duplicate highlighting applied to XLSX export.")
-
-    # Catch any errors
-    except ImportError:
-        print("openpyxl is required for highlighting but not installed. XLSX exported without highlighting.")
-    except Exception as e:
-        print(f"Error applying duplicate highlighting: {e}")
+def maybe_save_audit_log(export_path: str, save=None):
+    """
+    Prompt user to save audit log as text file.
+    Pass save=True or save=False to decide without prompting.
+    """
+    # Exports are a durability point for the audit log
+    flush_audit_log()
 
+    if save is not None:
+        if save:
+            save_audit_log_to_txt(export_path)
+        return
 
-def maybe_save_audit_log(export_path: str):
-    """ Prompt user to save audit log as text file."""
     print("\nWould you like to save the audit log as a text file in the same folder?")
     print("1. Yes")
     print("2. No")
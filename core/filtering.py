@@ -1,13 +1,37 @@
+import re
+import time
+
+import numpy as np
 import pandas as pd
-from core.state import get_dataframe, set_dataframe, push_state
+from core.state import get_dataframe, set_dataframe, push_rows_delta, get_chunked_source, set_chunked_source
+from core.state import get_plan, touch_plan, get_data_version
+from core import row_hash, text_index, value_index
 from utils.menus import show_condition_menu
 from core.audit import log_action
 
+# Menu choice -> filter condition name
+CONDITION_OPTIONS = {
+    "1": "equals",
+    "2": "not_equals",
+    "3": "contains",
+    "4": "not_contains",
+    "5": "greater_than",
+    "6": "less_than",
+    "7": "in_list",
+    "8": "not_in_list",
+}
+
+# Conditions answered from the per-column value index
+EQUALITY_CONDITIONS = ("equals", "not_equals", "in_list", "not_in_list")
+
+# Rows sampled to estimate how selective each compound filter condition is
+SELECTIVITY_SAMPLE_ROWS = 2_000
+
 
 def apply_filter_flow():
     """
     Full filtering flow:
-    1) Select column
+    1) Select column (or start a compound filter)
     2) Select condition
     3) Enter value
     4) Apply filter & update DataFrame
@@ -15,51 +39,75 @@ def apply_filter_flow():
     Any invalid step -> cancel and return to the Transform Menu.
     """
     df = get_dataframe()
+    source = get_chunked_source()
 
-    if df is None:
+    if df is None and source is None:
         print("No file loaded. Please import a file first.")
         return
     
     print("Filter selected.")
+    columns = source.columns if source is not None else list(df.columns)
 
     # Step 1 — Column selection
     print("\nAvailable Columns:")
-    for idx, col in enumerate(df.columns, start=1):
+    for idx, col in enumerate(columns, start=1):
         print(f"{idx}. {col}")
 
-    col_choice = input("Select column number: ").strip()
+    col_choice = input("Select column number (or C for a compound AND/OR/NOT filter): ").strip()
+
+    if col_choice.lower() == "c":
+        _compound_filter_flow(df, source, columns)
+        return
+
+    picked = _ask_condition(columns, col_choice)
+    if picked is None:
+        return
+    column, condition, value = picked
+
+    # Step 4 — Apply filter
+    if source is not None:
+        _apply_filter_streaming(source, column, condition, value)
+        return
 
+    if get_plan() is not None:
+        _apply_filter_lazy(get_plan(), column, condition, value)
+        return
+
+    if condition in ("contains", "not_contains"):
+        _offer_text_index(df, column)
+
+    _apply_filter(df, column, condition, value)
+
+
+def _ask_condition(columns, col_choice):
+    """
+    Steps 1-3 of the filter flow for an already entered column choice.
+    Returns (column, condition, value), or None if any step was invalid.
+    """
     if not col_choice.isdigit():
         print("Invalid column choice. Returning.")
-        return
+        return None
 
     col_index = int(col_choice) - 1
-    if col_index < 0 or col_index >= len(df.columns):
+    if col_index < 0 or col_index >= len(columns):
         print("Invalid column selection. Returning.")
-        return
+        return None
 
-    column = df.columns[col_index]
+    column = columns[col_index]
     print(f"Column selected: {column}")
 
     # Step 2 — Condition selection
-    condition_map = {
-        "1": "equals",
-        "2": "not_equals",
-        "3": "contains",
-        "4": "not_contains",
-        "5": "greater_than",
-        "6": "less_than",
-    }
+    condition_map = CONDITION_OPTIONS
 
     cond_choice = show_condition_menu()
 
     if cond_choice == "0":
         print("Filter cancelled.")
-        return
+        return None
 
     if cond_choice not in condition_map:
         print("Invalid condition. Returning.")
-        return
+        return None
 
     condition = condition_map[cond_choice]
     print(f"Condition selected: {condition}")
@@ -68,58 +116,198 @@ def apply_filter_flow():
     value = input("Enter filter value: ").strip()
     if value == "":
         print("Empty values are not allowed.")
-        return
+        return None
 
-    # Step 4 — Apply filter
-    push_state()  # Save state for Undo
-    _apply_filter(df, column, condition, value)
+    return column, condition, value
 
 
-def _apply_filter(df, column, condition, value):
-    """Internal filtering logic."""
-    series = df[column]
+def _compound_filter_flow(df, source, columns):
+    """
+    Compound filter flow:
+    1) Add conditions one at a time (column, condition, value)
+    2) Combine them by number with AND, OR, NOT and parentheses
+    3) Apply the whole expression as a single filter
+    """
+    conditions = []
+
+    # Step 1 — Collect conditions
+    while True:
+        print(f"\n--- Condition {len(conditions) + 1} ---")
+        for idx, col in enumerate(columns, start=1):
+            print(f"{idx}. {col}")
+
+        picked = _ask_condition(columns, input("Select column number: ").strip())
+        if picked is None:
+            return
+        conditions.append(picked)
+
+        more = input("Add another condition? (y/n): ").strip().lower()
+        if more != "y":
+            break
+
+    # Step 2 — Combine them
+    print("\nConditions:")
+    for idx, (column, condition, value) in enumerate(conditions, start=1):
+        print(f"{idx}. {column} {condition} {value}")
+
+    default = " AND ".join(str(i) for i in range(1, len(conditions) + 1))
+    print("Combine them with AND, OR, NOT and parentheses, e.g. 1 AND (2 OR NOT 3).")
+    expression = input(f"Expression (press Enter for {default}): ").strip() or default
 
     try:
-        # Greater/Less Than
-        if condition in ("greater_than", "less_than"):
-            series_numeric = pd.to_numeric(series, errors="coerce")
+        parse_expression(expression, conditions)
+    except ValueError as e:
+        print(f"Invalid expression: {e}")
+        return
+
+    # Step 3 — Apply filter
+    if source is not None:
+        _apply_compound_filter_streaming(source, conditions, expression)
+        return
+
+    if get_plan() is not None:
+        _apply_compound_filter_lazy(get_plan(), conditions, expression)
+        return
+
+    _apply_compound_filter(df, conditions, expression)
+
+
+def _build_mask(series, condition, value):
+    """
+    Return the boolean row mask for one filter condition, or None if the
+    condition is not recognised. Raises ValueError for non-numeric input
+    on a numeric comparison.
+    """
+    # Categorical: evaluate once per category and broadcast through the codes
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return _build_category_mask(series, condition, value)
+
+    # Greater/Less Than
+    if condition in ("greater_than", "less_than"):
+        series_numeric = pd.to_numeric(series, errors="coerce")
+        value_num = float(value)
+
+        if condition == "greater_than":
+            return series_numeric > value_num
+        return series_numeric < value_num
+
+    # Equals/Not Equals
+    if condition in ("equals", "not_equals"):
+        if series.dtype.kind in {"i", "f"}:
             value_num = float(value)
+            mask = (series == value_num)
+        else:
+            s = series.astype(str)
+            mask = (s == value)
 
-            if condition == "greater_than":
-                filtered = df[series_numeric > value_num]
-            else:
-                filtered = df[series_numeric < value_num]
-
-        # Equals/Not Equals
-        elif condition in ("equals", "not_equals"):
-            if series.dtype.kind in {"i", "f"}:
-                value_num = float(value)
-                mask = (series == value_num)
-            else:
-                s = series.astype(str)
-                mask = (s == value)
-
-            filtered = df[mask] if condition == "equals" else df[~mask]
-
-        # Contains/Not Contains
-        elif condition in ("contains", "not_contains"):
-            s = series.astype(str).str.lower()
-            v = value.lower()
-            mask = s.str.contains(v, na=False)
-            filtered = df[mask] if condition == "contains" else df[~mask]
+        return mask if condition == "equals" else ~mask
 
-        # Invalid condition
+    # In List/Not In List (comma-separated values)
+    if condition in ("in_list", "not_in_list"):
+        values = value_index.split_values(value)
+        if series.dtype.kind in {"i", "f"}:
+            # NaN never equals anything, as with ==
+            mask = series.isin([x for x in (float(v) for v in values) if x == x])
         else:
+            mask = series.astype(str).isin(values)
+
+        return mask if condition == "in_list" else ~mask
+
+    # Contains/Not Contains (literal unless written as /pattern/)
+    if condition in ("contains", "not_contains"):
+        s = series.astype(str).str.lower()
+        pattern, regex = text_index.literal_or_regex(value)
+        mask = s.str.contains(pattern, regex=regex, na=False)
+        return mask if condition == "contains" else ~mask
+
+    return None
+
+
+def _build_category_mask(series, condition, value):
+    """
+    Build a filter mask for a categorical column without expanding it.
+    The last slot of the per-category mask answers for missing values
+    (code -1), matching how the object path treats NaN as "nan".
+    """
+    categories = series.cat.categories.to_numpy(dtype=object)
+    lookup = pd.Series(np.append(categories, np.nan), dtype=object)
+
+    per_category = _build_mask(lookup, condition, value)
+    if per_category is None:
+        return None
+
+    codes = series.cat.codes.to_numpy()
+    return pd.Series(per_category.to_numpy()[codes], index=series.index)
+
+
+def _column_mask(df, column, condition, value, positions=None):
+    """
+    Like _build_mask on df[column] (or on its rows at positions), but
+    on the active DataFrame text searches go through the cached
+    lowercased column and its trigram index, if any, and equality
+    filters are looked up in the column's value index.
+    """
+    series = df[column]
+    if (
+        condition in ("contains", "not_contains")
+        and not isinstance(series.dtype, pd.CategoricalDtype)
+        and df is get_dataframe()
+    ):
+        mask = text_index.contains_mask(df, column, value, positions)
+        return mask if condition == "contains" else ~mask
+
+    if condition in EQUALITY_CONDITIONS and df is get_dataframe():
+        values = [value] if condition in ("equals", "not_equals") else value_index.split_values(value)
+        mask = value_index.equals_mask(df, column, values)
+        if positions is not None:
+            mask = mask[positions]
+        return mask if condition in ("equals", "in_list") else ~mask
+
+    if positions is not None:
+        series = series.iloc[positions]
+    return _build_mask(series, condition, value)
+
+
+def _offer_text_index(df, column):
+    """Offer a trigram index when a large text column is searched again."""
+    if (
+        len(df) < text_index.TRIGRAM_MIN_ROWS
+        or isinstance(df[column].dtype, pd.CategoricalDtype)
+        or text_index.has_trigram_index(df, column)
+        or text_index.search_count(df, column) == 0
+    ):
+        return
+
+    print(f"\nColumn '{column}' has already been searched in this version of the data.")
+    choice = input("Build a text index on it to speed up further searches? (y/n): ").strip().lower()
+    if choice == "y":
+        start = time.perf_counter()
+        text_index.build_trigram_index(df, column)
+        print(f"Text index built in {time.perf_counter() - start:.2f}s.")
+
+
+def _apply_filter(df, column, condition, value):
+    """Internal filtering logic. Returns True when the filter was applied."""
+    try:
+        mask = _column_mask(df, column, condition, value)
+
+        # Invalid condition
+        if mask is None:
             print("Invalid condition.")
-            return
+            return False
+
+        filtered = df[mask]
 
         # Show result
         print("\n=== FILTER RESULT ===")
         print(filtered.head(10).to_string(index=False))
         print(f"Rows after filtering: {len(filtered)}")
 
-        # Update global DataFrame
+        # Save the removed rows for Undo, then update global DataFrame
+        version = get_data_version()
+        push_rows_delta(mask)
         set_dataframe(filtered)
+        row_hash.carry_rows(df, version, mask)
 
         # Log filter action
         log_action(
@@ -129,7 +317,305 @@ def _apply_filter(df, column, condition, value):
             columns=[column],
             rows_affected=len(filtered),
         )
+        return True
 
     # Catch any errors
+    except ValueError:
+        print("Invalid numeric input for this condition.")
+        return False
+
+
+def _apply_compound_filter(df, conditions, expression):
+    """
+    Filter with a compound expression. All conditions are combined into
+    one mask, so the frame is copied once and Undo gets a single step.
+    Returns True when the filter was applied.
+    """
+    try:
+        mask = build_compound_mask(df, conditions, expression)
+        filtered = df[mask]
+
+        print("\n=== FILTER RESULT ===")
+        print(filtered.head(10).to_string(index=False))
+        print(f"Rows after filtering: {len(filtered)}")
+
+        version = get_data_version()
+        push_rows_delta(mask)
+        set_dataframe(filtered)
+        row_hash.carry_rows(df, version, mask)
+
+        text = describe_expression(conditions, expression)
+        log_action(
+            "FILTER",
+            details=f"Filtered with compound condition: {text}.",
+            conditions=text,
+            columns=_expression_columns(conditions),
+            rows_affected=len(filtered),
+        )
+        return True
+
+    except ValueError:
+        print("Invalid numeric input for one of the conditions.")
+        return False
+
+
+def _apply_compound_filter_streaming(source, conditions, expression):
+    """Record a compound filter on a chunked source; it runs chunk by chunk on export."""
+    try:
+        # The preview is the only read, and it also checks the values;
+        # an invalid filter is taken back out
+        source.add_step("compound_filter", conditions=conditions, expression=expression)
+        try:
+            preview = source.head(10)
+        except ValueError:
+            source.pop_step()
+            raise
+        set_chunked_source(source)
+
+        print("\n=== FILTER RESULT (STREAMING) ===")
+        print(preview.to_string(index=False))
+        print("Row count will be reported on export.")
+
+        text = describe_expression(conditions, expression)
+        log_action(
+            "FILTER",
+            details=f"Filtered with compound condition: {text} (streaming).",
+            conditions=text,
+            columns=_expression_columns(conditions),
+        )
+
+    except ValueError:
+        print("Invalid numeric input for one of the conditions.")
+
+
+def _apply_compound_filter_lazy(plan, conditions, expression):
+    """Record a compound filter in the lazy plan and preview its first rows."""
+    try:
+        build_compound_mask(plan.base.head(1), conditions, expression)
+
+        plan.add_step("compound_filter", conditions=conditions, expression=expression)
+        touch_plan()
+
+        print("\n=== FILTER RESULT (LAZY) ===")
+        print(plan.head(10).to_string(index=False))
+        print(f"Steps pending: {len(plan.steps)}")
+
+        text = describe_expression(conditions, expression)
+        log_action(
+            "FILTER",
+            details=f"Filtered with compound condition: {text} (lazy).",
+            conditions=text,
+            columns=_expression_columns(conditions),
+        )
+
+    except ValueError:
+        print("Invalid numeric input for one of the conditions.")
+
+
+def parse_expression(expression, conditions):
+    """
+    Parse an expression over condition numbers, such as
+    "1 AND (2 OR NOT 3)", into a tree of tuples:
+        ("cond", (column, condition, value)), ("not", node),
+        ("and", [nodes]) or ("or", [nodes]).
+    AND binds tighter than OR. Raises ValueError if it is malformed.
+    """
+    tokens = re.findall(r"\(|\)|\d+|[A-Za-z]+|\S", expression)
+    pos = 0
+
+    def peek():
+        return tokens[pos].upper() if pos < len(tokens) else None
+
+    def take():
+        nonlocal pos
+        pos += 1
+        return tokens[pos - 1]
+
+    def parse_or():
+        nodes = [parse_and()]
+        while peek() == "OR":
+            take()
+            nodes.append(parse_and())
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def parse_and():
+        nodes = [parse_not()]
+        while peek() == "AND":
+            take()
+            nodes.append(parse_not())
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+    def parse_not():
+        token = peek()
+        if token == "NOT":
+            take()
+            return ("not", parse_not())
+        if token == "(":
+            take()
+            node = parse_or()
+            if peek() != ")":
+                raise ValueError("missing closing parenthesis.")
+            take()
+            return node
+        if token is not None and token.isdigit():
+            number = int(take())
+            if number < 1 or number > len(conditions):
+                raise ValueError(f"there is no condition {number}.")
+            return ("cond", tuple(conditions[number - 1]))
+        raise ValueError(f"unexpected '{tokens[pos]}'." if token else "unexpected end of expression.")
+
+    if not tokens:
+        raise ValueError("the expression is empty.")
+
+    tree = parse_or()
+    if pos != len(tokens):
+        raise ValueError(f"unexpected '{tokens[pos]}'.")
+    return tree
+
+
+def describe_expression(conditions, expression):
+    """Return the expression with each condition number written out."""
+    def render(node, top=False):
+        kind = node[0]
+        if kind == "cond":
+            return " ".join(str(part) for part in node[1])
+        if kind == "not":
+            return f"NOT {render(node[1])}"
+        text = f" {kind.upper()} ".join(render(child) for child in node[1])
+        return text if top else f"({text})"
+
+    return render(parse_expression(expression, conditions), top=True)
+
+
+def _expression_columns(conditions):
+    return list(dict.fromkeys(column for column, _, _ in conditions))
+
+
+def build_compound_mask(df, conditions, expression):
+    """
+    Return the boolean row mask of a compound expression on df.
+    Each condition is evaluated once, and only on the rows whose result
+    it can still change: AND children see the rows that are still True,
+    OR children the rows that are still False. Children run in order of
+    their pass rate on a sample (most selective first for AND, least for
+    OR), and evaluation stops as soon as no undecided rows remain.
+    """
+    tree = parse_expression(expression, conditions)
+
+    if len(df) > SELECTIVITY_SAMPLE_ROWS:
+        sample = df.iloc[np.random.default_rng(0).choice(len(df), SELECTIVITY_SAMPLE_ROWS, replace=False)]
+    else:
+        sample = df
+
+    rates = {}
+    _estimate_pass_rate(sample, tree, rates)
+    return _evaluate_node(df, tree, np.arange(len(df)), rates)
+
+
+def _estimate_pass_rate(sample, node, rates):
+    """Fill rates with id(node) -> fraction of sample rows that pass, for every node."""
+    kind = node[0]
+    if kind == "cond":
+        rate = _condition_mask(sample, node[1]).mean() if len(sample) else 0.5
+    elif kind == "not":
+        rate = 1.0 - _estimate_pass_rate(sample, node[1], rates)
+    else:
+        child_rates = [_estimate_pass_rate(sample, child, rates) for child in node[1]]
+        if kind == "and":
+            rate = float(np.prod(child_rates))
+        else:
+            rate = 1.0 - float(np.prod([1.0 - r for r in child_rates]))
+    rates[id(node)] = rate
+    return rate
+
+
+def _evaluate_node(df, node, positions, rates):
+    """Evaluate a node on the rows at positions; returns one bool per position."""
+    kind = node[0]
+
+    if kind == "cond":
+        return _condition_mask(df, node[1], None if len(positions) == len(df) else positions)
+
+    if kind == "not":
+        return ~_evaluate_node(df, node[1], positions, rates)
+
+    is_and = kind == "and"
+    children = sorted(node[1], key=lambda child: rates[id(child)], reverse=not is_and)
+
+    # Rows whose result is not decided yet, as indexes into positions
+    result = np.full(len(positions), is_and)
+    undecided = np.arange(len(positions))
+
+    for child in children:
+        if len(undecided) == 0:
+            break
+        sub = _evaluate_node(df, child, positions[undecided], rates)
+        decided = ~sub if is_and else sub
+        result[undecided[decided]] = not is_and
+        undecided = undecided[~decided]
+
+    return result
+
+
+def _condition_mask(df, condition, positions=None):
+    """Return one condition's mask on df (or on the rows at positions) as a bool array."""
+    column, name, value = condition
+    mask = _column_mask(df, column, name, value, positions)
+    if mask is None:
+        raise ValueError(f"Unknown filter condition '{name}'.")
+    return np.asarray(mask, dtype=bool)
+
+
+def _apply_filter_streaming(source, column, condition, value):
+    """
+    Record a filter on a chunked source. Nothing is read yet except the
+    rows needed for the preview; the filter runs chunk by chunk on export.
+    """
+    try:
+        # The preview is the only read, and it also checks the value;
+        # an invalid filter is taken back out
+        source.add_step("filter", column=column, condition=condition, value=value)
+        try:
+            preview = source.head(10)
+        except ValueError:
+            source.pop_step()
+            raise
+        set_chunked_source(source)
+
+        print("\n=== FILTER RESULT (STREAMING) ===")
+        print(preview.to_string(index=False))
+        print("Row count will be reported on export.")
+
+        log_action(
+            "FILTER",
+            details=f"Filtered on column '{column}' with condition '{condition}' and value '{value}' (streaming).",
+            conditions=f"{column} {condition} {value}",
+            columns=[column],
+        )
+
+    except ValueError:
+        print("Invalid numeric input for this condition.")
+
+
+def _apply_filter_lazy(plan, column, condition, value):
+    """Record a filter in the lazy plan and preview its first rows."""
+    try:
+        # Validate the value against one row before recording it
+        _build_mask(plan.base[column].head(1), condition, value)
+
+        plan.add_step("filter", column=column, condition=condition, value=value)
+        touch_plan()
+
+        print("\n=== FILTER RESULT (LAZY) ===")
+        print(plan.head(10).to_string(index=False))
+        print(f"Steps pending: {len(plan.steps)}")
+
+        log_action(
+            "FILTER",
+            details=f"Filtered on column '{column}' with condition '{condition}' and value '{value}' (lazy).",
+            conditions=f"{column} {condition} {value}",
+            columns=[column],
+        )
+
     except ValueError:
         print("Invalid numeric input for this condition.")
\ No newline at end of file
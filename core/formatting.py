@@ -1,13 +1,42 @@
+import os
+import warnings
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
-from core.state import get_dataframe, set_dataframe, push_state
+from core.state import get_dataframe, set_dataframe, push_column_delta, get_chunked_source
+from core.state import get_plan, touch_plan, get_data_version
+from core import row_hash
 from utils.menus import show_format_menu
 from core.audit import log_action
 
+# Menu choice -> formatting option name
+FORMAT_OPTIONS = {
+    "1": "trim_whitespace",
+    "2": "uppercase",
+    "3": "lowercase",
+    "4": "capitalize",
+    "5": "short_date",
+    "6": "long_date",
+    "7": "decimal",
+    "8": "percentage",
+}
+
+# Distinct values sampled to detect the format of a date column
+DATE_SAMPLE_VALUES = 200
+
+# date_format default of _format_series: detect it from the values given
+DETECT = object()
+
+# Threads used when one format is applied to several columns
+FORMAT_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
 
 def apply_format_flow():
     """
     Full formatting flow:
-    1) Select column
+    1) Select one or more columns
     2) Select formatting option
     3) Apply formatting & update DataFrame
 
@@ -15,6 +44,10 @@ def apply_format_flow():
     """
     df = get_dataframe()
 
+    if df is None and get_chunked_source() is not None:
+        print("Formatting is not available in streaming mode.")
+        return
+
     if df is None:
         print("No file loaded. Please import a file first.")
         return
@@ -24,31 +57,26 @@ def apply_format_flow():
     for idx, col in enumerate(df.columns, start=1):
         print(f"{idx}. {col}")
 
-    col_choice = input("Select column number: ").strip()
+    print("\nYou may select MULTIPLE columns using comma-separated values.")
+    col_input = input("Select column number(s): ").strip()
 
-    if not col_choice.isdigit():
+    # Parse comma-separated input like "1,3,4"
+    try:
+        indices = [int(x.strip()) for x in col_input.split(",")]
+    except ValueError:
         print("Invalid column choice. Returning to menu.")
         return
 
-    col_index = int(col_choice) - 1
-    if col_index < 0 or col_index >= len(df.columns):
+    if any(idx < 1 or idx > len(df.columns) for idx in indices):
         print("Invalid column selection. Returning.")
         return
 
-    column = df.columns[col_index]
-    print(f"Column selected: {column}")
+    columns = list(dict.fromkeys(df.columns[i - 1] for i in indices))
+    print(f"Column(s) selected: {', '.join(columns)}")
+    column = columns[0] if len(columns) == 1 else columns
 
     # Step 2 — Select formatting operation
-    format_map = {
-        "1": "trim_whitespace",
-        "2": "uppercase",
-        "3": "lowercase",
-        "4": "capitalize",
-        "5": "short_date",
-        "6": "long_date",
-        "7": "decimal",
-        "8": "percentage",
-    }
+    format_map = FORMAT_OPTIONS
 
     fmt_choice = show_format_menu()
 
@@ -64,90 +92,221 @@ def apply_format_flow():
     print(f"Formatting option selected: {formatting}")
 
     # Step 3 — Apply formatting
-    push_state()
+    if get_plan() is not None:
+        _apply_format_lazy(get_plan(), column, fmt_choice)
+        return
+
     _apply_format(df, column, fmt_choice)
 
 
-def _apply_format(df: pd.DataFrame, column: str, fmt_choice: str) -> None:
+def _apply_format(df: pd.DataFrame, column, fmt_choice: str) -> bool:
     """
-    Internal formatting logic for the selected column and operation.
+    Internal formatting logic for the selected column(s) and operation.
     Handles messy inputs and leaves unparseable values unchanged.
+    column may be a list; the columns are then formatted in parallel and
+    the whole batch is a single Undo step and a single audit entry.
+    Returns True when the format was applied.
     """
-    series = df[column]
+    columns = column if isinstance(column, list) else [column]
 
     try:
-        # 1. Trim whitespace
-        if fmt_choice == "1":
-            df[column] = series.astype(str).str.strip()
-
-        # 2. Uppercase
-        elif fmt_choice == "2":
-            df[column] = series.astype(str).str.upper()
-
-        # 3. Lowercase
-        elif fmt_choice == "3":
-            df[column] = series.astype(str).str.lower()
-
-        # 4. Capitalize each word (Title Case)
-        elif fmt_choice == "4":
-            df[column] = series.astype(str).str.title()
-
-        # 5. Short Date (MM/DD/YYYY)
-        elif fmt_choice == "5":
-            parsed = pd.to_datetime(series, errors="coerce", infer_datetime_format=True)
-            formatted = series.astype(str)  # start from original
-            mask = parsed.notna()
-            formatted[mask] = parsed[mask].dt.strftime("%m/%d/%Y")
-            df[column] = formatted
-
-        # 6. Long Date (Month DD, YYYY)
-        elif fmt_choice == "6":
-            parsed = pd.to_datetime(series, errors="coerce", infer_datetime_format=True)
-            formatted = series.astype(str)
-            mask = parsed.notna()
-            formatted[mask] = parsed[mask].dt.strftime("%B %d, %Y")
-            df[column] = formatted
-
-        # 7. Decimal (2 decimal places)
-        elif fmt_choice == "7":
-            numeric = pd.to_numeric(series, errors="coerce")
-            formatted = series.astype(str)
-            mask = numeric.notna()
-            # format as 2 decimal places
-            formatted[mask] = numeric[mask].round(2).map(lambda x: f"{x:.2f}")
-            df[column] = formatted
-
-        # 8. Percentage
-        elif fmt_choice == "8":
-            numeric = pd.to_numeric(series, errors="coerce")
-            formatted = series.astype(str)
-            mask = numeric.notna()
+        formatted = _format_columns(df, columns, fmt_choice)
 
-            # Values over 1 are assumed to be whole percentages
-            def to_percent(v: float) -> str:
-                if v <= 1:
-                    v *= 100.0
-                return f"{v:.0f}%"
-
-            formatted[mask] = numeric[mask].map(to_percent)
-            df[column] = formatted
+        # Save only the old columns for Undo, then rewrite them on a
+        # shallow copy; df may itself be a slice of an earlier frame
+        version = get_data_version()
+        push_column_delta(column)
+        result = df.copy(deep=False)
+        for col in columns:
+            result[col] = formatted[col]
 
         # Final output
         print("\n=== FORMAT RESULT ===")
-        print(df.head(10).to_string(index=False))
-        print("\nFormatting complete.")
+        print(result.head(10).to_string(index=False))
+        print(f"\nFormatting complete ({len(columns)} column(s)).")
 
-        set_dataframe(df)
+        set_dataframe(result)
+        row_hash.rehash_column(df, version, columns)
 
         # Log the formatting action
+        names = ", ".join(f"'{c}'" for c in columns)
         log_action(
             "FORMAT",
-            details=f"Applied formatting option '{fmt_choice}' on column '{column}'.",
+            details=f"Applied formatting option '{fmt_choice}' on column{'s' if len(columns) > 1 else ''} {names}.",
             conditions=f"fmt_choice={fmt_choice}",
-            columns=[column],
+            columns=columns,
             # rows_affected is optional here; formatting generally affects whole column
         )
+        return True
 
     # Catch any errors
     except Exception as e:
-        print(f"Formatting error: {e}")
\ No newline at end of file
+        print(f"Formatting error: {e}")
+        return False
+
+
+def _format_columns(df: pd.DataFrame, columns: list, fmt_choice: str) -> dict:
+    """
+    Format several columns at once on a thread pool and return
+    {column: formatted series}. Work that runs in numpy or pandas'
+    compiled code can release the GIL, so columns overlap where it does;
+    a single column is formatted on the calling thread. Nothing is written
+    back until every column has been formatted, so an error leaves the
+    frame unchanged.
+    """
+    if len(columns) == 1:
+        return {columns[0]: _format_series(df[columns[0]], fmt_choice)}
+
+    workers = min(len(columns), FORMAT_MAX_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {col: pool.submit(_format_series, df[col], fmt_choice) for col in columns}
+        return {col: future.result() for col, future in futures.items()}
+
+
+def _apply_format_lazy(plan, column, fmt_choice: str) -> None:
+    """Record a format in the lazy plan and preview its first rows."""
+    columns = column if isinstance(column, list) else [column]
+    plan.add_step("format", column=column, fmt_choice=fmt_choice)
+    touch_plan()
+
+    print("\n=== FORMAT RESULT (LAZY) ===")
+    print(plan.head(10).to_string(index=False))
+    print(f"Steps pending: {len(plan.steps)}")
+
+    names = ", ".join(f"'{c}'" for c in columns)
+    log_action(
+        "FORMAT",
+        details=f"Applied formatting option '{fmt_choice}' on column{'s' if len(columns) > 1 else ''} {names} (lazy).",
+        conditions=f"fmt_choice={fmt_choice}",
+        columns=columns,
+    )
+
+
+def _format_series(series: pd.Series, fmt_choice: str, date_format=DETECT) -> pd.Series:
+    """
+    Return a formatted copy of series for one formatting option.
+    Date options detect the text date format from series unless
+    date_format gives it (None: let pandas parse each value).
+    """
+    # 1. Trim whitespace
+    if fmt_choice == "1":
+        return series.astype(str).str.strip()
+
+    # 2. Uppercase
+    if fmt_choice == "2":
+        return series.astype(str).str.upper()
+
+    # 3. Lowercase
+    if fmt_choice == "3":
+        return series.astype(str).str.lower()
+
+    # 4. Capitalize each word (Title Case)
+    if fmt_choice == "4":
+        return series.astype(str).str.title()
+
+    # 5-8. Dates and numbers: format each distinct value once
+    if fmt_choice in ("5", "6", "7", "8"):
+        return _format_distinct(series, fmt_choice, date_format)
+
+    raise ValueError(f"Unknown formatting option: {fmt_choice}")
+
+
+def _format_distinct(series: pd.Series, fmt_choice: str, date_format=DETECT) -> pd.Series:
+    """
+    Format a date or number column by formatting each distinct value once
+    and broadcasting the results back through the factorized codes.
+    Values that cannot be parsed, and missing values, keep their text form.
+    """
+    codes, uniques = pd.factorize(series)
+    values = pd.Series(np.asarray(uniques, dtype=object))
+    formatted = values.astype(str).to_numpy(dtype=object)
+
+    if fmt_choice in ("5", "6"):
+        parsed = _parse_dates(values, series.dtype, date_format)
+        mask = parsed.notna().to_numpy()
+        pattern = "%m/%d/%Y" if fmt_choice == "5" else "%B %d, %Y"
+        formatted[mask] = parsed[mask].dt.strftime(pattern).to_numpy(dtype=object)
+    else:
+        numeric = pd.to_numeric(values, errors="coerce")
+        mask = numeric.notna().to_numpy()
+        numbers = numeric[mask].to_numpy(dtype=np.float64)
+        if fmt_choice == "7":
+            formatted[mask] = np.char.mod("%.2f", np.round(numbers, 2)).astype(object)
+        else:
+            # Values over 1 are assumed to be whole percentages
+            numbers = np.where(numbers <= 1, numbers * 100.0, numbers)
+            formatted[mask] = np.char.mod("%.0f%%", numbers).astype(object)
+
+    result = formatted[codes] if len(formatted) else np.empty(len(codes), dtype=object)
+    missing = codes < 0
+    if missing.any():
+        result[missing] = series[missing].astype(str).to_numpy(dtype=object)
+    return pd.Series(result, index=series.index, name=series.name)
+
+
+def _parse_dates(values: pd.Series, dtype, date_format=DETECT) -> pd.Series:
+    """
+    Parse distinct values as dates. Text is parsed with one explicit
+    format, detected from a sample unless date_format is given; other
+    values are converted directly. Anything that does not parse becomes NaT.
+    """
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return pd.to_datetime(values)
+
+    is_text = _is_text(values)
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+
+    text = values[is_text]
+    if len(text):
+        if date_format is DETECT:
+            date_format = _detect_date_format(text)
+        with warnings.catch_warnings():
+            # Without a detected format pandas warns that it guesses per element
+            warnings.simplefilter("ignore", UserWarning)
+            parsed[is_text] = pd.to_datetime(text.str.strip(), format=date_format, errors="coerce")
+
+    other = values[~is_text]
+    if len(other):
+        parsed[~is_text] = pd.to_datetime(other, errors="coerce")
+    return parsed
+
+
+def column_date_format(series: pd.Series):
+    """
+    Return the text date format that _format_series would detect on the
+    whole of series, or None. Lets a caller that formats a column piece
+    by piece use one format for every piece.
+    """
+    _, uniques = pd.factorize(series)
+    values = pd.Series(np.asarray(uniques, dtype=object))
+    text = values[_is_text(values)]
+    return _detect_date_format(text) if len(text) else None
+
+
+def _is_text(values: pd.Series) -> np.ndarray:
+    return np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=len(values))
+
+
+def _detect_date_format(text: pd.Series):
+    """
+    Return the strftime format that parses the most values in a sample
+    of text, or None. Candidates come from pandas' per-value guesses, so
+    one day-first value like 25/06/2021 settles an ambiguous column.
+    """
+    from pandas.tseries.api import guess_datetime_format
+
+    sample = text.iloc[:DATE_SAMPLE_VALUES].str.strip()
+    guesses = Counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        for value in sample:
+            guess = guess_datetime_format(value)
+            if guess is not None:
+                guesses[guess] += 1
+
+    best, best_parsed = None, 0
+    for candidate, _ in guesses.most_common():
+        parsed = int(pd.to_datetime(sample, format=candidate, errors="coerce").notna().sum())
+        if parsed > best_parsed:
+            best, best_parsed = candidate, parsed
+    return best
\ No newline at end of file
@@ -0,0 +1,169 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Rows whose similarity reaches this score are treated as near-duplicates
+DEFAULT_THRESHOLD = 0.85
+
+# Each distinct value is compared with this many neighbours in every
+# blocking order, instead of with every other value
+NEIGHBOUR_WINDOW = 4
+
+# Words that do not tell two organisations apart
+_NOISE_WORDS = r"\b(?:inc|incorporated|llc|ltd|limited|co|corp|corporation|company|the|and)\b"
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"), **dict.fromkeys("cgjkqsxz", "2"), **dict.fromkeys("dt", "3"),
+    "l": "4", **dict.fromkeys("mn", "5"), "r": "6",
+}
+
+
+def find_near_duplicates(df: pd.DataFrame, columns: list, threshold: float = DEFAULT_THRESHOLD):
+    """
+    Group rows whose selected columns are near-identical, e.g. "Acme Inc."
+    and "ACME, Inc". Returns (cluster_ids, scores, pairs_compared):
+    cluster_ids holds one id per row (-1 for rows with no near-duplicate),
+    scores the best similarity (0-1) of each row to another member of its
+    cluster, and pairs_compared how many candidate pairs were scored.
+
+    Values are normalized (case, punctuation, company suffixes) and each
+    distinct normalized value is compared once. Candidate pairs come from
+    blocking: the distinct values are sorted by three keys (the text, its
+    words in sorted order, and a phonetic code of the first word) and
+    each is only compared with its nearest neighbours in those orders.
+    Similarity is the Jaccard overlap of character trigrams. Rows whose
+    values are all missing or made only of noise words (e.g. "Inc.")
+    have nothing to compare and are never part of a cluster.
+    """
+    codes, keys = _normalized_keys(df, columns)
+    n_keys = len(keys)
+    valid = codes >= 0
+
+    # Rows that normalize to the same value are duplicates outright
+    counts = np.bincount(codes[valid], minlength=n_keys)
+    best = np.where(counts > 1, 1.0, 0.0)
+    parent = list(range(n_keys))
+
+    pairs = _candidate_pairs(keys)
+    grams = [_trigrams(k) for k in keys]
+    compared = 0
+    for a, b in pairs.tolist():
+        ga, gb = grams[a], grams[b]
+        if not ga or not gb:
+            continue
+        compared += 1
+        score = len(ga & gb) / len(ga | gb)
+        if score >= threshold:
+            _union(parent, a, b)
+            best[a] = max(best[a], score)
+            best[b] = max(best[b], score)
+
+    roots = np.array([_find(parent, i) for i in range(n_keys)], dtype=np.int64)
+    row_roots = np.full(len(df), -1, dtype=np.int64)
+    row_roots[valid] = roots[codes[valid]]
+
+    # Only groups of two or more rows are clusters; number them by first row
+    sizes = np.bincount(row_roots[valid], minlength=n_keys)
+    in_cluster = np.zeros(len(df), dtype=bool)
+    in_cluster[valid] = sizes[row_roots[valid]] > 1
+    cluster_ids = np.full(len(df), -1, dtype=np.int64)
+    scores = np.zeros(len(df))
+    if in_cluster.any():
+        labels, _ = pd.factorize(row_roots[in_cluster])
+        cluster_ids[in_cluster] = labels
+        scores[in_cluster] = best[codes[in_cluster]]
+
+    return cluster_ids, scores, compared
+
+
+def keep_first_mask(cluster_ids: np.ndarray) -> np.ndarray:
+    """Return the rows to keep: every row outside a cluster and the first row of each cluster."""
+    first = ~pd.Series(cluster_ids).duplicated(keep="first").to_numpy()
+    return (cluster_ids < 0) | first
+
+
+def _normalized_keys(df: pd.DataFrame, columns: list):
+    """
+    Return (codes, keys): the normalized text of each distinct combination
+    of the selected columns, and the code of that key for every row.
+    Rows whose selected columns all normalize to nothing get code -1.
+    """
+    parts = []
+    for col in columns:
+        col_codes, uniques = pd.factorize(df[col])
+        normalized = _normalize(pd.Series(np.asarray(uniques, dtype=object)))
+        # Missing values (code -1) normalize to an empty string
+        parts.append(np.append(normalized.to_numpy(dtype=object), "")[col_codes])
+
+    combined = parts[0] if len(parts) == 1 else pd.Series(parts[0]).str.cat(parts[1:], sep=" | ").to_numpy()
+    combined = np.asarray(combined, dtype=object)
+    combined[np.logical_and.reduce([p == "" for p in parts])] = None
+    codes, keys = pd.factorize(combined)
+    return codes, list(keys)
+
+
+def _normalize(values: pd.Series) -> pd.Series:
+    text = values.astype(str).str.lower()
+    text = text.str.replace(r"[^\w\s]", " ", regex=True)
+    text = text.str.replace(_NOISE_WORDS, " ", regex=True)
+    return text.str.split().str.join(" ")
+
+
+def _candidate_pairs(keys: list) -> np.ndarray:
+    """Return unique (a, b) index pairs of keys that are neighbours in any blocking order."""
+    if len(keys) < 2:
+        return np.zeros((0, 2), dtype=np.int64)
+
+    orders = [
+        keys,
+        [" ".join(sorted(k.split())) for k in keys],
+        [_soundex(k) + " " + k for k in keys],
+    ]
+
+    found = []
+    for order_keys in orders:
+        order = np.argsort(np.asarray(order_keys, dtype=object), kind="stable")
+        for step in range(1, min(NEIGHBOUR_WINDOW, len(keys) - 1) + 1):
+            found.append(np.stack([order[:-step], order[step:]], axis=1))
+
+    pairs = np.sort(np.concatenate(found), axis=1)
+    encoded = np.unique(pairs[:, 0] * len(keys) + pairs[:, 1])
+    return np.stack([encoded // len(keys), encoded % len(keys)], axis=1)
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)} if text else set()
+
+
+def _soundex(text: str) -> str:
+    """American Soundex code of the first word of text."""
+    word = re.sub(r"[^a-z]", "", text.split(" ", 1)[0])
+    if not word:
+        return "0000"
+
+    code = word[0].upper()
+    last = _SOUNDEX_CODES.get(word[0], "")
+    for ch in word[1:]:
+        digit = _SOUNDEX_CODES.get(ch, "")
+        if digit and digit != last:
+            code += digit
+            if len(code) == 4:
+                break
+        if ch not in "hw":
+            last = digit
+    return code.ljust(4, "0")
+
+
+def _find(parent: list, i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _union(parent: list, a: int, b: int) -> None:
+    ra, rb = _find(parent, a), _find(parent, b)
+    if ra != rb:
+        parent[max(ra, rb)] = min(ra, rb)
\ No newline at end of file
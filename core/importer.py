@@ -1,12 +1,14 @@
+import time
 import pandas as pd
 from pathlib import Path
-from core.state import set_dataframe, reset_state
+from core.state import set_dataframe, reset_state, set_chunked_source
 from core.audit import log_action, clear_audit_log
 
-def validate_headers_raw(path: str) -> None:
+def validate_headers_raw(path: str) -> list:
     """
     Validate headers BEFORE pandas auto-renames duplicates.
     Detect blank or duplicate header names from the raw file.
+    Returns the raw header row.
     """
     ext = Path(path).suffix.lower()
 
@@ -21,6 +23,12 @@ def validate_headers_raw(path: str) -> None:
         sheet = wb.active
         raw_header = [cell.value for cell in next(sheet.iter_rows(max_row=1))]
 
+    check_raw_header(raw_header)
+    return raw_header
+
+
+def check_raw_header(raw_header: list) -> None:
+    """Raise ValueError if a raw header row has blank or duplicate names."""
     # Check for blank headers
     if any(h is None or str(h).strip() == "" for h in raw_header):
         raise ValueError("Invalid header: one or more column names are blank.")
@@ -43,23 +51,40 @@ def load_file():
     try:
         # prompt user to select file
         print("Import file selected.")
-        path = input("Enter file path (.csv or .xlsx): ").strip()
+        path = input("Enter file path (.csv, .xlsx or a SQLite .db file), a folder or a glob pattern: ").strip()
+
+        # Several files at once: a folder or a pattern such as data/*.csv
+        from core.multi_import import is_multi_path
+        if is_multi_path(path):
+            _load_many(path)
+            return
 
         # Validate path exists
         validate_path_exists(path)
 
-        # Validate raw headers first
-        validate_headers_raw(path)
-
         ext = Path(path).suffix.lower()
 
-        # load with pandas
+        from core.sqlite_io import SQLITE_EXTENSIONS
+        if ext in SQLITE_EXTENSIONS:
+            _load_sqlite(path)
+            return
+
+        if ext not in (".csv", ".xlsx"):
+            raise ValueError(f"Unsupported file type: '{ext}'. Only .csv, .xlsx and SQLite databases are allowed.")
+
+        # Validate raw headers first (XLSX headers are checked while reading)
         if ext == ".csv":
-            df = pd.read_csv(path)
-        elif ext == ".xlsx":
-            df = pd.read_excel(path, engine="openpyxl")
-        else:
-            raise ValueError(f"Unsupported file type: '{ext}'. Only .csv and .xlsx are allowed.")
+            validate_headers_raw(path)
+
+        # Large CSVs can be opened as a chunked source instead
+        if ext == ".csv" and _ask_streaming(path):
+            _load_streaming(path)
+            return
+
+        # Workbooks with several sheets can import more than one
+        sheets, sheet_column = _ask_sheets(path) if ext == ".xlsx" else (None, None)
+
+        df = read_file(path, validated=True, sheets=sheets, sheet_column=sheet_column)
 
         # before we start using this new DataFrame, reset state and audit
         reset_state()
@@ -80,7 +105,7 @@ def load_file():
         # log this new import as the first action in this "session" of the dataset
         log_action(
             "IMPORT",
-            details=f"Imported file '{path}'",
+            details=f"Imported file '{path}'" + (f" (sheets: {', '.join(sheets)})" if sheets else ""),
             rows_affected=len(df)
         )
 
@@ -89,6 +114,253 @@ def load_file():
                 print(str(e))
 
 
+def read_file(path: str, validated: bool = False, sheets: list = None, sheet_column: str = None) -> pd.DataFrame:
+    """
+    Read a CSV or XLSX file into a DataFrame without prompting.
+    Uses the import cache when the file is unchanged, otherwise parses
+    it and compacts dtypes. Raises on a missing file, an unsupported
+    type or an invalid header. Pass validated=True if the caller has
+    already checked the path and CSV header.
+    For XLSX, sheets selects the sheets to stack (default: the active
+    sheet) and sheet_column names an optional column recording each
+    row's source sheet.
+    """
+    ext = Path(path).suffix.lower()
+
+    if not validated:
+        validate_path_exists(path)
+        if ext not in (".csv", ".xlsx"):
+            raise ValueError(f"Unsupported file type: '{ext}'. Only .csv and .xlsx are allowed.")
+        if ext == ".csv":
+            validate_headers_raw(path)
+
+    # Reuse the columnar copy from a previous import of the same file
+    from core import cache
+    cache_key = cache.file_fingerprint(path)
+    if sheets is not None:
+        # Each sheet selection of a workbook is cached separately
+        cache_key = cache.variant_key(cache_key, sheets, sheet_column)
+    df = cache.load_cached(path, cache_key)
+
+    if df is not None:
+        print("Loaded from import cache.")
+        return df
+
+    start = time.perf_counter()
+
+    if ext == ".csv":
+        df = pd.read_csv(path)
+    elif sheets is not None:
+        # Several sheets parsed in parallel, then stacked
+        from core.xlsx_reader import read_xlsx_sheets
+        df = read_xlsx_sheets(path, sheets, sheet_column)
+    else:
+        # Single pass: header validation, type inference and parsing
+        from core.xlsx_reader import read_xlsx
+        df = read_xlsx(path)
+
+    elapsed = time.perf_counter() - start
+    print(f"Parsed {len(df)} rows in {elapsed:.2f}s ({len(df) / max(elapsed, 1e-9):,.0f} rows/sec).")
+
+    # Shrink dtypes before caching so the cached copy is compact too
+    df = _compact(df)
+
+    cache.store(path, df, cache_key)
+    return df
+
+
+def _compact(df: pd.DataFrame) -> pd.DataFrame:
+    """Compact column dtypes and report memory before and after."""
+    from core.compaction import compact_dtypes, memory_usage_bytes
+
+    before = memory_usage_bytes(df)
+    df = compact_dtypes(df)
+    after = memory_usage_bytes(df)
+
+    print(f"Memory: {before / 1024 ** 2:,.1f} MB -> {after / 1024 ** 2:,.1f} MB after dtype compaction.")
+    return df
+
+
+def _ask_sheets(path: str):
+    """
+    Ask which sheets of a multi-sheet workbook to import.
+    Returns (sheets, sheet_column); (None, None) means the active sheet only.
+    """
+    from core.xlsx_reader import sheet_names
+
+    names = sheet_names(path)
+    if len(names) < 2:
+        return None, None
+
+    print(f"\nThis workbook has {len(names)} sheets:")
+    for i, name in enumerate(names, start=1):
+        print(f"{i}. {name}")
+    raw = input("Sheets to import (numbers separated by commas, A for all) [default: active sheet]: ").strip()
+
+    if not raw:
+        return None, None
+    if raw.upper() == "A":
+        sheets = names
+    else:
+        picks = [p.strip() for p in raw.split(",") if p.strip()]
+        if not all(p.isdigit() and 1 <= int(p) <= len(names) for p in picks):
+            raise ValueError("Invalid sheet selection.")
+        sheets = [names[int(p) - 1] for p in dict.fromkeys(picks)]
+
+    sheet_column = None
+    if len(sheets) > 1:
+        print("Add a column recording each row's source sheet?")
+        print("1. Yes")
+        print("2. No")
+        if input("Enter choice: ").strip() == "1":
+            sheet_column = input("Column name [source_sheet]: ").strip() or "source_sheet"
+
+    return sheets, sheet_column
+
+
+def _ask_streaming(path: str) -> bool:
+    """
+    Offer streaming mode when a CSV is larger than STREAM_SUGGEST_BYTES.
+    Returns True if the user chose to stream the file in chunks.
+    """
+    from core.chunked import STREAM_SUGGEST_BYTES
+
+    size = Path(path).stat().st_size
+    if size < STREAM_SUGGEST_BYTES:
+        return False
+
+    print(f"\nThis file is {size / (1024 ** 2):,.0f} MB.")
+    print("1. Load into memory")
+    print("2. Stream in chunks (filter, dedupe and CSV export only)")
+    return input("Enter choice: ").strip() == "2"
+
+
+def _load_streaming(path: str) -> None:
+    """Open a CSV as a ChunkedSource so it is never fully loaded into memory."""
+    from core.chunked import ChunkedSource, parse_chunk_budget
+
+    budget = input("Chunk size (rows, or e.g. 64MB) [default 100000 rows]: ").strip()
+    chunk_rows, chunk_bytes = parse_chunk_budget(budget) if budget else (None, None)
+
+    source = ChunkedSource(path, chunk_rows=chunk_rows, chunk_bytes=chunk_bytes)
+
+    reset_state()
+    clear_audit_log()
+    set_chunked_source(source, path)
+
+    print("\n=== FILE OPENED IN STREAMING MODE ===")
+    print(f"Rows per chunk: {source.chunk_rows}")
+    print(f"Columns: {len(source.columns)}")
+    print("Headers:", source.columns)
+    print("\nPreview (first 5 rows):")
+    print(source.head(5).to_string(index=False))
+
+    log_action(
+        "IMPORT",
+        details=f"Opened file '{path}' in streaming mode ({source.chunk_rows} rows per chunk)",
+    )
+
+
+def _load_many(pattern: str) -> None:
+    """Load every CSV/XLSX file matching a folder or glob pattern as one DataFrame."""
+    from core.multi_import import check_matching_headers, expand_import_paths, read_many
+
+    paths = expand_import_paths(pattern)
+    print(f"\nFound {len(paths)} files.")
+
+    # CSV headers are checked before any file is parsed; XLSX headers
+    # are checked while their files are parsed
+    check_matching_headers(paths)
+
+    print("Add a column recording each row's source file?")
+    print("1. Yes")
+    print("2. No")
+    source_column = None
+    if input("Enter choice: ").strip() == "1":
+        source_column = input("Column name [source_file]: ").strip() or "source_file"
+
+    start = time.perf_counter()
+    df, timings = read_many(paths, source_column)
+    elapsed = time.perf_counter() - start
+
+    for path, rows, seconds in timings:
+        print(f"  {path}: {rows} rows in {seconds:.2f}s ({rows / max(seconds, 1e-9):,.0f} rows/sec)")
+    megabytes = sum(Path(p).stat().st_size for p in paths) / 1024 ** 2
+    print(
+        f"Parsed {len(df)} rows from {len(paths)} files in {elapsed:.2f}s "
+        f"({len(df) / max(elapsed, 1e-9):,.0f} rows/sec, {megabytes / max(elapsed, 1e-9):,.1f} MB/s)."
+    )
+
+    df = _compact(df)
+
+    reset_state()
+    clear_audit_log()
+    set_dataframe(df, pattern)
+
+    summary = get_file_summary(df)
+    print("\n=== FILES LOADED SUCCESSFULLY ===")
+    print(f"Rows: {summary['rows']}")
+    print(f"Columns: {summary['columns']}")
+    print("Headers:", summary["headers"])
+    print("\nPreview (first 5 rows):")
+    print(df.head().to_string(index=False))
+
+    log_action(
+        "IMPORT",
+        details=f"Imported {len(paths)} files matching '{pattern}'",
+        rows_affected=len(df)
+    )
+
+
+def _load_sqlite(path: str) -> None:
+    """Load a table, or the result of a query, from a SQLite database."""
+    from core.sqlite_io import list_tables, read_sqlite
+
+    tables = list_tables(path)
+    print("\nTables in this database:")
+    for i, name in enumerate(tables, start=1):
+        print(f"{i}. {name}")
+    print("Q. Enter a SQL query instead")
+
+    choice = input("Enter choice: ").strip()
+    if choice.upper() == "Q":
+        query = input("Enter a SELECT query: ").strip()
+        if not query:
+            raise ValueError("No query provided.")
+        table, source = None, "query"
+    elif choice.isdigit() and 1 <= int(choice) <= len(tables):
+        query, table = None, tables[int(choice) - 1]
+        source = f"table '{table}'"
+    else:
+        raise ValueError("Invalid table choice.")
+
+    start = time.perf_counter()
+    df = read_sqlite(path, table=table, query=query)
+    elapsed = time.perf_counter() - start
+    print(f"Read {len(df)} rows in {elapsed:.2f}s ({len(df) / max(elapsed, 1e-9):,.0f} rows/sec).")
+
+    df = _compact(df)
+
+    reset_state()
+    clear_audit_log()
+    set_dataframe(df, path)
+
+    summary = get_file_summary(df)
+    print("\n=== DATA LOADED SUCCESSFULLY ===")
+    print(f"Rows: {summary['rows']}")
+    print(f"Columns: {summary['columns']}")
+    print("Headers:", summary["headers"])
+    print("\nPreview (first 5 rows):")
+    print(df.head().to_string(index=False))
+
+    log_action(
+        "IMPORT",
+        details=f"Imported {source} from SQLite database '{path}'",
+        conditions=query,
+        rows_affected=len(df)
+    )
+
+
 def get_file_summary(df: pd.DataFrame) -> dict:
     """
     Return basic metadata for a loaded DataFrame.
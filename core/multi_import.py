@@ -0,0 +1,109 @@
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Worker processes parsing files at the same time
+IMPORT_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+IMPORT_EXTENSIONS = (".csv", ".xlsx")
+
+
+def is_multi_path(text: str) -> bool:
+    """True if an import path names several files: a directory or a glob pattern."""
+    return os.path.isdir(text) or (not os.path.exists(text) and any(ch in text for ch in "*?["))
+
+
+def expand_import_paths(text: str) -> list:
+    """
+    Expand a directory (its .csv and .xlsx files) or a glob pattern into
+    a sorted list of importable files. Raises FileNotFoundError if
+    nothing matches.
+    """
+    if os.path.isdir(text):
+        matches = [os.path.join(text, name) for name in os.listdir(text)]
+    else:
+        matches = glob.glob(text, recursive=True)
+
+    files = sorted(p for p in matches if os.path.isfile(p) and Path(p).suffix.lower() in IMPORT_EXTENSIONS)
+    if not files:
+        raise FileNotFoundError(f"No .csv or .xlsx files match: {text}")
+    return files
+
+
+def check_matching_headers(paths: list) -> list:
+    """
+    Validate the raw header of every CSV file (no blanks or duplicates)
+    and check that they all have the same column names, in any order,
+    before anything is parsed. XLSX headers are checked by read_many from
+    the rows it parses, so each workbook is opened only once.
+    Returns the first CSV file's header, or None if there is none.
+    """
+    from core.importer import validate_headers_raw
+
+    first = None
+    first_path = None
+    for path in paths:
+        if Path(path).suffix.lower() != ".csv":
+            continue
+        header = validate_headers_raw(path)
+        if first is None:
+            first, first_path = header, path
+        elif set(header) != set(first):
+            raise ValueError(f"'{path}' has different columns from '{first_path}': {header}")
+    return first
+
+
+def read_many(paths: list, source_column: str = None):
+    """
+    Parse several CSV/XLSX files concurrently in worker processes and
+    combine them with a single concatenation, aligned on the first
+    file's column order. Every file must have the same column names as
+    the first one, in any order. When source_column is given, a
+    categorical column of that name records the file each row came from.
+    Returns (df, timings): timings holds (path, rows, seconds) per file.
+    """
+    workers = min(len(paths), IMPORT_MAX_WORKERS)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_parse_file, paths))
+    else:
+        results = [_parse_file(path) for path in paths]
+
+    frames = [frame for frame, _ in results]
+    timings = [(path, len(frame), seconds) for path, (frame, seconds) in zip(paths, results)]
+
+    columns = list(frames[0].columns)
+    for path, frame in zip(paths, frames):
+        if set(frame.columns) != set(columns):
+            raise ValueError(f"'{path}' has different columns from '{paths[0]}': {list(frame.columns)}")
+
+    if source_column is not None and source_column in columns:
+        raise ValueError(f"Column '{source_column}' already exists; choose another name for the file column.")
+
+    df = pd.concat([frame[columns] for frame in frames], ignore_index=True)
+
+    if source_column is not None:
+        # Short names when they are unique, full paths otherwise
+        names = [os.path.basename(p) for p in paths]
+        if len(set(names)) < len(names):
+            names = list(paths)
+        codes = np.repeat(np.arange(len(frames)), [len(frame) for frame in frames])
+        df[source_column] = pd.Categorical.from_codes(codes, categories=names)
+
+    return df, timings
+
+
+def _parse_file(path: str):
+    """Parse one file; runs in a worker process. Returns (df, seconds)."""
+    start = time.perf_counter()
+    if Path(path).suffix.lower() == ".csv":
+        df = pd.read_csv(path)
+    else:
+        from core.xlsx_reader import read_xlsx
+        df = read_xlsx(path)
+    return df, time.perf_counter() - start
\ No newline at end of file
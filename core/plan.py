@@ -0,0 +1,215 @@
+import numpy as np
+import pandas as pd
+
+# Rows evaluated per block when a preview can stop early
+PREVIEW_BLOCK_ROWS = 65_536
+
+
+def toggle_lazy_mode():
+    """Turn lazy mode on, or run the pending plan and turn it off."""
+    from core.state import get_dataframe, get_plan, enable_lazy_mode, disable_lazy_mode
+
+    if get_dataframe() is None:
+        print("Lazy mode needs a file loaded into memory. Please import a file first.")
+        return
+
+    plan = get_plan()
+    if plan is None:
+        enable_lazy_mode()
+        print("Lazy mode ON. Filter, sort, format and duplicate removal will be recorded")
+        print("and only run when a preview or export needs them.")
+        return
+
+    pending = plan.describe()
+    disable_lazy_mode()
+    print(f"Lazy mode OFF. Applied {len(pending)} pending step(s).")
+    for line in pending:
+        print(f"   {line}")
+
+
+class LazyPlan:
+    """
+    A logical plan of transform steps recorded on top of a base DataFrame.
+    Nothing is materialized until a preview or export needs it. When the
+    plan runs, filters are combined into one shrinking set of row positions,
+    sorts are deferred until after the filters (they are stable, so the
+    result is the same), and formats are applied only to surviving rows.
+    """
+
+    def __init__(self, base: pd.DataFrame):
+        self.base = base
+        self.steps = []
+
+    def add_step(self, kind: str, **params) -> None:
+        """Record a 'filter', 'compound_filter', 'sort', 'format' or 'dedupe' step."""
+        self.steps.append({"kind": kind, **params})
+
+    def pop_step(self):
+        """Remove and return the most recently recorded step."""
+        return self.steps.pop()
+
+    def execute(self, limit: int = None) -> pd.DataFrame:
+        """
+        Run the plan and return the resulting DataFrame.
+        With limit, only the first limit rows are materialized, and a
+        plan of filters and formats stops reading as soon as it has them.
+        """
+        # Formatted columns and detected date formats, shared by the whole run
+        cache = {"columns": {}, "dates": {}}
+
+        if limit is not None and not any(s["kind"] in ("sort", "dedupe") for s in self.steps):
+            positions = self._first_positions(limit, cache)
+        else:
+            positions = self._positions(cache=cache)
+            if limit is not None:
+                positions = positions[:limit]
+
+        result = self.base.iloc[positions]
+
+        # Formats run last and only on the rows that survived
+        formatted = [c for s in self.steps if s["kind"] == "format" for c in _step_columns(s)]
+        if formatted:
+            result = result.copy()
+            for column in dict.fromkeys(formatted):
+                result[column] = self._column_at(column, len(self.steps), positions, cache).to_numpy()
+
+        return result
+
+    def head(self, n: int = 10) -> pd.DataFrame:
+        """Evaluate just enough of the plan to return its first n rows."""
+        return self.execute(limit=n)
+
+    def describe(self) -> list:
+        """Return one readable line per recorded step."""
+        lines = []
+        for step in self.steps:
+            params = ", ".join(f"{k}={v}" for k, v in step.items() if k != "kind")
+            lines.append(f"{step['kind'].upper()} ({params})")
+        return lines
+
+    def _positions(self, positions=None, cache=None) -> np.ndarray:
+        """Return the base row positions of the result, in result order."""
+        if cache is None:
+            cache = {"columns": {}, "dates": {}}
+        if positions is None:
+            positions = np.arange(len(self.base))
+        pending_sorts = []
+
+        for i, step in enumerate(self.steps):
+            kind = step["kind"]
+
+            if kind == "filter":
+                from core.filtering import _build_mask
+                values = self._column_at(step["column"], i, positions, cache)
+                mask = _build_mask(values, step["condition"], step["value"])
+                positions = positions[np.asarray(mask, dtype=bool)]
+
+            elif kind == "compound_filter":
+                from core.filtering import build_compound_mask, _expression_columns
+                values = pd.DataFrame(
+                    {c: self._column_at(c, i, positions, cache).reset_index(drop=True)
+                     for c in _expression_columns(step["conditions"])}
+                )
+                positions = positions[build_compound_mask(values, step["conditions"], step["expression"])]
+
+            elif kind == "sort":
+                # Stable sorts commute with filters, so wait until row order matters
+                pending_sorts.append(i)
+
+            elif kind == "dedupe":
+                positions = self._flush_sorts(pending_sorts, positions, cache)
+                pending_sorts = []
+                keys = pd.DataFrame(
+                    {c: self._column_at(c, i, positions, cache).to_numpy() for c in step["columns"]}
+                )
+                positions = positions[~keys.duplicated(keep="first").to_numpy()]
+
+        return self._flush_sorts(pending_sorts, positions, cache)
+
+    def _first_positions(self, limit: int, cache: dict) -> np.ndarray:
+        """Run a sort-free plan block by block until limit rows survive."""
+        found = []
+        total = 0
+        for start in range(0, len(self.base), PREVIEW_BLOCK_ROWS):
+            block = np.arange(start, min(start + PREVIEW_BLOCK_ROWS, len(self.base)))
+            kept = self._positions(block, cache)
+            found.append(kept)
+            total += len(kept)
+            if total >= limit:
+                break
+
+        if not found:
+            return np.arange(0)
+        return np.concatenate(found)[:limit]
+
+    def _flush_sorts(self, sort_indices: list, positions: np.ndarray, cache: dict) -> np.ndarray:
+        """Apply deferred sorts, in recorded order, to the surviving rows."""
+        from core.sorting import sort_order, _normalize_keys
+
+        for i in sort_indices:
+            step = self.steps[i]
+            columns, directions = _normalize_keys(step["column"], step["ascending"])
+            keys = pd.DataFrame({c: self._column_at(c, i, positions, cache).to_numpy() for c in columns})
+            order = sort_order(keys, columns, directions)
+            if order is not None:
+                positions = positions[order]
+        return positions
+
+    def _column_at(self, column, step_index: int, positions: np.ndarray, cache: dict) -> pd.Series:
+        """
+        Return a column at the given positions as it looks just before
+        step_index, i.e. with every earlier format on that column applied.
+        Each format's output is kept in cache, so later steps that read
+        the column again (on the same or fewer rows) reuse it.
+        """
+        from core.formatting import _format_series
+
+        last = None
+        for j in range(step_index - 1, -1, -1):
+            step = self.steps[j]
+            if step["kind"] == "format" and column in _step_columns(step):
+                last = j
+                break
+        if last is None:
+            return self.base[column].iloc[positions]
+
+        cached = cache["columns"].get((column, last))
+        if cached is not None:
+            where = cached.index.get_indexer(positions)
+            if (where >= 0).all():
+                return pd.Series(cached.to_numpy()[where], index=self.base.index[positions], name=column)
+
+        step = self.steps[last]
+        values = _format_series(
+            self._column_at(column, last, positions, cache),
+            step["fmt_choice"],
+            self._date_format(column, last, cache),
+        )
+        cache["columns"][(column, last)] = pd.Series(values.to_numpy(), index=positions)
+        return values
+
+    def _date_format(self, column, step_index: int, cache: dict):
+        """
+        Return the date format for the format step at step_index, detected
+        once over the whole column as it looks before that step, so that
+        every block and preview formats dates the same way as the export.
+        """
+        from core.formatting import DETECT, column_date_format
+
+        if self.steps[step_index]["fmt_choice"] not in ("5", "6"):
+            return DETECT
+
+        key = (column, step_index)
+        if key not in cache["dates"]:
+            # Earlier formats only need to run on one row per distinct value
+            codes, _ = pd.factorize(self.base[column])
+            _, first = np.unique(codes[codes >= 0], return_index=True)
+            first = np.flatnonzero(codes >= 0)[first]
+            values = self._column_at(column, step_index, first, {"columns": {}, "dates": cache["dates"]})
+            cache["dates"][key] = column_date_format(values)
+        return cache["dates"][key]
+
+
+def _step_columns(step: dict) -> list:
+    """Return the column(s) of a format step as a list."""
+    return step["column"] if isinstance(step["column"], list) else [step["column"]]
\ No newline at end of file
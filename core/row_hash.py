@@ -0,0 +1,146 @@
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from core.state import get_dataframe, get_data_version
+
+# Row-hash index for the active DataFrame. Each entry is a uint64 array
+# aligned with the rows of the frame it was built for; the index is only
+# trusted while that frame and data_version are still current.
+_frame_ref = None
+_version = None
+_column_hashes = {}   # column -> per-row hash of that column
+_subset_hashes = {}   # tuple of columns -> combined per-row hash
+_duplicated = {}      # (tuple of columns, keep) -> boolean mask
+
+
+def _reset(df=None):
+    global _frame_ref, _version
+    _frame_ref = weakref.ref(df) if df is not None else None
+    _version = get_data_version() if df is not None else None
+    _column_hashes.clear()
+    _subset_hashes.clear()
+    _duplicated.clear()
+
+
+def _is_current(df, version) -> bool:
+    return _frame_ref is not None and _frame_ref() is df and _version == version
+
+
+def _rebind():
+    """Point the index at the active frame and version after a carry."""
+    global _frame_ref, _version
+    _frame_ref = weakref.ref(get_dataframe())
+    _version = get_data_version()
+    _duplicated.clear()
+
+
+def subset_hash(df: pd.DataFrame, columns: list) -> np.ndarray:
+    """
+    Return one uint64 hash per row of df over the given columns.
+    For the active DataFrame the per-column hashes are cached, so only
+    columns that were never hashed (or were reformatted) are hashed again.
+    """
+    cacheable = df is get_dataframe()
+    if cacheable and not _is_current(df, get_data_version()):
+        _reset(df)
+
+    key = tuple(columns)
+    if cacheable and key in _subset_hashes:
+        return _subset_hashes[key]
+
+    arrays = []
+    for col in columns:
+        h = _column_hashes.get(col) if cacheable else None
+        if h is None:
+            values = df[col]
+            if values.dtype.kind == "f":
+                # -0.0 == 0.0 in duplicated(), but their bytes hash differently
+                values = values + 0.0
+            h = pd.util.hash_pandas_object(values, index=False).to_numpy()
+            if cacheable:
+                _column_hashes[col] = h
+        arrays.append(h)
+
+    combined = _combine(arrays)
+    if cacheable:
+        _subset_hashes[key] = combined
+    return combined
+
+
+def duplicated(df: pd.DataFrame, columns: list, keep="first") -> np.ndarray:
+    """
+    Exact equivalent of df.duplicated(subset=columns, keep=keep).
+    Rows whose hash is unique cannot be duplicates; only rows that share
+    a hash are compared on their actual values, so hash collisions never
+    produce a wrong answer.
+    """
+    cacheable = df is get_dataframe() and _is_current(df, get_data_version())
+    key = (tuple(columns), keep)
+    if cacheable and key in _duplicated:
+        return _duplicated[key]
+
+    hashes = subset_hash(df, columns)
+    candidates = np.flatnonzero(pd.Series(hashes).duplicated(keep=False).to_numpy())
+
+    result = np.zeros(len(df), dtype=bool)
+    if len(candidates):
+        result[candidates] = df.iloc[candidates].duplicated(subset=columns, keep=keep).to_numpy()
+
+    if df is get_dataframe():
+        _duplicated[key] = result
+    return result
+
+
+def carry_rows(old_df: pd.DataFrame, old_version: int, mask) -> None:
+    """Carry the index through a filter or dedupe that kept the rows in mask."""
+    if not _is_current(old_df, old_version):
+        return
+
+    mask = np.asarray(mask, dtype=bool)
+    for cache in (_column_hashes, _subset_hashes):
+        for key in cache:
+            cache[key] = cache[key][mask]
+    _rebind()
+
+
+def carry_order(old_df: pd.DataFrame, old_version: int, perm) -> None:
+    """Carry the index through a sort that reordered rows by perm."""
+    if not _is_current(old_df, old_version):
+        return
+
+    for cache in (_column_hashes, _subset_hashes):
+        for key in cache:
+            cache[key] = cache[key][perm]
+    _rebind()
+
+
+def rehash_column(old_df: pd.DataFrame, old_version: int, column) -> None:
+    """
+    Carry the index through a format of one column (or a list of them):
+    only those columns' hashes are dropped, and subsets that include
+    them are recombined lazily.
+    """
+    if not _is_current(old_df, old_version):
+        return
+
+    columns = column if isinstance(column, list) else [column]
+    for col in columns:
+        _column_hashes.pop(col, None)
+    for key in [k for k in _subset_hashes if any(c in k for c in columns)]:
+        del _subset_hashes[key]
+    _rebind()
+
+
+def _combine(arrays: list) -> np.ndarray:
+    """Combine per-column hashes into one hash per row (order-sensitive)."""
+    if len(arrays) == 1:
+        return arrays[0]
+
+    out = np.full(len(arrays[0]), 0x345678, dtype=np.uint64)
+    mult = np.uint64(1000003)
+    for i, h in enumerate(arrays):
+        out = (out ^ h) * mult
+        mult += np.uint64(82520 + 2 * (len(arrays) - i))
+    return out
\ No newline at end of file
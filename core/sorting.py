@@ -1,19 +1,35 @@
+from collections import OrderedDict
+
+import numpy as np
 import pandas as pd
-from core.state import get_dataframe, set_dataframe, push_state
+from core.state import get_dataframe, set_dataframe, push_order_delta, get_chunked_source
+from core.state import get_plan, touch_plan, collect_plan, get_data_version, push_frame_reference
+from core import row_hash
 from utils.menus import show_sort_direction_menu
 from core.audit import log_action
 
+# Sort orders of the active DataFrame, keyed by (data_version, key spec);
+# the least recently used order is dropped above this many entries
+SORT_CACHE_SIZE = 8
+_order_cache = OrderedDict()
+
+
 def apply_sort_flow():
     """
     Full sorting flow:
-    1) Select column
-    2) Select ascending/descending
-    3) Apply sort and update state
+    1) Select one or more columns
+    2) Select ascending/descending for each
+    3) Optionally keep only the first N rows
+    4) Apply sort and update state
 
     Any invalid step -> return to Transform Menu.
     """
     df = get_dataframe()
 
+    if df is None and get_chunked_source() is not None:
+        print("Sorting is not available in streaming mode.")
+        return
+
     if df is None:
         print("No file loaded. Please import a file first.")
         return
@@ -25,59 +41,365 @@ def apply_sort_flow():
     for idx, col in enumerate(df.columns, start=1):
         print(f"{idx}. {col}")
 
-    col_choice = input("Select column number: ").strip()
+    print("\nSelect several columns (comma-separated) to sort by more than one key.")
+    print("Example: 2   or   2,4")
+
+    col_input = input("Select column number(s): ").strip()
 
-    if not col_choice.isdigit():
+    # Parse comma-separated input like "2,4"
+    try:
+        indices = [int(x.strip()) for x in col_input.split(",")]
+    except ValueError:
         print("Invalid choice. Returning.")
         return
 
-    col_index = int(col_choice) - 1
-    if col_index < 0 or col_index >= len(df.columns):
+    if any(idx < 1 or idx > len(df.columns) for idx in indices):
         print("Invalid column selection. Returning.")
         return
 
-    column = df.columns[col_index]
-    print(f"Column selected: {column}")
+    columns = [df.columns[i - 1] for i in indices]
+    if len(set(columns)) != len(columns):
+        print("Each column can only be used once. Returning.")
+        return
+
+    # Step 2 — Sort direction for each key
+    directions = []
+    for column in columns:
+        print(f"Column selected: {column}")
+        direction_choice = show_sort_direction_menu()
+
+        if direction_choice == "0":
+            print("Sort cancelled.")
+            return
+
+        if direction_choice not in ("1", "2"):
+            print("Invalid direction. Returning.")
+            return
 
-    # Step 2 — Sort direction
-    direction_choice = show_sort_direction_menu()
+        directions.append(direction_choice == "1")
 
-    if direction_choice == "0":
-        print("Sort cancelled.")
+    # Step 3 — Optional top-N / bottom-N
+    limit_input = input("Keep only the first N rows? Enter N, or press Enter to sort all rows: ").strip()
+
+    limit = None
+    if limit_input:
+        if not limit_input.isdigit() or int(limit_input) < 1:
+            print("Invalid row count. Returning.")
+            return
+        limit = int(limit_input)
+
+    print(f"Sorting by {_describe_keys(columns, directions)}.")
+
+    # Step 4 — Apply sort
+    if len(columns) == 1:
+        columns, directions = columns[0], directions[0]
+
+    if limit is not None:
+        if get_plan() is not None:
+            # Top-N drops rows, so run any pending steps first
+            collect_plan()
+            df = get_dataframe()
+        _apply_top_n(df, columns, directions, limit)
         return
 
-    if direction_choice not in ("1", "2"):
-        print("Invalid direction. Returning.")
+    if get_plan() is not None:
+        _apply_sort_lazy(get_plan(), columns, directions)
         return
 
-    ascending = (direction_choice == "1")
-    print(f"Sorting in {'ascending' if ascending else 'descending'} order.")
+    _apply_sort(df, columns, directions)
 
-    # Step 3 — Apply sort
-    push_state()  # allow Undo
-    _apply_sort(df, column, ascending)
 
+def _apply_sort(df, column, ascending=True):
+    """
+    Internal helper to sort the DataFrame.
+    column may be a list of columns, with ascending a matching list of
+    directions, for a multi-key sort. Returns True when the sort worked.
+    """
+    columns, directions = _normalize_keys(column, ascending)
+    keys = _describe_keys(columns, directions)
 
-def _apply_sort(df, column, ascending):
-    """Internal helper to sort the DataFrame."""
     try:
-        sorted = df.sort_values(by=column, ascending=ascending)
+        # Sort positions rather than labels so the order can be saved for Undo
+        perm = sort_order(df, columns, directions)
+
+        if perm is None:
+            print("\n=== SORT RESULT ===")
+            print(df.head(10).to_string(index=False))
+            print(f"\nRows total: {len(df)}")
+            print("Data is already in this order; nothing was changed.")
+            log_action(
+                "SORT",
+                details=f"Sorted by {keys} (already in order).",
+                conditions=_conditions(columns, directions),
+                columns=columns,
+                rows_affected=0,
+            )
+            return True
+
+        sorted = df.iloc[perm]
 
         print("\n=== SORT RESULT ===")
         print(sorted.head(10).to_string(index=False))
         print(f"\nRows total: {len(sorted)}")
 
+        version = get_data_version()
+        push_order_delta(perm)  # allow Undo
         set_dataframe(sorted)
+        row_hash.carry_order(df, version, perm)
 
         # Log the sort action
         log_action(
             "SORT",
-            details=f"Sorted by column '{column}' in {'ascending' if ascending else 'descending'} order.",
-            conditions=f"{column} {'ASC' if ascending else 'DESC'}",
-            columns=[column],
+            details=f"Sorted by {keys}.",
+            conditions=_conditions(columns, directions),
+            columns=columns,
             rows_affected=len(sorted),
         )
+        return True
 
     # Catch any errors
     except Exception as e:
-        print(f"Error during sorting: {e}")
\ No newline at end of file
+        print(f"Error during sorting: {e}")
+        return False
+
+
+def _apply_top_n(df, column, ascending, n):
+    """
+    Keep only the first n rows of the sorted order (top-N for a descending
+    sort, bottom-N for an ascending one) without sorting the whole frame.
+    Returns True when it worked.
+    """
+    columns, directions = _normalize_keys(column, ascending)
+    keys = _describe_keys(columns, directions)
+
+    try:
+        positions = top_n_order(df, columns, directions, n)
+        result = df.iloc[positions]
+
+        print(f"\n=== SORT RESULT (FIRST {n}) ===")
+        print(result.head(10).to_string(index=False))
+        print(f"\nRows kept: {len(result)} of {len(df)}")
+
+        push_frame_reference()  # allow Undo; df itself is left untouched
+        set_dataframe(result)
+
+        log_action(
+            "SORT",
+            details=f"Kept the first {n} rows sorted by {keys}.",
+            conditions=f"{_conditions(columns, directions)} LIMIT {n}",
+            columns=columns,
+            rows_affected=len(result),
+        )
+        return True
+
+    except Exception as e:
+        print(f"Error during sorting: {e}")
+        return False
+
+
+def _apply_sort_lazy(plan, column, ascending):
+    """Record a sort in the lazy plan and preview its first rows."""
+    plan.add_step("sort", column=column, ascending=ascending)
+    touch_plan()
+
+    print("\n=== SORT RESULT (LAZY) ===")
+    print(plan.head(10).to_string(index=False))
+    print(f"Steps pending: {len(plan.steps)}")
+
+    columns, directions = _normalize_keys(column, ascending)
+    log_action(
+        "SORT",
+        details=f"Sorted by {_describe_keys(columns, directions)} (lazy).",
+        conditions=_conditions(columns, directions),
+        columns=columns,
+    )
+
+
+def sort_order(df: pd.DataFrame, columns: list, directions: list):
+    """
+    Return the row positions that stably sort df by the given keys
+    (missing values last), or None when df is already in that order.
+    Orders computed for the active DataFrame are cached per data_version,
+    and a single-key sort in the opposite direction of a cached order, or
+    of a column that is already sorted, is derived without sorting again.
+    """
+    cacheable = df is get_dataframe()
+    version = get_data_version()
+    spec = tuple(zip(columns, directions))
+
+    if cacheable and (version, spec) in _order_cache:
+        _order_cache.move_to_end((version, spec))
+        return _order_cache[(version, spec)]
+
+    perm = None
+    if len(columns) == 1:
+        column, ascending = spec[0]
+        series = df[column]
+        increasing, decreasing = _monotonic(series)
+
+        if (ascending and increasing) or (not ascending and decreasing):
+            return None
+
+        flipped = _order_cache.get((version, ((column, not ascending),))) if cacheable else None
+        if flipped is None and (increasing or decreasing):
+            flipped = np.arange(len(df))
+        if flipped is not None:
+            perm = _reverse_order(flipped, series)
+
+    if perm is None:
+        key = df[columns].reset_index(drop=True)
+        if len(columns) == 1:
+            perm = key[columns[0]].sort_values(ascending=directions[0], kind="stable").index.to_numpy()
+        else:
+            # Multi-key sorts are lexicographic and always stable
+            perm = key.sort_values(by=columns, ascending=directions).index.to_numpy()
+
+    if cacheable:
+        _order_cache[(version, spec)] = perm
+        while len(_order_cache) > SORT_CACHE_SIZE:
+            _order_cache.popitem(last=False)
+    return perm
+
+
+def top_n_order(df: pd.DataFrame, columns: list, directions: list, n: int) -> np.ndarray:
+    """
+    Return the positions of the first n rows of sort_order(df, ...) in
+    roughly O(len(df) + k log k): a partial selection on the first key
+    finds the candidate rows, and only those are sorted. Ties are broken
+    by row order exactly as the full stable sort would break them.
+    """
+    candidates = _top_candidates(df[columns[0]], directions[0], n, trim_ties=len(columns) == 1)
+
+    order = sort_order(df.iloc[candidates], columns, directions)
+    if order is not None:
+        candidates = candidates[order]
+    return candidates[:n]
+
+
+def _top_candidates(series: pd.Series, ascending: bool, n: int, trim_ties: bool) -> np.ndarray:
+    """
+    Return, in row order, the positions of every row that can be among
+    the first n of a sort by series. Rows tied with the n-th value are
+    all kept unless trim_ties is set, which keeps only the earliest ones.
+    """
+    valid = series.notna().to_numpy()
+    valid_pos = np.flatnonzero(valid)
+    if n >= len(valid_pos):
+        # Rows with a missing key are needed too, so every row is a candidate
+        return np.arange(len(series))
+
+    key = _numeric_key(series)
+    if key is None:
+        # Text and other objects: a heap picks the n best distinct values,
+        # which rejects almost every value after a single comparison
+        import heapq
+
+        codes, uniques = pd.factorize(series)
+        uniques = np.asarray(uniques, dtype=object)
+        if ascending:
+            kth = heapq.nsmallest(n, uniques)[-1]
+            chosen = uniques <= kth
+        else:
+            kth = heapq.nlargest(n, uniques)[-1]
+            chosen = uniques >= kth
+        return np.flatnonzero(valid & chosen[codes])
+
+    values = key[valid_pos]
+    if not ascending:
+        # ~ keeps integers in range where negating might not
+        values = -values if values.dtype.kind == "f" else ~values
+
+    kth = np.partition(values, n - 1)[n - 1]
+    keep = values <= kth
+    if trim_ties:
+        # Only the earliest rows tied with the n-th value make the cut
+        ties = np.flatnonzero(values == kth)
+        keep[ties[n - int((values < kth).sum()):]] = False
+    return valid_pos[keep]
+
+
+def _numeric_key(series: pd.Series):
+    """
+    Return a numeric array that sorts like series, or None for text and
+    other object columns.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy().astype(np.int64)
+    if not isinstance(series.dtype, np.dtype):
+        return None
+
+    kind = series.dtype.kind
+    if kind == "b":
+        return series.to_numpy().astype(np.int64)
+    if kind in "iuf":
+        return series.to_numpy()
+    if kind in "mM":
+        return series.to_numpy().view(np.int64)
+    return None
+
+
+def _monotonic(series: pd.Series):
+    """
+    Return (is non-decreasing, is non-increasing), False for anything
+    unsortable. Columns with missing values never count as sorted: pandas
+    checks categoricals on their codes, where a missing -1 sorts first,
+    while a sort puts missing values last.
+    """
+    if series.hasnans:
+        return False, False
+    try:
+        return series.is_monotonic_increasing, series.is_monotonic_decreasing
+    except TypeError:
+        return False, False
+
+
+def _reverse_order(perm: np.ndarray, series: pd.Series) -> np.ndarray:
+    """
+    Turn a stable sort order of series into the stable order for the
+    opposite direction: runs of equal values swap places but keep their
+    own row order, and missing values end up last wherever they were.
+    """
+    missing = series.isna().to_numpy()[perm]
+    valid = perm[~missing]
+    n_valid = len(valid)
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        values = series.cat.codes.to_numpy()[valid]
+    else:
+        values = series.to_numpy()[valid]
+
+    # Start and end offset of the run each sorted position belongs to
+    boundaries = np.flatnonzero(values[1:] != values[:-1]) + 1
+    run = np.zeros(n_valid, dtype=np.int64)
+    run[boundaries] = 1
+    run = np.cumsum(run)
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [n_valid]))
+
+    offsets = np.arange(n_valid)
+    out = np.empty_like(valid)
+    out[(n_valid - ends[run]) + (offsets - starts[run])] = valid
+    return np.concatenate((out, perm[missing]))
+
+
+def _normalize_keys(column, ascending):
+    """Return (list of columns, list of directions) for a single or multi-key sort."""
+    columns = list(column) if isinstance(column, (list, tuple)) else [column]
+    if isinstance(ascending, (list, tuple)):
+        directions = [bool(a) for a in ascending]
+    else:
+        directions = [bool(ascending)] * len(columns)
+
+    if len(directions) != len(columns):
+        raise ValueError("Each sort column needs exactly one direction.")
+    return columns, directions
+
+
+def _describe_keys(columns, directions) -> str:
+    return ", then ".join(
+        f"column '{c}' in {'ascending' if a else 'descending'} order" for c, a in zip(columns, directions)
+    )
+
+
+def _conditions(columns, directions) -> str:
+    return ", ".join(f"{c} {'ASC' if a else 'DESC'}" for c, a in zip(columns, directions))
\ No newline at end of file
@@ -0,0 +1,158 @@
+import os
+import sqlite3
+import time
+
+import pandas as pd
+
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+# Rows passed to each executemany call; all batches share one transaction
+SQLITE_BATCH_ROWS = 50_000
+
+# Settings for the exporting connection only
+_BULK_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA cache_size=-65536;",  # 64 MB page cache
+)
+
+# Added only when the export creates the database file. A crash can then
+# lose nothing but the new file, so the rollback journal is kept in
+# memory and nothing waits on fsync. Existing databases keep their own
+# journal and sync settings, since they may hold other tables.
+_NEW_FILE_PRAGMAS = (
+    "PRAGMA journal_mode=MEMORY;",
+    "PRAGMA synchronous=OFF;",
+)
+
+
+def list_tables(path: str) -> list:
+    """Return the names of the user tables in a SQLite database."""
+    conn = _connect_read_only(path)
+    try:
+        rows = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY name;"
+        ).fetchall()
+    finally:
+        conn.close()
+    return [name for (name,) in rows]
+
+
+def read_sqlite(path: str, table: str = None, query: str = None) -> pd.DataFrame:
+    """
+    Read a whole table, or the result of a SELECT query, from a SQLite
+    database. The database is opened read-only. Result column names are
+    checked like a file header (no blanks, no duplicates).
+    """
+    from core.importer import check_raw_header
+
+    if (table is None) == (query is None):
+        raise ValueError("Give either a table name or a query.")
+
+    sql = query if query is not None else f"SELECT * FROM {quote_identifier(table)};"
+
+    conn = _connect_read_only(path)
+    try:
+        cursor = conn.execute(sql)
+        if cursor.description is None:
+            raise ValueError("The query does not return any rows.")
+        header = [d[0] for d in cursor.description]
+        check_raw_header(header)
+        rows = cursor.fetchall()
+    finally:
+        conn.close()
+
+    return pd.DataFrame.from_records(rows, columns=header, coerce_float=True)
+
+
+def write_sqlite(chunks, path: str, table: str, columns, dtypes=None, index_columns=(), replace: bool = True) -> dict:
+    """
+    Load an iterable of DataFrame chunks into table in a SQLite database.
+    Rows are inserted with executemany in batches of SQLITE_BATCH_ROWS
+    inside a single transaction, with bulk-load pragmas (the crash-unsafe
+    ones only when path does not exist yet), and any indexes on
+    index_columns are created only after all rows are in. dtypes
+    (a column -> dtype mapping, e.g. df.dtypes) picks the column types
+    when the table is created. replace=True drops an existing table of
+    the same name; otherwise rows are appended to it.
+    Returns {"rows", "seconds"}.
+    """
+    started = time.perf_counter()
+    columns = list(columns)
+    quoted = [quote_identifier(c) for c in columns]
+    insert_sql = (
+        f"INSERT INTO {quote_identifier(table)} ({', '.join(quoted)}) "
+        f"VALUES ({', '.join('?' for _ in columns)});"
+    )
+
+    new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        for pragma in _BULK_PRAGMAS + (_NEW_FILE_PRAGMAS if new_file else ()):
+            conn.execute(pragma)
+
+        conn.execute("BEGIN;")
+        if replace:
+            conn.execute(f"DROP TABLE IF EXISTS {quote_identifier(table)};")
+        definitions = [f"{q} {_column_type(dtypes, c)}" for q, c in zip(quoted, columns)]
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {quote_identifier(table)} ({', '.join(definitions)});")
+
+        rows = 0
+        for chunk in chunks:
+            for start in range(0, len(chunk), SQLITE_BATCH_ROWS):
+                block = chunk.iloc[start:start + SQLITE_BATCH_ROWS]
+                conn.executemany(insert_sql, _block_rows(block))
+                rows += len(block)
+
+        # Building an index once over the loaded table is far cheaper than
+        # keeping it up to date row by row
+        for col in index_columns:
+            name = quote_identifier(f"idx_{table}_{col}")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {quote_identifier(table)} ({quote_identifier(col)});")
+
+        conn.execute("COMMIT;")
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK;")
+        raise
+    finally:
+        conn.close()
+
+    return {"rows": rows, "seconds": time.perf_counter() - started}
+
+
+def quote_identifier(name) -> str:
+    """Quote a table or column name for use in SQL."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _connect_read_only(path: str):
+    from pathlib import Path
+
+    return sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True)
+
+
+def _column_type(dtypes, column) -> str:
+    """SQLite column type for a pandas dtype (TEXT when unknown)."""
+    if dtypes is None or column not in dtypes:
+        return "TEXT"
+    kind = pd.api.types.pandas_dtype(dtypes[column]).kind
+    if kind in "iub":
+        return "INTEGER"
+    if kind == "f":
+        return "REAL"
+    return "TEXT"
+
+
+def _block_rows(block: pd.DataFrame) -> list:
+    """Rows of a block as tuples of values sqlite3 accepts, with missing values as NULL."""
+    values = {}
+    for col in block.columns:
+        series = block[col]
+        if series.dtype.kind in "mM":
+            # Dates and durations are stored as text, as DataFrame.to_sql does
+            series = series.astype(str)
+            values[col] = series.where(block[col].notna(), None)
+        else:
+            values[col] = series.astype(object).where(series.notna(), None)
+    return list(zip(*(values[col].tolist() for col in block.columns)))
\ No newline at end of file
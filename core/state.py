@@ -1,70 +1,339 @@
 current_df = None
 current_file_path = None
-history_stack = []
+history_stack = []  # undo deltas, see push_rows_delta / push_order_delta / push_column_delta
+history_bytes = 0   # memory held by history_stack
 
-data_version = 0  # increments whenever the DataFrame changes
+HISTORY_MAX_BYTES = 1024 ** 3  # oldest undo steps are dropped above 1 GB
+
+data_version = 0  # changes whenever the DataFrame changes
+_last_version = 0  # versions are never handed out twice, even after Undo
 
 duplicate_highlight_info = None  # stores info for export highlighting
 
+current_source = None  # ChunkedSource when a file is opened in streaming mode
+
+current_plan = None  # LazyPlan over current_df while lazy mode is on
+
 def reset_state():
     """
     Reset all shared state when a new file is imported.
     This clears the current DataFrame, history, version, and highlight info.
     """
     global current_df, current_file_path, history_stack, data_version, duplicate_highlight_info
+    global current_source, history_bytes, current_plan
     current_df = None
     current_file_path = None
     history_stack = []
+    history_bytes = 0
     data_version = 0
     duplicate_highlight_info = None
+    current_source = None
+    current_plan = None
 
 
 def set_dataframe(df, path=None):
     """
     Set the active DataFrame and optionally update the file path.
-    Increments data_version because the data has changed.
+    Gives data_version a new value because the data has changed.
     """
     global current_df, current_file_path, data_version
     current_df = df
     if path:
         current_file_path = path
-    data_version += 1
+    data_version = _next_version()
 
 
 def get_dataframe():
     return current_df
 
 
+def set_chunked_source(source, path=None):
+    """
+    Set the active dataset to a chunked (streaming) source instead of an
+    in-memory DataFrame. Gives data_version a new value because the data has changed.
+    """
+    global current_df, current_source, current_file_path, data_version
+    current_df = None
+    current_source = source
+    if path:
+        current_file_path = path
+    data_version = _next_version()
+
+
+def get_chunked_source():
+    """Return the active chunked source, or None when working in memory."""
+    return current_source
+
+
+def has_data():
+    """Return True if either a DataFrame or a chunked source is loaded."""
+    return current_df is not None or current_source is not None
+
+
+def enable_lazy_mode():
+    """Start recording transforms into a LazyPlan over the current DataFrame."""
+    global current_plan
+    if current_df is not None and current_plan is None:
+        from core.plan import LazyPlan
+        current_plan = LazyPlan(current_df)
+
+
+def disable_lazy_mode():
+    """Run any recorded steps and go back to applying transforms immediately."""
+    global current_plan
+    collect_plan()
+    current_plan = None
+
+
+def get_plan():
+    """Return the active LazyPlan, or None when lazy mode is off."""
+    return current_plan
+
+
+def touch_plan():
+    """Mark the data as changed after a step is added to the plan."""
+    global data_version
+    data_version = _next_version()
+
+
+def collect_plan():
+    """
+    Execute the recorded plan and make its result the current DataFrame.
+    The whole plan becomes a single Undo step. Does nothing when lazy
+    mode is off or no steps are recorded.
+    """
+    global current_df, data_version
+    if current_plan is None or not current_plan.steps:
+        return
+
+    result = current_plan.execute()
+
+    # The plan never modifies its base, so it can be kept for Undo as is
+    _push_history({"kind": "snapshot", "df": current_plan.base}, _frame_bytes(current_plan.base))
+
+    current_df = result
+    current_plan.base = result
+    current_plan.steps = []
+    data_version = _next_version()
+
+
 def get_data_version():
     """Return the current version number of the active DataFrame."""
     return data_version
 
 
+def _next_version():
+    """
+    Return a version number that has never been used before.
+    Undo restores older numbers, so a plain counter could hand the same
+    number to two different DataFrames; caches keyed on data_version
+    rely on it naming exactly one state of the data.
+    """
+    global _last_version
+    _last_version += 1
+    return _last_version
+
+
 def push_state():
     """
-    Save a copy of the current DataFrame and its version for Undo.
+    Save a full copy of the current DataFrame and its version for Undo.
+    Prefer the delta functions below; this is the fallback for changes
+    that do not fit any of them.
+    """
+    if current_df is not None:
+        snapshot = current_df.copy()
+        _push_history({"kind": "snapshot", "df": snapshot}, _frame_bytes(snapshot))
+
+
+def push_frame_reference():
+    """
+    Keep the current DataFrame itself, without copying it, for Undo.
+    Only for changes that build a new DataFrame and never modify the
+    current one in place.
     """
     if current_df is not None:
-        history_stack.append((current_df.copy(), data_version))
+        _push_history({"kind": "snapshot", "df": current_df}, _frame_bytes(current_df))
+
+
+def push_rows_delta(mask):
+    """
+    Record a filter or dedupe on the current DataFrame for Undo.
+    mask marks the rows that are kept. When most rows are kept, only the
+    removed rows are copied, so undo can interleave them back into their
+    original positions. When most are removed that copy would be nearly
+    the whole frame, so the current DataFrame itself is kept instead; the
+    caller must replace it and never modify it in place.
+    """
+    if current_df is None:
+        return
+    import numpy as np
+
+    mask = np.asarray(mask, dtype=bool)
+    if 2 * np.count_nonzero(mask) < len(mask):
+        push_frame_reference()
+        return
+
+    removed = current_df[~mask]
+    _push_history(
+        {"kind": "rows", "mask": mask, "removed": removed},
+        mask.nbytes + _frame_bytes(removed),
+    )
+
+
+def push_order_delta(perm):
+    """
+    Record a sort for Undo. perm holds the positions of the current
+    rows in their new order, i.e. the result is current_df.iloc[perm].
+    """
+    if current_df is None:
+        return
+    import numpy as np
+
+    perm = np.asarray(perm)
+    _push_history({"kind": "order", "perm": perm}, perm.nbytes)
+
+
+def push_column_delta(column):
+    """
+    Record the current contents of one column, or of a list of columns,
+    before they are rewritten. A list is still a single Undo step.
+    """
+    if current_df is None:
+        return
+
+    values = current_df[column].copy()
+    nbytes = values.memory_usage(deep=True, index=False)
+    _push_history(
+        {"kind": "column", "column": column, "values": values},
+        int(nbytes.sum() if isinstance(column, list) else nbytes),
+    )
+
+
+def _push_history(entry, nbytes):
+    """Add an undo entry and drop the oldest entries above HISTORY_MAX_BYTES."""
+    global history_bytes
+
+    entry["version"] = data_version
+    entry["nbytes"] = nbytes
+    history_stack.append(entry)
+    history_bytes += nbytes
+    _trim_history()
+
+
+def _trim_history():
+    """Drop the oldest undo entries above HISTORY_MAX_BYTES and say so."""
+    global history_bytes
+
+    dropped = 0
+    while history_stack and history_bytes > HISTORY_MAX_BYTES:
+        oldest = history_stack.pop(0)
+        history_bytes -= oldest["nbytes"]
+        dropped += 1
+
+    if dropped:
+        print(f"Undo history limit reached; {dropped} oldest step(s) can no longer be undone.")
+
+
+def _frame_bytes(df):
+    from core.compaction import memory_usage_bytes
+    return memory_usage_bytes(df)
+
+
+def set_history_limit(max_bytes):
+    """Change the memory cap on undo history and trim it if needed."""
+    global HISTORY_MAX_BYTES
+    HISTORY_MAX_BYTES = max_bytes
+    _trim_history()
+
+
+def get_history_usage():
+    """Return (number of undo steps, bytes held by undo history)."""
+    return len(history_stack), history_bytes
+
+
+def print_history_usage():
+    """Print how much memory the undo history is using."""
+    steps, nbytes = get_history_usage()
+    print(
+        f"Undo history: {steps} step(s), {nbytes / 1024 ** 2:,.1f} MB "
+        f"(limit {HISTORY_MAX_BYTES / 1024 ** 2:,.0f} MB)"
+    )
 
 
 def undo_last():
     """
-    Restore the most recent DataFrame and its version.
+    Rebuild the previous DataFrame from the most recent undo delta
+    and restore its version.
     Does NOT automatically clear highlight info, but will
     cause it to be treated as stale if versions don't match.
     """
-    global current_df, data_version
+    global current_df, data_version, history_bytes
+
+    # Streaming mode keeps its history as the source's recorded steps
+    if current_source is not None:
+        if not current_source.steps:
+            print("No previous action to undo.")
+            return False
+        current_source.pop_step()
+        data_version = _next_version()
+        print("Last action undone.")
+        return True
+
+    # Lazy mode undoes recorded steps before touching the history
+    if current_plan is not None and current_plan.steps:
+        current_plan.pop_step()
+        data_version = _next_version()
+        print("Last action undone.")
+        return True
+
     if not history_stack:
         print("No previous action to undo.")
         return False
-    prev_df, prev_version = history_stack.pop()
-    current_df = prev_df
-    data_version = prev_version
+
+    entry = history_stack.pop()
+    history_bytes -= entry["nbytes"]
+    current_df = _rebuild(current_df, entry)
+    data_version = entry["version"]
+    if current_plan is not None:
+        current_plan.base = current_df
     print("Last action undone.")
+    print_history_usage()
     return True
 
 
+def _rebuild(df, entry):
+    """Return the DataFrame as it was before the change described by entry."""
+    import numpy as np
+    import pandas as pd
+
+    kind = entry["kind"]
+
+    if kind == "snapshot":
+        return entry["df"]
+
+    if kind == "rows":
+        mask = entry["mask"]
+        # combined row j came from position source_pos[j] of the old frame
+        source_pos = np.concatenate([np.flatnonzero(mask), np.flatnonzero(~mask)])
+        order = np.empty(len(mask), dtype=np.intp)
+        order[source_pos] = np.arange(len(mask))
+        combined = pd.concat([df, entry["removed"]])
+        return combined.iloc[order]
+
+    if kind == "order":
+        perm = entry["perm"]
+        inverse = np.empty(len(perm), dtype=np.intp)
+        inverse[perm] = np.arange(len(perm))
+        return df.iloc[inverse]
+
+    if kind == "column":
+        restored = df.copy(deep=False)
+        restored[entry["column"]] = entry["values"]
+        return restored
+
+    raise ValueError(f"Unknown undo entry: {kind}")
+
+
 def set_duplicate_highlight(info):
     """
     Store or clear duplicate highlight configuration.
@@ -0,0 +1,180 @@
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from core.state import get_dataframe, get_data_version
+
+# Lowercased text views and trigram indexes of the active DataFrame, kept
+# for the last few data versions so that searching, undoing and searching
+# again reuses them. Each entry is only trusted for the frame it was built on.
+TEXT_CACHE_VERSIONS = 3
+
+# Strings longer than this are not put in a trigram index; they are
+# always checked directly instead
+TRIGRAM_MAX_CHARS = 64
+
+# Offer a trigram index for columns with at least this many rows
+TRIGRAM_MIN_ROWS = 100_000
+
+_entries = OrderedDict()  # data_version -> {"ref", "lowered", "trigrams", "searches"}
+
+
+def _entry(df, create=True):
+    """Return the cache entry of df if it is the active DataFrame."""
+    if df is not get_dataframe():
+        return None
+
+    version = get_data_version()
+    entry = _entries.get(version)
+    if entry is not None and entry["ref"]() is not df:
+        entry = None
+        del _entries[version]
+
+    if entry is None:
+        if not create:
+            return None
+        entry = {"ref": weakref.ref(df), "lowered": {}, "trigrams": {}, "searches": {}}
+        _entries[version] = entry
+        while len(_entries) > TEXT_CACHE_VERSIONS:
+            _entries.popitem(last=False)
+
+    _entries.move_to_end(version)
+    return entry
+
+
+def lowered_column(df: pd.DataFrame, column) -> np.ndarray:
+    """
+    Return the column as lowercased strings (missing values become
+    "nan", as with astype(str)). Cached per column and data_version for
+    the active DataFrame.
+    """
+    entry = _entry(df)
+    if entry is not None and column in entry["lowered"]:
+        return entry["lowered"][column]
+
+    lowered = df[column].astype(str).str.lower().to_numpy(dtype=object)
+    if entry is not None:
+        entry["lowered"][column] = lowered
+    return lowered
+
+
+def contains_mask(df: pd.DataFrame, column, value: str, positions=None) -> np.ndarray:
+    """
+    Case-insensitive "contains" on df[column], restricted to the rows at
+    positions when given. Matches value literally unless it is written
+    as /pattern/, which is treated as a regular expression. Uses the
+    column's trigram index when one has been built.
+    """
+    entry = _entry(df)
+    if entry is not None:
+        entry["searches"][column] = entry["searches"].get(column, 0) + 1
+
+    lowered = lowered_column(df, column)
+    if positions is not None:
+        lowered = lowered[positions]
+
+    pattern, regex = literal_or_regex(value)
+    index = entry["trigrams"].get(column) if entry is not None else None
+
+    if index is not None and not regex and len(pattern) >= 3:
+        mask = _indexed_contains(index, lowered_column(df, column), pattern)
+        return mask if positions is None else mask[positions]
+
+    return pd.Series(lowered).str.contains(pattern, regex=regex, na=False).to_numpy()
+
+
+def literal_or_regex(value: str):
+    """Return (lowercased pattern, is_regex); only /pattern/ is a regex."""
+    value = value.lower()
+    if len(value) > 2 and value.startswith("/") and value.endswith("/"):
+        return value[1:-1], True
+    return value, False
+
+
+def search_count(df: pd.DataFrame, column) -> int:
+    """How many times the column was searched at the current data_version."""
+    entry = _entry(df, create=False)
+    return entry["searches"].get(column, 0) if entry is not None else 0
+
+
+def has_trigram_index(df: pd.DataFrame, column) -> bool:
+    entry = _entry(df, create=False)
+    return entry is not None and column in entry["trigrams"]
+
+
+def build_trigram_index(df: pd.DataFrame, column) -> None:
+    """
+    Build a trigram index on a text column of the active DataFrame.
+    Every three-character substring maps to the sorted row positions that
+    contain it, so a search only checks rows that have all of the search
+    term's trigrams.
+    """
+    entry = _entry(df)
+    if entry is None:
+        return
+
+    lowered = lowered_column(df, column)
+    lengths = np.fromiter(map(len, lowered), dtype=np.int64, count=len(lowered))
+    indexed = np.flatnonzero(lengths <= TRIGRAM_MAX_CHARS)
+    unindexed = np.flatnonzero(lengths > TRIGRAM_MAX_CHARS)
+
+    width = int(lengths[indexed].max()) if len(indexed) else 0
+    keys, rows = [], []
+    if width >= 3:
+        # One row of code points per string; 21 bits hold any code point
+        chars = np.array(lowered[indexed], dtype=f"<U{width}").view(np.uint32)
+        chars = chars.reshape(len(indexed), width).astype(np.uint64)
+        indexed_lengths = lengths[indexed]
+        for j in range(width - 2):
+            ok = indexed_lengths >= j + 3
+            keys.append((chars[ok, j] << np.uint64(42)) | (chars[ok, j + 1] << np.uint64(21)) | chars[ok, j + 2])
+            rows.append(indexed[ok])
+
+    keys = np.concatenate(keys) if keys else np.zeros(0, dtype=np.uint64)
+    rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+
+    order = np.lexsort((rows, keys))
+    keys, rows = keys[order], rows[order]
+    if len(keys):
+        # A row listed once per trigram, however often it repeats
+        first = np.concatenate(([True], (keys[1:] != keys[:-1]) | (rows[1:] != rows[:-1])))
+        keys, rows = keys[first], rows[first]
+
+    unique_keys, starts = np.unique(keys, return_index=True)
+    entry["trigrams"][column] = {
+        "keys": unique_keys,
+        "starts": np.append(starts, len(keys)),
+        "rows": rows,
+        "unindexed": unindexed,
+    }
+
+
+def _trigram_keys(text: str) -> list:
+    points = [ord(c) for c in text]
+    return sorted({(points[i] << 42) | (points[i + 1] << 21) | points[i + 2] for i in range(len(points) - 2)})
+
+
+def _indexed_contains(index, lowered: np.ndarray, pattern: str) -> np.ndarray:
+    """Answer a literal substring search from the trigram index."""
+    postings = []
+    for key in _trigram_keys(pattern):
+        i = np.searchsorted(index["keys"], np.uint64(key))
+        if i == len(index["keys"]) or index["keys"][i] != key:
+            postings = [np.zeros(0, dtype=np.int64)]
+            break
+        postings.append(index["rows"][index["starts"][i]:index["starts"][i + 1]])
+
+    # Intersect the shortest posting lists first
+    postings.sort(key=len)
+    candidates = postings[0]
+    for rows in postings[1:]:
+        if len(candidates) == 0:
+            break
+        candidates = np.intersect1d(candidates, rows, assume_unique=True)
+
+    candidates = np.union1d(candidates, index["unindexed"])
+    mask = np.zeros(len(lowered), dtype=bool)
+    mask[candidates] = [pattern in text for text in lowered[candidates]]
+    return mask
\ No newline at end of file
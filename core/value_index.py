@@ -0,0 +1,104 @@
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from core.state import get_dataframe, get_data_version
+
+# Value -> row positions indexes of the active DataFrame, kept for the last
+# few data versions so that filtering, undoing and filtering again reuses
+# them. Each entry is only trusted for the frame it was built on.
+VALUE_INDEX_VERSIONS = 3
+
+# Lookups of up to this many values mark their rows directly; longer IN
+# lists are answered with one pass over the row codes instead
+DIRECT_LOOKUP_VALUES = 16
+
+_entries = OrderedDict()  # data_version -> {"ref", "indexes", "seen"}
+
+
+def split_values(value: str) -> list:
+    """Split the comma-separated value list of an IN filter."""
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def equals_mask(df: pd.DataFrame, column, values: list) -> np.ndarray:
+    """
+    Return the rows of df[column] equal to any of values, with the same
+    meaning as the equals filter: numeric columns compare numbers, other
+    columns compare the text form of each value. Raises ValueError for a
+    non-numeric value on a numeric column.
+    """
+    series = df[column]
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # The category codes already are an index: pick matching categories,
+        # then broadcast; the extra last slot answers for missing values (-1)
+        categories = pd.Index(series.cat.categories.astype(str))
+        chosen = np.append(categories.isin(values), "nan" in values)
+        return chosen[series.cat.codes.to_numpy()]
+
+    numeric = series.dtype.kind in {"i", "f"}
+    if numeric:
+        # NaN never equals anything, as with ==
+        values = [x for x in (float(v) for v in values) if x == x]
+
+    entry = _entry(df)
+    if entry is not None and column not in entry["indexes"] and column not in entry["seen"]:
+        # Build the index only once a column is filtered on a second time
+        entry["seen"].add(column)
+        keys = series if numeric else series.astype(str)
+        return keys.isin(values).to_numpy()
+
+    index = _get_index(df, column, entry)
+    wanted = index["lookup"].get_indexer(pd.Index(values).unique())
+    wanted = wanted[wanted >= 0]
+
+    if len(wanted) <= DIRECT_LOOKUP_VALUES:
+        mask = np.zeros(len(series), dtype=bool)
+        for code in wanted:
+            mask[index["order"][index["starts"][code]:index["starts"][code + 1]]] = True
+        return mask
+
+    chosen = np.zeros(len(index["lookup"]) + 1, dtype=bool)
+    chosen[wanted] = True
+    return chosen[index["codes"]]
+
+
+def _get_index(df, column, entry) -> dict:
+    """Return the value index of df[column], building it if needed."""
+    if entry is not None and column in entry["indexes"]:
+        return entry["indexes"][column]
+
+    series = df[column]
+    keys = series if series.dtype.kind in {"i", "f"} else series.astype(str)
+    codes, uniques = pd.factorize(keys)
+
+    # Row positions grouped by code; rows of code c are order[starts[c]:starts[c + 1]]
+    order = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    skipped = len(codes) - int(counts.sum())  # missing numbers sort first as -1
+    starts = np.concatenate(([0], np.cumsum(counts))) + skipped
+
+    index = {"codes": codes, "lookup": pd.Index(uniques), "order": order, "starts": starts}
+    if entry is not None:
+        entry["indexes"][column] = index
+    return index
+
+
+def _entry(df):
+    """Return the cache entry of df if it is the active DataFrame."""
+    if df is not get_dataframe():
+        return None
+
+    version = get_data_version()
+    entry = _entries.get(version)
+    if entry is None or entry["ref"]() is not df:
+        entry = {"ref": weakref.ref(df), "indexes": {}, "seen": set()}
+        _entries[version] = entry
+        while len(_entries) > VALUE_INDEX_VERSIONS:
+            _entries.popitem(last=False)
+
+    _entries.move_to_end(version)
+    return entry
\ No newline at end of file
@@ -0,0 +1,151 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+# Worker processes parsing sheets at the same time. openpyxl parsing is
+# pure Python and holds the GIL, so sheets are spread over processes
+XLSX_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+_KIND_OF = {
+    int: "int",
+    float: "float",
+    bool: "bool",
+    str: "str",
+    datetime: "datetime",
+    date: "datetime",
+}
+
+
+def read_xlsx(path: str, sheet_name=None) -> pd.DataFrame:
+    """
+    Read an XLSX sheet in one streaming pass with openpyxl's read-only
+    row iterator. The header row is validated and the rows are buffered
+    while the sheet is streamed, then each column buffer is typed in
+    memory, so the workbook is opened and parsed exactly once.
+    Uses the active sheet unless sheet_name is given.
+    """
+    import openpyxl
+    from core.importer import check_raw_header
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = wb[sheet_name] if sheet_name is not None else wb.active
+        rows = sheet.iter_rows(values_only=True)
+
+        raw_header = next(rows, None)
+        if raw_header is None:
+            raise ValueError("Invalid file: the sheet is empty.")
+
+        header = list(raw_header)
+        check_raw_header(header)
+
+        width = len(header)
+        body = []
+        used = 0
+
+        for row in rows:
+            if len(row) != width:
+                row = (tuple(row) + (None,) * width)[:width]
+            body.append(row)
+            if any(v is not None for v in row):
+                used = len(body)
+    finally:
+        wb.close()
+
+    # Blank rows inside the data stay as missing rows and trailing ones
+    # are dropped, the same way read_excel does
+    del body[used:]
+
+    # Transpose row tuples into column buffers and type each one
+    buffers = list(zip(*body)) if body else [()] * width
+    df = pd.DataFrame({i: _build_column(buffers[i]) for i in range(width)})
+    df.columns = header
+    return df
+
+
+def sheet_names(path: str) -> list:
+    """Return the sheet names of an XLSX workbook, in workbook order."""
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=True)
+    try:
+        return list(wb.sheetnames)
+    finally:
+        wb.close()
+
+
+def read_xlsx_sheets(path: str, sheets: list, source_column: str = None) -> pd.DataFrame:
+    """
+    Read several sheets of a workbook and stack them into one DataFrame.
+    Sheets are parsed concurrently in worker processes. Every sheet must
+    have the same column names as the first one (in any order). When
+    source_column is given, a column of that name records the sheet
+    each row came from.
+    """
+    workers = min(len(sheets), XLSX_MAX_WORKERS)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            frames = list(pool.map(read_xlsx, [path] * len(sheets), sheets))
+    else:
+        frames = [read_xlsx(path, name) for name in sheets]
+
+    columns = list(frames[0].columns)
+    for name, frame in zip(sheets, frames):
+        if set(frame.columns) != set(columns):
+            raise ValueError(
+                f"Sheet '{name}' has different columns from sheet '{sheets[0]}': {list(frame.columns)}"
+            )
+
+    if source_column is not None:
+        if source_column in columns:
+            raise ValueError(f"Column '{source_column}' already exists; choose another name for the sheet column.")
+        frames = [frame.assign(**{source_column: name}) for name, frame in zip(sheets, frames)]
+        columns.append(source_column)
+
+    # One concatenation at the end, aligned on the first sheet's column order
+    return pd.concat([frame[columns] for frame in frames], ignore_index=True)
+
+
+def _infer_kind(values) -> str:
+    """Infer a column kind from the Python types present in its buffer."""
+    kinds = {_KIND_OF.get(t, "object") for t in set(map(type, values)) if t is not type(None)}
+
+    if not kinds:
+        return "object"
+    if len(kinds) == 1:
+        return kinds.pop()
+    if kinds <= {"bool", "int", "float"}:
+        # Booleans count as numbers next to numbers, as in read_excel
+        return "float" if "float" in kinds else "int"
+    return "object"
+
+
+def _build_column(values):
+    """Turn a column buffer into a typed array."""
+    kind = _infer_kind(values)
+    has_nulls = None in values
+
+    if kind == "float" and not has_nulls:
+        # Whole-number floats come back as ints, matching read_excel,
+        # unless a value is outside the int64 range
+        arr = np.array(values, dtype=np.float64)
+        if np.all(np.mod(arr, 1) == 0) and np.all((arr >= -2.0 ** 63) & (arr < 2.0 ** 63)):
+            return arr.astype(np.int64)
+        return arr
+    if kind == "int" and not has_nulls:
+        return np.array(values, dtype=np.int64)
+    if kind in ("int", "float"):
+        return np.array(values, dtype=np.float64)
+    if kind == "bool":
+        return np.array(values, dtype=bool if not has_nulls else np.float64)
+    if kind == "datetime":
+        return pd.to_datetime(values)
+
+    out = np.empty(len(values), dtype=object)
+    out[:] = list(values)
+    if has_nulls:
+        out[pd.isna(out)] = np.nan
+    return out
\ No newline at end of file
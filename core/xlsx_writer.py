@@ -0,0 +1,130 @@
+import re
+from datetime import date, datetime, time
+
+import numpy as np
+import pandas as pd
+
+# Rows converted to Python values at a time while streaming a sheet out
+WRITE_BLOCK_ROWS = 10_000
+
+# Excel's sheet size limit, header row included
+MAX_SHEET_ROWS = 1_048_576
+
+# A split export refuses columns with more distinct values than this
+MAX_SPLIT_SHEETS = 250
+
+HIGHLIGHT_COLOR = "FFFF00"
+
+
+def write_xlsx(df: pd.DataFrame, path: str, highlight=None, split_by=None) -> int:
+    """
+    Write df to an XLSX file in one streaming pass with openpyxl's
+    write-only workbook. Rows are converted and appended a block at a
+    time, so memory stays flat and the file is written exactly once.
+
+    highlight is an optional (row_mask, columns) pair: a boolean array
+    with one entry per row, and the column names to fill on those rows.
+    The fill is applied while the rows are written.
+
+    split_by names a column whose values each get their own sheet, in
+    order of first appearance. Returns the number of sheets written.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+
+    if split_by is None:
+        _write_sheet(wb, df, "Sheet1", highlight)
+        wb.save(path)
+        return 1
+
+    # Codes in order of first appearance; missing values form their own group
+    codes, values = pd.factorize(df[split_by], use_na_sentinel=False)
+    if len(values) > MAX_SPLIT_SHEETS:
+        raise ValueError(f"'{split_by}' has {len(values):,} distinct values; at most {MAX_SPLIT_SHEETS} sheets can be written.")
+
+    order = np.argsort(codes, kind="stable")
+    groups = np.split(order, np.cumsum(np.bincount(codes, minlength=len(values)))[:-1])
+
+    used = set()
+    for value, positions in zip(values, groups):
+        group_highlight = None
+        if highlight is not None:
+            group_highlight = (highlight[0][positions], highlight[1])
+        _write_sheet(wb, df.iloc[positions], _sheet_title(value, used), group_highlight)
+
+    wb.save(path)
+    return len(values)
+
+
+def _sheet_title(value, used: set) -> str:
+    """A valid, unique Excel sheet name for a split value."""
+    title = "(blank)" if pd.isna(value) else str(value)
+    title = re.sub(r"[\\/*?:\[\]]", "_", title).strip("'")[:31] or "(blank)"
+
+    candidate, n = title, 2
+    while candidate.lower() in used:
+        suffix = f" ({n})"
+        candidate, n = title[:31 - len(suffix)] + suffix, n + 1
+    used.add(candidate.lower())
+    return candidate
+
+
+def _header_value(name):
+    """
+    A column name as a header cell value. Numbers and dates stay native
+    cell values like DataFrame.to_excel writes them; anything else that
+    is not text is written as its str().
+    """
+    if isinstance(name, np.generic):
+        name = name.item()
+    if isinstance(name, (str, bool, int, float, date, datetime, time)):
+        return name
+    return str(name)
+
+
+def _write_sheet(wb, df: pd.DataFrame, title: str, highlight=None) -> None:
+    """Append df as a new sheet of a write-only workbook."""
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+    if len(df) + 1 > MAX_SHEET_ROWS:
+        raise ValueError(f"{len(df):,} rows do not fit in one sheet (Excel allows {MAX_SHEET_ROWS - 1:,}).")
+
+    ws = wb.create_sheet(title)
+
+    # Header cells styled the way DataFrame.to_excel styles them
+    thin = Side(style="thin")
+    header_font = Font(bold=True)
+    header_border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    header_alignment = Alignment(horizontal="center", vertical="top")
+    header = []
+    for name in df.columns:
+        cell = WriteOnlyCell(ws, value=_header_value(name))
+        cell.font = header_font
+        cell.border = header_border
+        cell.alignment = header_alignment
+        header.append(cell)
+    ws.append(header)
+
+    if highlight is not None:
+        row_mask, columns = highlight
+        fill = PatternFill(start_color=HIGHLIGHT_COLOR, end_color=HIGHLIGHT_COLOR, fill_type="solid")
+        wanted = set(columns)
+        fill_positions = [i for i, name in enumerate(df.columns) if name in wanted]
+    else:
+        row_mask = np.zeros(len(df), dtype=bool)
+
+    for start in range(0, len(df), WRITE_BLOCK_ROWS):
+        block = df.iloc[start:start + WRITE_BLOCK_ROWS]
+        # Missing values become empty cells
+        rows = block.astype(object).where(block.notna(), None).to_numpy().tolist()
+        marked = row_mask[start:start + WRITE_BLOCK_ROWS]
+
+        for row, is_marked in zip(rows, marked.tolist()):
+            if is_marked:
+                for i in fill_positions:
+                    cell = WriteOnlyCell(ws, value=row[i])
+                    cell.fill = fill
+                    row[i] = cell
+            ws.append(row)
\ No newline at end of file
@@ -1,16 +1,79 @@
+import time
+_START = time.perf_counter()  # taken before any other import for --startup-profile
 
-
+import argparse
 import sys
-from core.audit import log_action
+from core.audit import log_action, flush_audit_log, close_audit_log
 from utils.menus import show_main_menu
 from utils.validation import require_menu_choice
 
+# Modules that should only load when a feature first needs them
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl", "sqlite3")
+
+
+def print_startup_profile():
+    """Report time from startup to the first menu and which heavy modules loaded."""
+    elapsed = (time.perf_counter() - _START) * 1000
+    print(f"\nStartup time: {elapsed:.1f} ms (from main.py import to first menu)")
+    for name in HEAVY_MODULES:
+        print(f"   {name:<9} {'loaded' if name in sys.modules else 'not loaded'}")
+    print("Per-module breakdown: python -X importtime main.py")
+
+
+def positive_megabytes(text):
+    """argparse type for a size in MB greater than zero."""
+    try:
+        value = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: '{text}'")
+    if value <= 0:
+        raise argparse.ArgumentTypeError("size must be greater than zero")
+    return value
+
+
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Clean and transform spreadsheet data.")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print startup time when the first menu appears")
+    parser.add_argument("--recipe", metavar="FILE",
+                        help="run a JSON recipe without prompts, then exit")
+    parser.add_argument("--verbose", action="store_true",
+                        help="with --recipe, show the usual previews for every step")
+    parser.add_argument("--history-mb", type=positive_megabytes, metavar="MB",
+                        help="memory cap on undo history in MB (default 1024)")
+    parser.add_argument("inputs", nargs="*",
+                        help="with --recipe, input files or globs (replace the recipe's inputs)")
+    return parser.parse_args(argv)
+
+
+def run_batch(args):
+    """Run a recipe headlessly and exit with a non-zero status if any file failed."""
+    from core.batch import run_recipe
+
+    failures = run_recipe(args.recipe, inputs=args.inputs, verbose=args.verbose)
+    close_audit_log()
+    sys.exit(1 if failures else 0)
+
+
 def main():
     """Main application loop that accepts and routes user actions."""
-    valid = {"0", "1", "2", "3", "4", "5", "6"}
+    args = parse_args()
+    if args.history_mb:
+        from core.state import set_history_limit
+        set_history_limit(int(args.history_mb * 1024 ** 2))
+    if args.recipe:
+        run_batch(args)
+
+    valid = {"0", "1", "2", "3", "4", "5", "6", "7"}
+    startup_profile = args.startup_profile
 
     while True:
         show_main_menu()
+        if startup_profile:
+            print_startup_profile()
+            startup_profile = False
+
         choice = require_menu_choice("Enter choice: ", valid)
 
         # Import Action
@@ -38,6 +101,10 @@ def main():
                     from core.formatting import apply_format_flow
                     apply_format_flow()
 
+                elif t_choice == "4":
+                    from core.plan import toggle_lazy_mode
+                    toggle_lazy_mode()
+
                 elif t_choice == "0":
                     break
 
@@ -72,11 +139,19 @@ def main():
                     "UNDO",
                     details="Reverted the most recent data transformation."
                 )
+                flush_audit_log()
+
+
+        # Import Cache Action
+        elif choice == "7":
+            from core.cache import cache_flow
+            cache_flow()
 
 
         # Exit Action
         elif choice == "0":
             print("Goodbye!")
+            close_audit_log()
             sys.exit(0)
 
 if __name__ == "__main__":
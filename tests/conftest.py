@@ -0,0 +1,17 @@
+import pytest
+
+from core import audit, cache
+from core.state import reset_state
+
+
+@pytest.fixture(autouse=True)
+def _isolated_app(tmp_path, monkeypatch):
+    """Keep the audit database and import cache of each test in tmp_path, and start from empty state."""
+    audit.close_audit_log()
+    monkeypatch.setattr(audit, "DB_PATH", str(tmp_path / "audit.db"))
+    monkeypatch.setattr(audit, "_db_ready", False)
+    monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path / "cache"))
+    reset_state()
+    yield
+    audit.close_audit_log()
+    reset_state()
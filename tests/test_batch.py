@@ -0,0 +1,95 @@
+import json
+
+import pandas as pd
+
+from core.batch import run_recipe
+from core.sqlite_io import list_tables, read_sqlite
+
+
+def _recipe(tmp_path, steps, inputs=None):
+    path = tmp_path / "recipe.json"
+    path.write_text(json.dumps({"inputs": inputs or [], "steps": steps}), encoding="utf-8")
+    return str(path)
+
+
+def _data(tmp_path, name="data.csv"):
+    df = pd.DataFrame({
+        "region": ["West", "East", "West", "North", "East", "West"],
+        "revenue": [10, 250, 300, 40, 120, 10],
+    })
+    path = tmp_path / name
+    df.to_csv(path, index=False)
+    return str(path), df
+
+
+def test_recipe_matches_pandas(tmp_path):
+    path, df = _data(tmp_path)
+    out = tmp_path / "out" / "{stem}_clean.csv"
+    (tmp_path / "out").mkdir()
+    recipe = _recipe(tmp_path, [
+        {"op": "filter", "conditions": [["revenue", "greater_than", 100], ["region", "equals", "East"]],
+         "expression": "1 OR NOT 2"},
+        {"op": "dedupe", "columns": ["region", "revenue"]},
+        {"op": "sort", "column": ["region", "revenue"], "ascending": [True, False]},
+        {"op": "export", "path": str(out)},
+    ])
+
+    assert run_recipe(recipe, [path]) == 0
+
+    expected = df[(df["revenue"] > 100) | (df["region"] != "East")].drop_duplicates(["region", "revenue"])
+    expected = expected.sort_values(["region", "revenue"], ascending=[True, False], kind="stable")
+    result = pd.read_csv(tmp_path / "out" / "data_clean.csv")
+    pd.testing.assert_frame_equal(result, expected.reset_index(drop=True))
+
+
+def test_failed_compound_filter_fails_the_file(tmp_path):
+    path, _ = _data(tmp_path)
+    recipe = _recipe(tmp_path, [
+        {"op": "filter", "conditions": [["revenue", "greater_than", "lots"], ["region", "equals", "East"]],
+         "expression": "1 AND 2"},
+    ])
+
+    assert run_recipe(recipe, [path]) == 1
+
+
+def test_export_paths_must_differ_per_input(tmp_path, capsys):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    first, _ = _data(tmp_path / "a")
+    second, _ = _data(tmp_path / "b")
+
+    same = _recipe(tmp_path, [{"op": "export", "path": str(tmp_path / "out.csv")}])
+    assert run_recipe(same, [first, second]) == 1
+    assert "same file for several inputs" in capsys.readouterr().out
+
+    # Same file name in different folders: {dir} tells them apart, {name} does not
+    assert run_recipe(_recipe(tmp_path, [{"op": "export", "path": "{dir}/{stem}_out.csv"}]), [first, second]) == 0
+    assert (tmp_path / "a" / "data_out.csv").exists() and (tmp_path / "b" / "data_out.csv").exists()
+    assert run_recipe(_recipe(tmp_path, [{"op": "export", "path": str(tmp_path / "{name}")}]), [first, second]) == 1
+
+
+def test_sqlite_export_writes_one_table_per_input(tmp_path):
+    first, df = _data(tmp_path, "first.csv")
+    second, _ = _data(tmp_path, "second.csv")
+    db = tmp_path / "all.db"
+    recipe = _recipe(tmp_path, [
+        {"op": "filter", "column": "region", "condition": "equals", "value": "West"},
+        {"op": "export", "path": str(db), "table": "{stem}", "index_columns": ["region"]},
+    ])
+
+    assert run_recipe(recipe, [first, second]) == 0
+    assert list_tables(str(db)) == ["first", "second"]
+    expected = df[df["region"] == "West"].reset_index(drop=True)
+    pd.testing.assert_frame_equal(read_sqlite(str(db), table="second"), expected)
+
+
+def test_sqlite_export_to_one_table_must_append(tmp_path, capsys):
+    first, df = _data(tmp_path, "first.csv")
+    second, _ = _data(tmp_path, "second.csv")
+    db = str(tmp_path / "all.sqlite")
+
+    assert run_recipe(_recipe(tmp_path, [{"op": "export", "path": db}]), [first, second]) == 1
+    assert "same file for several inputs" in capsys.readouterr().out
+
+    assert run_recipe(_recipe(tmp_path, [{"op": "export", "path": db, "replace": False}]), [first, second]) == 0
+    assert len(read_sqlite(db, table="data")) == 2 * len(df)
@@ -0,0 +1,93 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from core import cache
+
+
+def _write_csv(path, df):
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def test_cached_frame_matches_parsed_file(tmp_path):
+    df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", None, "x"], "c": [0.5, None, 2.0]})
+    path = _write_csv(tmp_path / "data.csv", df)
+
+    parsed = pd.read_csv(path)
+    assert cache.store(path, parsed)
+    pd.testing.assert_frame_equal(cache.load_cached(path), parsed)
+
+
+def _is_mapped(values):
+    while values is not None:
+        if isinstance(values, np.memmap):
+            return True
+        values = values.base
+    return False
+
+
+def test_numeric_columns_are_mapped_not_copied(tmp_path):
+    df = pd.DataFrame({"a": np.arange(1000), "b": np.linspace(0, 1, 1000), "c": ["x", "y"] * 500})
+    path = _write_csv(tmp_path / "data.csv", df)
+    cache.store(path, pd.read_csv(path))
+
+    loaded = cache.load_cached(path)
+    assert _is_mapped(loaded["a"].to_numpy())
+    assert _is_mapped(loaded["b"].to_numpy())
+
+    # Writes stay in memory and never reach the cached copy
+    loaded.iloc[0, 0] = -1
+    assert cache.load_cached(path)["a"].iloc[0] == 0
+
+
+def test_lookup_hashes_only_when_size_and_mtime_match(tmp_path, monkeypatch):
+    path = _write_csv(tmp_path / "data.csv", pd.DataFrame({"a": [1, 2]}))
+    cache.store(path, pd.read_csv(path))
+    stat = os.stat(path)
+
+    hashed = []
+    real = cache.content_digest
+    monkeypatch.setattr(cache, "content_digest", lambda p: hashed.append(p) or real(p))
+
+    assert cache.load_cached(path) is not None
+    assert len(hashed) == 1
+
+    # Same size, same mtime, different contents
+    _write_csv(path, pd.DataFrame({"a": [3, 4]}))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert cache.load_cached(path) is None
+    assert len(hashed) == 2
+
+    os.utime(path, ns=(0, 0))
+    assert cache.load_cached(path) is None
+    assert len(hashed) == 2
+
+
+def test_changed_file_misses_and_drops_stale_entry(tmp_path):
+    path = _write_csv(tmp_path / "data.csv", pd.DataFrame({"a": [1, 2]}))
+    cache.store(path, pd.read_csv(path))
+
+    _write_csv(path, pd.DataFrame({"a": [1, 2, 3]}))
+    os.utime(path, ns=(0, 0))
+    assert cache.load_cached(path) is None
+
+    cache.store(path, pd.read_csv(path))
+    assert len(cache.list_entries()) == 1
+    assert cache.load_cached(path)["a"].tolist() == [1, 2, 3]
+
+
+def test_variants_of_the_same_file_are_kept_side_by_side(tmp_path):
+    path = _write_csv(tmp_path / "data.csv", pd.DataFrame({"a": [1, 2]}))
+    key = cache.file_fingerprint(path)
+    first = cache.variant_key(key, ["Sheet1"], None)
+    both = cache.variant_key(key, ["Sheet1", "Sheet2"], "sheet")
+
+    cache.store(path, pd.DataFrame({"a": [1]}))
+    cache.store(path, pd.DataFrame({"a": [1, 2]}), first)
+    cache.store(path, pd.DataFrame({"a": [1, 2, 3]}), both)
+
+    assert len(cache.load_cached(path)) == 1
+    assert len(cache.load_cached(path, first)) == 2
+    assert len(cache.load_cached(path, both)) == 3
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import cache
+from core.compaction import compact_dtypes, memory_usage_bytes
+
+
+@pytest.mark.parametrize("values, dtype", [
+    ([0, 127, -128], np.int8),
+    ([0, 128], np.int16),
+    ([-(2 ** 31), 2 ** 31 - 1], np.int32),
+    ([0, 2 ** 40], np.int64),
+])
+def test_integers_take_the_smallest_width(values, dtype):
+    series = pd.Series(values, dtype=np.int64)
+    compacted = compact_dtypes(series.to_frame("a"))["a"]
+    assert compacted.dtype == dtype
+    assert compacted.tolist() == values
+
+
+@pytest.mark.parametrize("values, narrowed", [
+    ([0.5, 1.25, np.nan, -3.0], True),
+    ([2.0 ** 24, 1.0], True),
+    ([0.1, 0.5], False),
+    ([2.0 ** 24 + 1], False),
+    ([1e300], False),
+])
+def test_floats_narrow_only_when_every_value_is_exact(values, narrowed):
+    series = pd.Series(values, dtype=np.float64, name="a")
+    compacted = compact_dtypes(series.to_frame("a"))["a"]
+    assert compacted.dtype == (np.float32 if narrowed else np.float64)
+    pd.testing.assert_series_equal(compacted.astype(np.float64), series)
+
+
+def test_text_columns():
+    rows = 1000
+    df = pd.DataFrame({
+        "few": np.tile(["a", "b", None, "c"], rows // 4),
+        "many": [f"id{i}" for i in range(rows)],
+        "mixed": np.tile(np.array(["a", 1, None, 2.5], dtype=object), rows // 4),
+        "empty": [None] * rows,
+    })
+    compacted = compact_dtypes(df)
+
+    assert isinstance(compacted["few"].dtype, pd.CategoricalDtype)
+    assert compacted.dtypes[["many", "mixed", "empty"]].tolist() == [object] * 3
+    assert compacted["few"].isna().equals(df["few"].isna())
+    assert compacted["few"].dropna().tolist() == df["few"].dropna().tolist()
+
+
+def test_frame_round_trips_through_the_cache(tmp_path):
+    rng = np.random.default_rng(0)
+    rows = 2000
+    df = pd.DataFrame({
+        "region": rng.choice(["West", "East", "North"], rows),
+        "amount": rng.integers(0, 100, rows),
+        "price": rng.choice([0.5, 1.25, 2.0], rows),
+        "ratio": rng.random(rows),
+        7: rng.integers(-(2 ** 40), 2 ** 40, rows),
+    }, index=np.arange(rows) * 2)
+
+    compacted = compact_dtypes(df)
+    assert compacted.columns.tolist() == df.columns.tolist()
+    assert compacted.index.equals(df.index)
+    assert memory_usage_bytes(compacted) < memory_usage_bytes(df) / 2
+    pd.testing.assert_frame_equal(compacted, df, check_dtype=False, check_categorical=False)
+
+    path = tmp_path / "data.csv"
+    df.to_csv(path)
+    compacted = compacted.reset_index(drop=True)
+    compacted.columns = [str(c) for c in compacted.columns]
+    assert cache.store(str(path), compacted)
+    pd.testing.assert_frame_equal(cache.load_cached(str(path)), compacted)
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.chunked import ChunkedSource
+from core.filtering import (
+    _apply_compound_filter_streaming,
+    _apply_filter_streaming,
+    build_compound_mask,
+    describe_expression,
+    parse_expression,
+)
+
+CONDITIONS = [
+    ("region", "equals", "West"),
+    ("amount", "greater_than", "50"),
+    ("note", "contains", "refund"),
+]
+
+
+def _frame(rows=5000):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "region": rng.choice(["West", "East", "North"], rows),
+        "amount": rng.integers(0, 100, rows),
+        "note": rng.choice(["Refund issued", "ok", None], rows),
+    })
+
+
+def test_and_binds_tighter_than_or():
+    tree = parse_expression("1 OR 2 AND NOT (3)", CONDITIONS)
+    assert tree[0] == "or"
+    assert tree[1][1] == ("and", [("cond", CONDITIONS[1]), ("not", ("cond", CONDITIONS[2]))])
+    assert describe_expression(CONDITIONS, "1 AND (2 OR NOT 3)") == (
+        "region equals West AND (amount greater_than 50 OR NOT note contains refund)"
+    )
+
+
+@pytest.mark.parametrize("expression", ["1 AND", "(1 OR 2", "1 2", "4", "0", "1 XOR 2", ""])
+def test_malformed_expressions_raise(expression):
+    with pytest.raises(ValueError):
+        parse_expression(expression, CONDITIONS)
+
+
+@pytest.mark.parametrize("expression", ["1 AND 2", "1 OR 2 AND NOT 3", "NOT (1 OR 3) AND 2", "NOT NOT 1"])
+def test_compound_mask_matches_pandas(expression):
+    df = _frame()
+    one = df["region"] == "West"
+    two = df["amount"] > 50
+    three = df["note"].astype(str).str.lower().str.contains("refund")
+    expected = {
+        "1 AND 2": one & two,
+        "1 OR 2 AND NOT 3": one | (two & ~three),
+        "NOT (1 OR 3) AND 2": ~(one | three) & two,
+        "NOT NOT 1": one,
+    }[expression]
+
+    mask = build_compound_mask(df, CONDITIONS, expression)
+    assert (mask == expected.to_numpy()).all()
+
+
+def _counting_reads(monkeypatch):
+    reads = []
+    real = pd.read_csv
+
+    def read_csv(*args, **kwargs):
+        if kwargs.get("chunksize"):
+            reads.append(args[0])
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(pd, "read_csv", read_csv)
+    return reads
+
+
+def test_streaming_filters_read_the_file_once(tmp_path, monkeypatch):
+    path = tmp_path / "data.csv"
+    _frame().to_csv(path, index=False)
+    source = ChunkedSource(str(path), chunk_rows=500)
+    reads = _counting_reads(monkeypatch)
+
+    _apply_filter_streaming(source, "amount", "greater_than", "98")
+    assert len(reads) == 1
+
+    _apply_compound_filter_streaming(source, CONDITIONS, "1 OR 3")
+    assert len(reads) == 2
+
+    expected = pd.read_csv(path)
+    expected = expected[(expected["amount"] > 98)]
+    expected = expected[build_compound_mask(expected, CONDITIONS, "1 OR 3")]
+    pd.testing.assert_frame_equal(pd.concat(source.iter_chunks()), expected)
+
+
+def test_invalid_streaming_filter_is_not_recorded(tmp_path, capsys):
+    path = tmp_path / "data.csv"
+    _frame().to_csv(path, index=False)
+    source = ChunkedSource(str(path), chunk_rows=500)
+
+    _apply_filter_streaming(source, "amount", "greater_than", "lots")
+    _apply_compound_filter_streaming(source, [("amount", "less_than", "few")], "1")
+
+    assert source.steps == []
+    assert capsys.readouterr().out.count("Invalid numeric input") == 2
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.csv_writer import frame_blocks, write_csv
+
+
+def _frame(rows=2500):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "name": rng.choice(["a", "b, c", 'say "hi"'], rows),
+        "amount": rng.normal(size=rows),
+        "count": rng.integers(-5, 5, rows),
+    })
+    df.loc[::7, "name"] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("extension", [".csv", ".csv.gz", ".csv.bz2", ".csv.xz"])
+def test_blocks_round_trip(tmp_path, extension):
+    df = _frame()
+    path = str(tmp_path / f"out{extension}")
+
+    stats = write_csv(frame_blocks(df, 300), path, df.columns)
+    assert stats["rows"] == len(df)
+    assert stats["csv_bytes"] == len(df.to_csv(index=False).encode("utf-8"))
+
+    pd.testing.assert_frame_equal(pd.read_csv(path), df)
+
+
+def test_compressed_file_is_smaller(tmp_path):
+    df = _frame()
+    stats = write_csv(frame_blocks(df, 300), str(tmp_path / "out.csv.gz"), df.columns)
+    assert stats["bytes"] < stats["csv_bytes"]
+
+
+def test_no_rows_still_writes_the_header(tmp_path):
+    path = str(tmp_path / "out.csv")
+    write_csv(iter(()), path, ["a", "b"])
+    assert pd.read_csv(path).columns.tolist() == ["a", "b"]
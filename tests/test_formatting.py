@@ -0,0 +1,92 @@
+import threading
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import formatting, state
+from core.formatting import _apply_format, _format_series, column_date_format
+
+
+def _frame(rows=300):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "a": rng.choice([" west", "East ", None], rows),
+        "b": rng.choice(["north", " SOUTH"], rows),
+        "c": rng.choice(["01/02/2021", "25/06/2021", "bad"], rows),
+    })
+
+
+@pytest.mark.parametrize("fmt_choice", ["1", "2", "4", "5"])
+def test_columns_format_like_one_at_a_time(fmt_choice):
+    df = _frame()
+    state.set_dataframe(df)
+    expected = df.copy()
+    for col in expected.columns:
+        expected[col] = _format_series(expected[col], fmt_choice)
+
+    assert _apply_format(df, list(df.columns), fmt_choice)
+    pd.testing.assert_frame_equal(state.get_dataframe(), expected)
+
+
+@pytest.mark.parametrize("fmt_choice", ["5", "6", "7", "8"])
+@pytest.mark.parametrize("values", [
+    ["01/02/2021", "25/06/2021", "bad", None, "01/02/2021", 7],
+    [0.256, "1.5", 12, "x", None, 0.256, np.nan],
+    pd.to_datetime(["2021-01-02", None, "2020-05-06", "2021-01-02"]),
+])
+def test_distinct_values_format_like_each_value_alone(fmt_choice, values):
+    series = pd.Series(values, index=np.arange(len(values)) * 3)
+    date_format = column_date_format(series)
+    expected = [_format_series(series.iloc[[i]], fmt_choice, date_format).iloc[0] for i in range(len(series))]
+
+    result = _format_series(series, fmt_choice)
+    assert result.tolist() == expected
+    assert result.index.equals(series.index)
+
+
+def test_known_values():
+    numbers = pd.Series([0.256, "1.5", 12, "x", None])
+    assert _format_series(numbers, "7").tolist() == ["0.26", "1.50", "12.00", "x", "None"]
+    assert _format_series(numbers, "8").tolist() == ["26%", "2%", "12%", "x", "None"]
+
+    dates = pd.Series(["01/02/2021", "25/06/2021", "bad"])
+    assert _format_series(dates, "5").tolist() == ["02/01/2021", "06/25/2021", "bad"]
+    assert _format_series(dates, "6").tolist() == ["February 01, 2021", "June 25, 2021", "bad"]
+
+
+def test_formatting_a_filtered_frame_leaves_it_unchanged():
+    df = _frame()
+    state.set_dataframe(df[df["b"] == "north"])
+    before = state.get_dataframe()
+    original = before.copy()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert _apply_format(before, ["a", "b"], "2")
+
+    pd.testing.assert_frame_equal(before, original)
+    assert state.get_dataframe()["b"].eq("NORTH").all()
+
+    assert state.undo_last()
+    pd.testing.assert_frame_equal(state.get_dataframe(), original)
+
+
+def test_several_columns_format_on_the_pool(monkeypatch):
+    threads = set()
+    real = formatting._format_series
+
+    def recording(series, fmt_choice, *args):
+        threads.add(threading.get_ident())
+        return real(series, fmt_choice, *args)
+
+    monkeypatch.setattr(formatting, "_format_series", recording)
+    state.set_dataframe(_frame())
+
+    assert _apply_format(state.get_dataframe(), "a", "2")
+    assert threads == {threading.get_ident()}
+
+    threads.clear()
+    assert _apply_format(state.get_dataframe(), ["a", "b", "c"], "2")
+    assert threading.get_ident() not in threads
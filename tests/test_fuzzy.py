@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from core.fuzzy import find_near_duplicates, keep_first_mask
+
+
+def test_near_duplicates_are_grouped():
+    df = pd.DataFrame({"company": ["Acme Inc.", "Globex", "ACME, Inc", "acme", "Initech LLC", "Initech"]})
+    cluster_ids, scores, _ = find_near_duplicates(df, ["company"])
+
+    assert cluster_ids[0] == cluster_ids[2] == cluster_ids[3] >= 0
+    assert cluster_ids[4] == cluster_ids[5] >= 0
+    assert cluster_ids[1] == -1 and scores[1] == 0.0
+    assert keep_first_mask(cluster_ids).tolist() == [True, True, False, False, True, False]
+
+
+def test_empty_keys_never_match():
+    df = pd.DataFrame({
+        "company": ["Inc.", "LLC", None, np.nan, "The Company", "Acme", "Acme"],
+        "city": [None, "", None, None, None, "Oslo", "Oslo"],
+    })
+    for columns in (["company"], ["company", "city"]):
+        cluster_ids, scores, _ = find_near_duplicates(df, columns)
+        assert (cluster_ids[:5] == -1).all() and (scores[:5] == 0.0).all()
+        assert cluster_ids[5] == cluster_ids[6] >= 0
+
+
+def test_exact_duplicates_are_found_as_near_duplicates():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"name": rng.choice(["alpha", "bravo", "charlie", "delta", "echo"], 200),
+                       "n": rng.integers(0, 20, 200).astype(str)})
+    cluster_ids, _, _ = find_near_duplicates(df, ["name", "n"], threshold=1.0)
+
+    # At threshold 1.0 the clusters are exactly the groups drop_duplicates sees
+    expected = df.duplicated(keep="first").to_numpy()
+    assert (~keep_first_mask(cluster_ids) == expected).all()
@@ -0,0 +1,77 @@
+import openpyxl
+import pandas as pd
+import pytest
+
+from core import multi_import
+from core.multi_import import check_matching_headers, expand_import_paths, read_many
+
+
+def _xlsx(path, rows):
+    wb = openpyxl.Workbook()
+    for row in rows:
+        wb.active.append(row)
+    wb.save(path)
+    return str(path)
+
+
+@pytest.fixture
+def files(tmp_path):
+    pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}).to_csv(tmp_path / "one.csv", index=False)
+    pd.DataFrame({"b": ["z"], "a": [3]}).to_csv(tmp_path / "two.csv", index=False)
+    _xlsx(tmp_path / "three.xlsx", [("a", "b"), (4, "w")])
+    (tmp_path / "notes.txt").write_text("skip me", encoding="utf-8")
+    return tmp_path
+
+
+def test_folder_and_glob_expand_to_sorted_files(files):
+    expected = [str(files / name) for name in ("one.csv", "three.xlsx", "two.csv")]
+    assert expand_import_paths(str(files)) == expected
+    assert expand_import_paths(str(files / "*.csv")) == [expected[0], expected[2]]
+    with pytest.raises(FileNotFoundError):
+        expand_import_paths(str(files / "*.parquet"))
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_files_are_stacked_with_a_source_column(files, monkeypatch, workers):
+    monkeypatch.setattr(multi_import, "IMPORT_MAX_WORKERS", workers)
+    paths = expand_import_paths(str(files))
+    check_matching_headers(paths)
+
+    df, timings = read_many(paths, "source")
+    assert df[["a", "b"]].to_dict("list") == {"a": [1, 2, 4, 3], "b": ["x", "y", "w", "z"]}
+    assert df["source"].tolist() == ["one.csv", "one.csv", "three.xlsx", "two.csv"]
+    assert isinstance(df["source"].dtype, pd.CategoricalDtype)
+    assert [rows for _, rows, _ in timings] == [2, 1, 1]
+
+
+def test_source_column_name_must_be_new(files):
+    with pytest.raises(ValueError, match="already exists"):
+        read_many(expand_import_paths(str(files / "*.csv")), "a")
+
+
+def test_csv_header_mismatch_is_caught_before_parsing(files):
+    pd.DataFrame({"a": [1], "c": [2]}).to_csv(files / "zz.csv", index=False)
+    with pytest.raises(ValueError, match="different columns"):
+        check_matching_headers(expand_import_paths(str(files)))
+
+
+def test_xlsx_header_mismatch_is_caught_while_parsing(files, monkeypatch):
+    monkeypatch.setattr(multi_import, "IMPORT_MAX_WORKERS", 1)
+    _xlsx(files / "zz.xlsx", [("a", "c"), (1, 2)])
+    paths = expand_import_paths(str(files))
+    check_matching_headers(paths)
+
+    with pytest.raises(ValueError, match="zz.xlsx' has different columns"):
+        read_many(paths)
+
+
+def test_each_workbook_is_opened_once(files, monkeypatch):
+    monkeypatch.setattr(multi_import, "IMPORT_MAX_WORKERS", 1)
+    opened = []
+    real = openpyxl.load_workbook
+    monkeypatch.setattr(openpyxl, "load_workbook", lambda path, **kw: opened.append(path) or real(path, **kw))
+
+    paths = expand_import_paths(str(files))
+    check_matching_headers(paths)
+    read_many(paths)
+    assert opened == [str(files / "three.xlsx")]
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+from core import formatting, plan, state
+from core.duplicates import _remove_duplicates
+from core.filtering import _apply_filter
+from core.formatting import _apply_format
+from core.plan import LazyPlan
+from core.sorting import _apply_sort
+
+
+def _frame(rows=500):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "region": rng.choice([" West", "East ", "north", None], rows),
+        "amount": rng.integers(0, 50, rows),
+        "ordered": rng.choice(["01/02/2021", "03/04/2021", "25/06/2021", "bad"], rows),
+    })
+
+
+STEPS = [
+    ("filter", {"column": "amount", "condition": "greater_than", "value": "5"}),
+    ("format", {"column": "region", "fmt_choice": "1"}),
+    ("filter", {"column": "region", "condition": "not_equals", "value": "East"}),
+    ("format", {"column": ["region", "ordered"], "fmt_choice": "2"}),
+    ("sort", {"column": ["region", "amount"], "ascending": [True, False]}),
+    ("dedupe", {"columns": ["region", "amount"]}),
+    ("format", {"column": "ordered", "fmt_choice": "5"}),
+]
+
+
+def _run_eager(df):
+    state.set_dataframe(df)
+    for kind, params in STEPS:
+        current = state.get_dataframe()
+        if kind == "filter":
+            _apply_filter(current, params["column"], params["condition"], params["value"])
+        elif kind == "format":
+            _apply_format(current, params["column"], params["fmt_choice"])
+        elif kind == "sort":
+            _apply_sort(current, params["column"], params["ascending"])
+        else:
+            _remove_duplicates(current, params["columns"])
+    return state.get_dataframe()
+
+
+def _plan(df):
+    lazy = LazyPlan(df)
+    for kind, params in STEPS:
+        lazy.add_step(kind, **params)
+    return lazy
+
+
+def test_lazy_plan_matches_eager_steps():
+    df = _frame()
+    expected = _run_eager(df.copy())
+    result = _plan(df).execute()
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_preview_formats_dates_like_the_full_run(monkeypatch):
+    monkeypatch.setattr(plan, "PREVIEW_BLOCK_ROWS", 4)
+    # Only the last block shows that the dates are day-first
+    df = pd.DataFrame({"ordered": ["01/02/2021", "03/04/2021"] * 6 + ["25/06/2021"]})
+    lazy = LazyPlan(df)
+    lazy.add_step("format", column="ordered", fmt_choice="6")
+
+    assert lazy.head(2)["ordered"].tolist() == ["February 01, 2021", "April 03, 2021"]
+    pd.testing.assert_frame_equal(lazy.head(5), lazy.execute().head(5))
+
+
+def test_each_format_runs_once_per_run(monkeypatch):
+    calls = []
+    real = formatting._format_series
+
+    def counting(series, fmt_choice, *args):
+        calls.append(fmt_choice)
+        return real(series, fmt_choice, *args)
+
+    monkeypatch.setattr(formatting, "_format_series", counting)
+    lazy = LazyPlan(_frame())
+    lazy.add_step("format", column="region", fmt_choice="1")
+    lazy.add_step("filter", column="region", condition="not_equals", value="East")
+    lazy.add_step("filter", column="region", condition="not_equals", value="north")
+    lazy.add_step("sort", column="region", ascending=True)
+    lazy.execute()
+
+    assert calls == ["1"]
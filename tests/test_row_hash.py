@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import row_hash, state
+from core.filtering import _apply_filter
+from core.formatting import _apply_format
+from core.sorting import _apply_sort
+
+
+def _frame(rows=2000):
+    rng = np.random.default_rng(0)
+    amount = rng.choice([0.0, -0.0, 1.5, np.nan], rows)
+    return pd.DataFrame({
+        "name": rng.choice([" a", "a", "b", None], rows),
+        "amount": amount,
+        "n": rng.integers(0, 5, rows),
+        "mixed": pd.Series(rng.choice([0.0, -0.0, "0", None], rows), dtype=object),
+    })
+
+
+@pytest.mark.parametrize("columns", [["amount"], ["name", "amount"], ["n", "mixed"], ["name", "amount", "n", "mixed"]])
+@pytest.mark.parametrize("keep", ["first", "last", False])
+def test_duplicated_matches_pandas(columns, keep):
+    df = _frame()
+    expected = df.duplicated(subset=columns, keep=keep).to_numpy()
+    assert (row_hash.duplicated(df, columns, keep) == expected).all()
+
+
+def test_negative_zero_equals_zero():
+    df = pd.DataFrame({"amount": [0.0, -0.0, 0.0]})
+    assert row_hash.duplicated(df, ["amount"]).tolist() == [False, True, True]
+
+
+def test_index_carried_through_steps_matches_pandas():
+    state.set_dataframe(_frame())
+    columns = ["name", "amount", "n"]
+    row_hash.duplicated(state.get_dataframe(), columns)
+
+    _apply_filter(state.get_dataframe(), "n", "not_equals", "4")
+    _apply_sort(state.get_dataframe(), ["n", "amount"], [False, True])
+    _apply_format(state.get_dataframe(), "name", "1")
+
+    df = state.get_dataframe()
+    expected = df.duplicated(subset=columns).to_numpy()
+    assert (row_hash.duplicated(df, columns) == expected).all()
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import sorting, state
+from core.sorting import _apply_sort, _apply_top_n, sort_order, top_n_order
+
+
+def _frame(rows=400):
+    rng = np.random.default_rng(0)
+    text = rng.choice(["b", "a", "c", None], rows)
+    return pd.DataFrame({
+        "cat": pd.Categorical(text),
+        "text": pd.Series(text, dtype=object),
+        "amount": rng.choice([2.5, 1.0, np.nan, 3.0], rows),
+        "n": rng.integers(0, 4, rows),
+    })
+
+
+def _expected(df, columns, directions):
+    return df.sort_values(columns, ascending=directions, kind="stable", na_position="last")
+
+
+def _sorted(df, columns, directions):
+    perm = sort_order(df, columns, directions)
+    return df if perm is None else df.iloc[perm]
+
+
+@pytest.mark.parametrize("column", ["cat", "text", "amount", "n"])
+@pytest.mark.parametrize("ascending", [True, False])
+def test_single_key_matches_pandas(column, ascending):
+    df = _frame()
+    pd.testing.assert_frame_equal(_sorted(df, [column], [ascending]), _expected(df, [column], [ascending]))
+
+
+@pytest.mark.parametrize("ascending", [True, False])
+def test_categorical_with_missing_first_is_not_already_sorted(ascending):
+    df = pd.DataFrame({"c": pd.Categorical([None, "a", "b"])})
+    expected = ["a", "b"] if ascending else ["b", "a"]
+    assert _sorted(df, ["c"], [ascending])["c"].tolist()[:2] == expected
+    assert pd.isna(_sorted(df, ["c"], [ascending])["c"].iloc[2])
+
+
+@pytest.mark.parametrize("columns, directions", [
+    (["cat", "amount"], [True, False]),
+    (["text", "n", "amount"], [False, True, True]),
+    (["n", "cat"], [False, False]),
+])
+def test_multi_key_matches_pandas(columns, directions):
+    df = _frame()
+    pd.testing.assert_frame_equal(_sorted(df, columns, directions), _expected(df, columns, directions))
+
+
+@pytest.mark.parametrize("column", ["cat", "text", "amount"])
+def test_reversed_cached_order_matches_pandas(column, monkeypatch):
+    df = _frame()
+    state.set_dataframe(df)
+    first = sort_order(df, [column], [True])
+
+    # The opposite direction must come from the cached order, not a new sort
+    monkeypatch.setattr(pd.Series, "sort_values", None)
+    flipped = sort_order(df, [column], [False])
+    assert sort_order(df, [column], [True]) is first
+
+    monkeypatch.undo()
+    pd.testing.assert_frame_equal(df.iloc[flipped], _expected(df, [column], [False]))
+
+
+def test_sort_steps_on_the_active_frame_match_pandas():
+    df = _frame()
+    state.set_dataframe(df)
+
+    for columns, directions in ((["cat"], [True]), (["cat"], [False]), (["amount", "text"], [False, True])):
+        assert _apply_sort(state.get_dataframe(), columns, directions)
+        pd.testing.assert_frame_equal(state.get_dataframe(), _expected(df, columns, directions))
+
+
+def test_sort_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(sorting, "SORT_CACHE_SIZE", 2)
+    df = _frame()
+    state.set_dataframe(df)
+    for column in ("cat", "text", "amount", "n"):
+        sort_order(df, [column], [True])
+    assert len(sorting._order_cache) <= 2
+
+
+def _ties_frame(rows=500):
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({
+        "few": rng.integers(0, 5, rows),
+        "amount": rng.choice([1.5, 2.5, np.nan, -0.5, 9.0], rows),
+        "text": rng.choice(["b", "a", "c", None], rows),
+        "when": pd.to_datetime(rng.choice(["2021-01-02", "2020-05-06", None], rows)),
+    })
+    df["cat"] = pd.Categorical(df["text"])
+    return df
+
+
+@pytest.mark.parametrize("columns", [["few"], ["amount"], ["text"], ["when"], ["cat"], ["few", "text"], ["text", "amount"]])
+@pytest.mark.parametrize("ascending", [True, False])
+@pytest.mark.parametrize("n", [1, 7, 100, 450, 1000])
+def test_top_n_matches_sort_then_head(columns, ascending, n):
+    df = _ties_frame()
+    directions = [ascending] + [not ascending] * (len(columns) - 1)
+    expected = _expected(df, columns, directions).head(n)
+    pd.testing.assert_frame_equal(df.iloc[top_n_order(df, columns, directions, n)], expected)
+
+
+def test_top_n_step_keeps_first_rows_and_undoes():
+    df = _ties_frame()
+    state.set_dataframe(df)
+
+    assert _apply_top_n(df, "amount", False, 5)
+    pd.testing.assert_frame_equal(state.get_dataframe(), _expected(df, ["amount"], [False]).head(5))
+
+    assert state.undo_last()
+    assert state.get_dataframe() is df
@@ -0,0 +1,86 @@
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.csv_writer import frame_blocks
+from core.sqlite_io import list_tables, read_sqlite, write_sqlite
+
+
+def _frame():
+    df = pd.DataFrame({
+        "id": np.arange(10),
+        "amount": np.linspace(0, 1, 10),
+        "name": ["a", "b"] * 5,
+        "flag": [True, False] * 5,
+        "when": pd.date_range("2021-01-01", periods=10),
+    })
+    df.loc[3, "amount"] = np.nan
+    df.loc[4, "name"] = np.nan
+    return df
+
+
+def _write(df, path, **kwargs):
+    return write_sqlite(frame_blocks(df, 3), str(path), "data", df.columns, dtypes=df.dtypes, **kwargs)
+
+
+def test_table_round_trips(tmp_path):
+    df = _frame()
+    path = tmp_path / "out.db"
+    assert _write(df, path)["rows"] == len(df)
+
+    # Booleans come back as integers, dates as text and missing text as None
+    expected = df.assign(flag=df["flag"].astype(np.int64), when=df["when"].astype(str))
+    expected.loc[4, "name"] = None
+    result = read_sqlite(str(path), table="data")
+    pd.testing.assert_frame_equal(result, expected)
+
+    with sqlite3.connect(path) as conn:
+        pd.testing.assert_frame_equal(result, pd.read_sql_query("SELECT * FROM data", conn, coerce_float=True))
+        types = [row[2] for row in conn.execute("PRAGMA table_info(data);")]
+    assert types == ["INTEGER", "REAL", "TEXT", "INTEGER", "TEXT"]
+
+
+def test_append_replace_and_indexes(tmp_path):
+    df = _frame()
+    path = tmp_path / "out.db"
+    _write(df, path)
+    _write(df, path, replace=False, index_columns=["name"])
+    assert len(read_sqlite(str(path), table="data")) == 2 * len(df)
+
+    with sqlite3.connect(path) as conn:
+        indexes = [row[1] for row in conn.execute("PRAGMA index_list(data);")]
+    assert indexes == ["idx_data_name"]
+
+    _write(df.head(2), path)
+    assert len(read_sqlite(str(path), table="data")) == 2
+    assert list_tables(str(path)) == ["data"]
+
+
+def test_query_results_and_bad_headers(tmp_path):
+    path = tmp_path / "out.db"
+    _write(_frame(), path)
+
+    result = read_sqlite(str(path), query="SELECT name, COUNT(*) AS n FROM data GROUP BY name ORDER BY name;")
+    assert result.columns.tolist() == ["name", "n"]
+    assert result["n"].tolist() == [1, 4, 5]
+
+    with pytest.raises(ValueError):
+        read_sqlite(str(path), query="SELECT id, id FROM data;")
+    with pytest.raises(ValueError):
+        read_sqlite(str(path))
+
+
+def test_failed_write_leaves_the_table_alone(tmp_path):
+    df = _frame()
+    path = tmp_path / "out.db"
+    _write(df, path)
+
+    def broken():
+        yield df.head(3)
+        raise RuntimeError("source failed")
+
+    with pytest.raises(RuntimeError):
+        write_sqlite(broken(), str(path), "data", df.columns, dtypes=df.dtypes)
+    assert len(read_sqlite(str(path), table="data")) == len(df)
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import chunked, sorting, state
+from core.chunked import ChunkedSource
+from core.duplicates import _remove_duplicates_streaming
+from core.exporter import _export_csv_chunked
+from core.filtering import _apply_filter_streaming
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    rng = np.random.default_rng(0)
+    rows = 1000
+    df = pd.DataFrame({
+        "region": rng.choice(["West", "East", "North"], rows),
+        "amount": rng.integers(0, 50, rows),
+        "id": rng.integers(0, 200, rows).astype(str),
+    })
+    # A late text id makes the first chunks infer int64 and the last object
+    df.loc[rows - 1, "id"] = "x"
+    path = tmp_path / "data.csv"
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def _stream(path, chunk_rows=150):
+    source = ChunkedSource(path, chunk_rows=chunk_rows)
+    state.set_chunked_source(source, path)
+    return source
+
+
+def _count_reads(monkeypatch):
+    reads = []
+    real = pd.read_csv
+
+    def counting(*args, **kwargs):
+        reads.append(kwargs.get("usecols"))
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(chunked.pd, "read_csv", counting)
+    return reads
+
+
+def test_streamed_filter_matches_in_memory(csv_path):
+    source = _stream(csv_path)
+    _apply_filter_streaming(source, "region", "equals", "East")
+    _apply_filter_streaming(source, "amount", "greater_than", "20")
+
+    df = pd.read_csv(csv_path)
+    expected = df[(df["region"] == "East") & (df["amount"] > 20)]
+    result = pd.concat(source.iter_chunks())
+    pd.testing.assert_frame_equal(result[["region", "amount"]], expected[["region", "amount"]])
+
+
+def test_invalid_streamed_filter_is_not_recorded(csv_path):
+    source = _stream(csv_path)
+    _apply_filter_streaming(source, "amount", "greater_than", "many")
+    assert source.steps == []
+
+
+def test_dedupe_preview_skips_the_dtype_pass(csv_path, monkeypatch):
+    source = _stream(csv_path)
+    reads = _count_reads(monkeypatch)
+
+    _remove_duplicates_streaming(source, ["id"])
+    assert reads == [None]
+    assert source.dtypes == {}
+
+
+def test_undo_forgets_fixed_dtypes(csv_path):
+    source = _stream(csv_path)
+    _remove_duplicates_streaming(source, ["id"])
+    source.count_rows()
+    assert source.dtypes == {"id": str}
+
+    assert state.undo_last()
+    assert source.steps == []
+    assert source.dtypes == {}
+    assert next(source.iter_chunks())["id"].dtype == np.int64
+
+
+def test_chunked_csv_export_round_trips(csv_path, tmp_path):
+    source = _stream(csv_path)
+    _apply_filter_streaming(source, "region", "not_equals", "West")
+    _remove_duplicates_streaming(source, ["id"])
+
+    out = str(tmp_path / "out.csv")
+    assert _export_csv_chunked(source, out, save_audit=False)
+
+    df = pd.read_csv(csv_path, dtype={"id": str})
+    expected = df[df["region"] != "West"].drop_duplicates(["id"], keep="first")
+    pd.testing.assert_frame_equal(pd.read_csv(out, dtype={"id": str}), expected.reset_index(drop=True))
+
+
+def test_sort_is_refused_in_streaming_mode(csv_path, monkeypatch, capsys):
+    _stream(csv_path)
+    monkeypatch.setattr("builtins.input", lambda prompt="": pytest.fail("sort asked for input"))
+
+    sorting.apply_sort_flow()
+    assert "not available in streaming mode" in capsys.readouterr().out
+    assert state.get_chunked_source().steps == []
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+from core.disk_dedupe import dedupe_chunks
+
+
+def _dedupe(chunks, columns, **kwargs):
+    return pd.concat(dedupe_chunks(lambda: iter(chunks), columns, **kwargs))
+
+
+def test_numeric_keys_match_across_chunk_dtypes():
+    # The second chunk infers float64 because of its missing value
+    chunks = [
+        pd.DataFrame({"id": [1, 2, 3], "v": ["a", "b", "c"]}),
+        pd.DataFrame({"id": [1.0, np.nan, 4.0], "v": ["d", "e", "f"]}, index=[3, 4, 5]),
+        pd.DataFrame({"id": [np.nan, 4.0], "v": ["g", "h"]}, index=[6, 7]),
+    ]
+    result = _dedupe(chunks, ["id"])
+    assert result["v"].tolist() == ["a", "b", "c", "e", "f"]
+
+
+def test_spilled_dedupe_matches_drop_duplicates():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"a": rng.integers(0, 300, 5000).astype(float), "b": rng.choice(["x", "y", None], 5000)})
+    df.loc[rng.integers(0, 5000, 100), "a"] = np.nan
+    chunks = [df.iloc[i:i + 700] for i in range(0, len(df), 700)]
+
+    expected = df.drop_duplicates(subset=["a", "b"], keep="first")
+    for max_keys in (10 ** 9, 50, 1):
+        result = _dedupe(chunks, ["a", "b"], max_keys=max_keys, partitions=5)
+        pd.testing.assert_frame_equal(result, expected)
+
+
+def test_large_int_keys_stay_distinct():
+    chunks = [pd.DataFrame({"id": [2 ** 53]}), pd.DataFrame({"id": [2 ** 53 + 1, 2 ** 53]}, index=[1, 2])]
+    expected = pd.concat(chunks).drop_duplicates(subset=["id"])
+    for max_keys in (10 ** 9, 0):
+        result = _dedupe(chunks, ["id"], max_keys=max_keys, partitions=3)
+        assert result["id"].tolist() == expected["id"].tolist() == [2 ** 53, 2 ** 53 + 1]
+
+
+def _source(path, chunk_rows):
+    from core.chunked import ChunkedSource
+    return ChunkedSource(str(path), chunk_rows=chunk_rows)
+
+
+def test_filter_before_dedupe_keeps_its_rows(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("rev,amt\n5.0,1\n5,2\n5.0,1\n7,3\n5.00,4\n5,2\n", encoding="utf-8")
+
+    plain = _source(path, chunk_rows=2)
+    plain.add_step("filter", column="rev", condition="equals", value="5.0")
+    deduped = _source(path, chunk_rows=2)
+    deduped.add_step("filter", column="rev", condition="equals", value="5.0")
+    deduped.add_step("dedupe", columns=["rev", "amt"])
+
+    filtered = pd.concat(plain.iter_chunks())
+    assert len(filtered) == 5
+    pd.testing.assert_frame_equal(pd.concat(deduped.iter_chunks()), filtered.drop_duplicates(["rev", "amt"]))
+
+
+def test_streamed_dedupe_matches_in_memory(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("rev,amt\n1.5,1\n1.50,1\n1,2\n1.0,2\n,3\n,3\n", encoding="utf-8")
+
+    source = _source(path, chunk_rows=2)
+    source.add_step("dedupe", columns=["rev", "amt"])
+
+    expected = pd.read_csv(path).drop_duplicates(["rev", "amt"], keep="first")
+    result = pd.concat(source.iter_chunks())
+    assert result.index.tolist() == expected.index.tolist()
+
+
+def test_keys_match_across_chunks_that_infer_different_dtypes(tmp_path):
+    # The first chunk infers int64, the second object because of "x"
+    path = tmp_path / "data.csv"
+    path.write_text(f"id\n1\n2\n1\nx\n{2 ** 53}\n{2 ** 53 + 1}\n", encoding="utf-8")
+
+    source = _source(path, chunk_rows=2)
+    source.add_step("dedupe", columns=["id"])
+
+    expected = pd.read_csv(path).drop_duplicates(["id"], keep="first")
+    result = pd.concat(source.iter_chunks())
+    assert result["id"].tolist() == expected["id"].tolist() == ["1", "2", "x", str(2 ** 53), str(2 ** 53 + 1)]
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import state, text_index
+from core.filtering import _build_mask, _column_mask
+
+
+def _frame(rows=3000):
+    rng = np.random.default_rng(0)
+    words = np.array(["Refund issued", "REFUNDED", "ok", "partial refund", "x" * 80 + "refund", "ab", None], dtype=object)
+    return pd.DataFrame({"note": rng.choice(words, rows), "n": np.arange(rows)})
+
+
+@pytest.mark.parametrize("value", ["refund", "REFUND", "ab", "a", "nan", "xrefund", "/^ref.*d$/", "missing"])
+@pytest.mark.parametrize("condition", ["contains", "not_contains"])
+def test_indexed_contains_matches_plain_filter(value, condition):
+    df = _frame()
+    expected = _build_mask(df.copy()["note"], condition, value).to_numpy()
+
+    state.set_dataframe(df)
+    assert (np.asarray(_column_mask(df, "note", condition, value)) == expected).all()
+
+    text_index.build_trigram_index(df, "note")
+    assert text_index.has_trigram_index(df, "note")
+    assert (np.asarray(_column_mask(df, "note", condition, value)) == expected).all()
+
+    positions = np.arange(0, len(df), 7)
+    assert (np.asarray(_column_mask(df, "note", condition, value, positions)) == expected[positions]).all()
+
+
+def test_cached_views_are_not_reused_for_a_new_version():
+    df = _frame()
+    state.set_dataframe(df)
+    text_index.build_trigram_index(df, "note")
+    _column_mask(df, "note", "contains", "refund")
+
+    changed = df.copy()
+    changed["note"] = "no match"
+    state.set_dataframe(changed)
+    assert not text_index.has_trigram_index(changed, "note")
+    assert not np.asarray(_column_mask(changed, "note", "contains", "refund")).any()
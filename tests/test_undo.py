@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import main
+
+from core import state
+from core.duplicates import _remove_duplicates
+from core.filtering import _apply_filter
+from core.formatting import _apply_format
+from core.sorting import _apply_sort
+
+
+def _load(rows=1000):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "region": rng.choice(["West", "East", "North"], rows),
+        "amount": rng.integers(0, 100, rows),
+        "name": rng.choice([" a ", "b", "c "], rows),
+    }, index=rng.permutation(rows) * 3)
+    state.set_dataframe(df, "data.csv")
+    return df.copy()
+
+
+def _undo_all():
+    while state.history_stack:
+        state.undo_last()
+
+
+def test_undo_restores_every_step():
+    original = _load()
+
+    _apply_filter(state.get_dataframe(), "region", "not_equals", "North")
+    _apply_sort(state.get_dataframe(), ["region", "amount"], [True, False])
+    _apply_format(state.get_dataframe(), ["name", "region"], "1")
+    _remove_duplicates(state.get_dataframe(), ["region", "amount"])
+    _apply_filter(state.get_dataframe(), "amount", "less_than", "3")
+    assert len(state.get_dataframe()) < len(original) // 10
+
+    _undo_all()
+    pd.testing.assert_frame_equal(state.get_dataframe(), original)
+
+
+def test_selective_filter_keeps_the_frame_instead_of_copying_rows():
+    _load()
+    before = state.get_dataframe()
+
+    _apply_filter(before, "amount", "equals", "5")
+    assert state.history_stack[-1]["kind"] == "snapshot"
+    assert state.history_stack[-1]["df"] is before
+
+    state.undo_last()
+    assert state.get_dataframe() is before
+
+
+def test_broad_filter_stores_only_the_removed_rows():
+    _load()
+    before = state.get_dataframe()
+
+    _apply_filter(before, "amount", "not_equals", "5")
+    entry = state.history_stack[-1]
+    assert entry["kind"] == "rows"
+    assert len(entry["removed"]) == (before["amount"] == 5).sum()
+
+
+def test_lowering_the_limit_reports_dropped_steps(capsys, monkeypatch):
+    monkeypatch.setattr(state, "HISTORY_MAX_BYTES", state.HISTORY_MAX_BYTES)
+    _load()
+    _apply_sort(state.get_dataframe(), "amount", True)
+    _apply_sort(state.get_dataframe(), "region", True)
+    capsys.readouterr()
+
+    state.set_history_limit(state.history_stack[-1]["nbytes"])
+    assert len(state.history_stack) == 1
+    assert "1 oldest step(s) can no longer be undone" in capsys.readouterr().out
+
+
+def test_history_limit_flag(monkeypatch):
+    monkeypatch.setattr(state, "HISTORY_MAX_BYTES", state.HISTORY_MAX_BYTES)
+    monkeypatch.setattr(main.sys, "argv", ["main.py", "--history-mb", "0.5"])
+    monkeypatch.setattr(main, "show_main_menu", lambda: (_ for _ in ()).throw(SystemExit))
+
+    with pytest.raises(SystemExit):
+        main.main()
+    assert state.HISTORY_MAX_BYTES == 512 * 1024
+
+    with pytest.raises(SystemExit):
+        main.parse_args(["--history-mb", "0"])
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import state
+from core.filtering import _apply_filter, _build_mask, _column_mask
+
+
+def _frame(rows=3000):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "region": rng.choice(["West", "East", "North", None], rows),
+        "amount": rng.choice([1.0, 2.5, 3.0, np.nan], rows),
+        "id": rng.integers(0, 40, rows),
+        "kind": pd.Categorical(rng.choice(["a", "b", None], rows)),
+    })
+
+
+CASES = [
+    ("region", "equals", "West"),
+    ("region", "not_equals", "nan"),
+    ("region", "in_list", "West, North,Nowhere"),
+    ("amount", "equals", "2.5"),
+    ("amount", "not_in_list", "1,3"),
+    ("amount", "equals", "nan"),
+    ("id", "in_list", ",".join(str(i) for i in range(0, 40, 2))),
+    ("id", "not_equals", "7"),
+    ("kind", "in_list", "a,nan"),
+]
+
+
+@pytest.mark.parametrize("column, condition, value", CASES)
+def test_indexed_equality_matches_plain_filter(column, condition, value):
+    df = _frame()
+    expected = _build_mask(df.copy()[column], condition, value).to_numpy()
+
+    state.set_dataframe(df)
+    # The first lookup scans, the second builds the index, the third uses it
+    for _ in range(3):
+        assert (np.asarray(_column_mask(df, column, condition, value)) == expected).all()
+
+    positions = np.arange(0, len(df), 5)
+    assert (np.asarray(_column_mask(df, column, condition, value, positions)) == expected[positions]).all()
+
+
+def test_non_numeric_value_on_numeric_column_raises():
+    df = _frame()
+    state.set_dataframe(df)
+    with pytest.raises(ValueError):
+        _column_mask(df, "amount", "equals", "lots")
+
+
+def test_filter_undo_filter_reuses_nothing_stale():
+    df = _frame()
+    state.set_dataframe(df)
+    for _ in range(2):
+        _apply_filter(state.get_dataframe(), "region", "equals", "West")
+    assert (state.get_dataframe()["region"] == "West").all()
+
+    state.undo_last()
+    state.undo_last()
+    current = state.get_dataframe()
+    expected = (current["region"] == "East").to_numpy()
+    for _ in range(3):
+        assert (np.asarray(_column_mask(current, "region", "equals", "East")) == expected).all()
@@ -0,0 +1,124 @@
+from datetime import datetime
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+
+from core.xlsx_reader import read_xlsx, read_xlsx_sheets
+from core.xlsx_writer import write_xlsx
+
+ROWS = [
+    ("id", "amount", "whole", "mixed", "when", "flag", "note"),
+    (1, 1.5, 2.0, "a", datetime(2021, 1, 2), True, None),
+    (2, None, 3.0, 7, None, False, "x"),
+    (None, None, None, None, None, None, None),
+    (3, 2.25, 4.0, 2.5, datetime(2020, 5, 6, 7, 8, 9), True, None),
+    (4, -1.0, -5.0, None, datetime(2022, 12, 31), False, "y"),
+]
+
+
+def _workbook(path, sheets):
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for name, rows in sheets.items():
+        sheet = wb.create_sheet(name)
+        for row in rows:
+            sheet.append(row)
+    wb.save(path)
+    return str(path)
+
+
+def test_single_pass_reader_matches_read_excel(tmp_path):
+    path = _workbook(tmp_path / "data.xlsx", {"Data": ROWS})
+    pd.testing.assert_frame_equal(read_xlsx(path), pd.read_excel(path))
+
+
+def test_columns_without_blanks_match_read_excel(tmp_path):
+    rows = [
+        ("int", "whole", "flag", "flag_int", "flag_float", "huge", "when"),
+        (1, 1.0, True, 1, 0.5, 2.0 ** 70, datetime(2021, 1, 2)),
+        (2, 2.0, False, True, True, 1.0, datetime(2021, 1, 3)),
+        (3, -4.0, True, 0, 2.0, -3.0, datetime(2021, 1, 4, 12)),
+    ]
+    path = _workbook(tmp_path / "data.xlsx", {"Data": rows})
+    pd.testing.assert_frame_equal(read_xlsx(path), pd.read_excel(path))
+
+
+def test_named_sheet_matches_read_excel(tmp_path):
+    other = [("a",), (1,), (2,)]
+    path = _workbook(tmp_path / "data.xlsx", {"Other": other, "Data": ROWS})
+    pd.testing.assert_frame_equal(read_xlsx(path, "Data"), pd.read_excel(path, sheet_name="Data"))
+    pd.testing.assert_frame_equal(read_xlsx(path), pd.read_excel(path))
+
+
+def test_short_rows_are_padded_with_blanks(tmp_path):
+    path = _workbook(tmp_path / "data.xlsx", {"Data": [("a", "b", "c"), (1, "x"), (2,), (3, "y", 1.5)]})
+    pd.testing.assert_frame_equal(read_xlsx(path), pd.read_excel(path))
+
+
+def test_duplicate_header_is_rejected(tmp_path):
+    path = _workbook(tmp_path / "data.xlsx", {"Data": [("a", "a"), (1, 2)]})
+    with pytest.raises(ValueError):
+        read_xlsx(path)
+
+
+def test_sheets_are_stacked_in_the_first_sheet_column_order(tmp_path):
+    first = [("a", "b"), (1, "x"), (2, "y")]
+    second = [("b", "a"), ("z", 3)]
+    path = _workbook(tmp_path / "data.xlsx", {"One": first, "Two": second})
+
+    expected = pd.concat([
+        pd.read_excel(path, sheet_name="One").assign(sheet="One"),
+        pd.read_excel(path, sheet_name="Two")[["a", "b"]].assign(sheet="Two"),
+    ], ignore_index=True)
+    pd.testing.assert_frame_equal(read_xlsx_sheets(path, ["One", "Two"], "sheet"), expected)
+
+
+def test_sheets_with_other_columns_are_rejected(tmp_path):
+    path = _workbook(tmp_path / "data.xlsx", {"One": [("a",), (1,)], "Two": [("c",), (2,)]})
+    with pytest.raises(ValueError, match="different columns"):
+        read_xlsx_sheets(path, ["One", "Two"])
+    with pytest.raises(ValueError, match="already exists"):
+        read_xlsx_sheets(path, ["One"], "a")
+
+
+def test_split_export_writes_one_sheet_per_value(tmp_path):
+    df = pd.DataFrame({
+        "region": ["West", None, "East", "West", "a/b", "A/B"],
+        "amount": [1, 2, 3, 4, 5, 6],
+    })
+    path = str(tmp_path / "out.xlsx")
+
+    assert write_xlsx(df, path, split_by="region") == 5
+    sheets = pd.read_excel(path, sheet_name=None)
+    assert list(sheets) == ["West", "(blank)", "East", "a_b", "A_B (2)"]
+    assert sheets["West"]["amount"].tolist() == [1, 4]
+    assert sheets["(blank)"]["region"].isna().all()
+    assert sum(len(s) for s in sheets.values()) == len(df)
+
+
+def test_export_reads_back_like_to_excel(tmp_path):
+    df = pd.DataFrame({
+        "name": ["a", None, "c"],
+        5: [1, 2, 3],
+        pd.Timestamp("2021-01-02"): [0.5, np.nan, 2.0],
+        "when": pd.to_datetime(["2021-01-02", None, "2022-03-04"]),
+        "flag": [True, False, True],
+    })
+    ours, theirs = str(tmp_path / "ours.xlsx"), str(tmp_path / "theirs.xlsx")
+    write_xlsx(df, ours)
+    df.to_excel(theirs, index=False)
+
+    pd.testing.assert_frame_equal(pd.read_excel(ours), pd.read_excel(theirs))
+    assert pd.read_excel(ours).columns.tolist()[1] == 5
+
+
+def test_highlighted_rows_are_filled(tmp_path):
+    df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    path = str(tmp_path / "out.xlsx")
+    write_xlsx(df, path, highlight=(np.array([False, True, False]), ["b"]))
+
+    sheet = openpyxl.load_workbook(path).active
+    filled = [(c.row, c.column) for row in sheet.iter_rows(min_row=2) for c in row if c.fill.fill_type == "solid"]
+    assert filled == [(3, 2)]
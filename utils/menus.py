@@ -7,6 +7,7 @@ def show_main_menu():
     print("4. Audit Log")
     print("5. Export Data")
     print("6. Undo Last Action")
+    print("7. Import Cache")
     print("0. Exit")
 
 def show_transform_menu():
@@ -15,6 +16,7 @@ def show_transform_menu():
     print("1. Filter")
     print("2. Sort")
     print("3. Format")
+    print("4. Lazy Mode (On/Off)")
     print("0. Back")
     return input("Enter choice: ").strip()
 
@@ -23,10 +25,12 @@ def show_condition_menu():
     print("\n=== FILTER CONDITIONS ===")
     print("1. Equals")
     print("2. Not Equals")
-    print("3. Contains")
+    print("3. Contains (write /pattern/ for a regular expression)")
     print("4. Does Not Contain")
     print("5. Greater Than")
     print("6. Less Than")
+    print("7. Is One Of (comma-separated values)")
+    print("8. Is Not One Of (comma-separated values)")
     print("0. Back")
     return input("Enter choice: ").strip()
 
@@ -57,6 +61,8 @@ def show_duplicate_menu():
     print("\n=== DUPLICATE OPTIONS ===")
     print("1. Identify Duplicates Only")
     print("2. Remove Duplicates (Keep First Occurrence)")
+    print("3. Identify Near-Duplicates (Fuzzy)")
+    print("4. Remove Near-Duplicates (Keep First Occurrence)")
     print("0. Cancel")
     return input("Enter choice: ").strip()
 
@@ -65,5 +71,14 @@ def show_export_menu():
     print("\n=== EXPORT MENU ===")
     print("1. Export as CSV")
     print("2. Export as XLSX")
+    print("3. Export to SQLite Database")
+    print("0. Back")
+    return input("Enter choice: ").strip()
+
+def show_cache_menu():
+    """Display import cache options."""
+    print("\n=== IMPORT CACHE ===")
+    print("1. Show Cached Files")
+    print("2. Purge Cache")
     print("0. Back")
     return input("Enter choice: ").strip()
\ No newline at end of file